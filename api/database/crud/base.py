@@ -1,12 +1,16 @@
-from collections.abc import Iterable, Sequence
-from typing import Any, Generic, TypeVar
+from collections.abc import AsyncGenerator, Callable, Hashable, Iterable, Sequence
+from typing import Any, Generic, TypeVar, overload
 from uuid import UUID
 
 from pydantic import BaseModel
-from sqlalchemy import ColumnExpressionArgument, delete, select, true, update
+from sqlalchemy import ColumnElement, ColumnExpressionArgument, Row, delete, event, lambda_stmt, select, true, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute, Session, SessionTransaction, raiseload
+from sqlalchemy.sql import coercions, roles
+from sqlalchemy.sql.base import ExecutableOption
 
 from api.database.base import Base
+from api.database.crud.cache import CACHE_REQUESTS, CacheBackend, CacheKey
 
 ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
@@ -17,14 +21,119 @@ type PrimaryKeyIDType = int | str | UUID
 
 EMPTY_FILTERS = true()
 
+# Rows fetched from the server-side cursor at a time when streaming
+STREAM_YIELD_PER = 1000
+
+# Key of `Session.info` holding the DAOs a session wrote through, to invalidate once it commits
+PENDING_INVALIDATIONS = "crud_pending_invalidations"
+# Key of `Session.info` holding what to do only if the session commits
+PENDING_COMMIT_CALLBACKS = "crud_pending_commit_callbacks"
+
 # Modified verison of the CRUDPlus class
 # https://github.com/fastapi-practices/sqlalchemy-crud-plus/blob/master/sqlalchemy_crud_plus/crud.py
 # 114c7bd004be2afc8d529cd52403250a1041bbdd
 
 
+def filters_fingerprint(filters: Filters) -> CacheKey | None:
+    """Hashable identity of a filter expression, including its bound values."""
+    cache_key = coercions.expect(roles.WhereHavingRole, filters)._generate_cache_key()  # pyright: ignore[reportPrivateUsage]
+
+    if cache_key is None:
+        return None
+
+    values: list[Hashable] = []
+    for param in cache_key.bindparams:
+        value = param.effective_value
+        # Expanding parameters, such as the ones `in_()` creates, are bound to lists
+        values.append(tuple(value) if isinstance(value, list) else value)  # pyright: ignore[reportUnknownArgumentType]
+
+    return (cache_key.key, tuple(values))
+
+
+@event.listens_for(Session, "after_commit")
+def _run_after_commit(session: Session) -> None:  # pyright: ignore[reportUnusedFunction]
+    # Only called for the outermost transaction
+    for callback in session.info.pop(PENDING_COMMIT_CALLBACKS, ()):
+        callback()
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _invalidate_after_transaction(session: Session, transaction: SessionTransaction) -> None:  # pyright: ignore[reportUnusedFunction]
+    # Only once the outermost transaction is over can other sessions read what it wrote
+    if transaction.parent is None:
+        for dao in session.info.pop(PENDING_INVALIDATIONS, ()):
+            dao.invalidate_cache()
+        # Left over when it rolled back
+        session.info.pop(PENDING_COMMIT_CALLBACKS, None)
+
+
+def _detached_copy(instance: ModelType) -> ModelType:
+    """A copy of a loaded instance and its loaded relationships, attached to no session."""
+    scratch = Session()
+    copy = scratch.merge(instance, load=False)
+    scratch.expunge_all()
+
+    return copy
+
+
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
-    def __init__(self, model: type[ModelType]) -> None:
+    """
+    Generic data access for a single model.
+
+    Passing a `cache` makes `select_first_` and `select_by_id` read through it.
+    Any write made through this DAO invalidates every cached entry for the model once
+    its transaction ends, and until then the session writing skips the cache. Writes
+    made elsewhere are only picked up once entries expire.
+
+    Cached instances are detached copies of the ones loaded, merged into each session
+    reading them.
+    """
+
+    def __init__(self, model: type[ModelType], *, cache: CacheBackend | None = None) -> None:
         self.model = model
+        self.cache = cache
+        self.cache_namespace: str = model.__tablename__
+
+        # Bumped on every invalidation, so rows read before one are never cached after it
+        self._cache_generation = 0
+
+    async def _cached_first(
+        self,
+        session: AsyncSession,
+        key: CacheKey | None,
+        filters: Filters,
+    ) -> ModelType | None:
+        if self.cache is None or key is None or self in session.info.get(PENDING_INVALIDATIONS, ()):
+            return await self._select_first(session, filters=filters)
+
+        if (cached := self.cache.get(key)) is not None:
+            CACHE_REQUESTS.labels(model=self.cache_namespace, result="hit").inc()
+
+            # Instances may come from another session, copy their loaded state into this one
+            return await session.merge(cached, load=False)
+
+        CACHE_REQUESTS.labels(model=self.cache_namespace, result="miss").inc()
+
+        generation = self._cache_generation
+        row = await self._select_first(session, filters=filters)
+        if row is not None and generation == self._cache_generation and not session.dirty:
+            self.cache.set(key, _detached_copy(row))
+
+        return row
+
+    def invalidate_cache(self) -> None:
+        self._cache_generation += 1
+        if self.cache is not None:
+            self.cache.invalidate(self.cache_namespace)
+
+    def _invalidate(self, session: AsyncSession) -> None:
+        """Invalidate the cache once the session's transaction ends, other sessions can't see the write before."""
+        if self.cache is not None:
+            session.info.setdefault(PENDING_INVALIDATIONS, set()).add(self)
+
+    def _after_commit(self, session: AsyncSession, callback: Callable[[], None]) -> None:
+        """Call `callback` once the session's transaction commits, and never if it rolls back."""
+        session.info.setdefault(PENDING_COMMIT_CALLBACKS, []).append(callback)
 
     async def create_(
         self,
@@ -39,6 +148,7 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
 
         ins = self.model(**obj.model_dump()) if not extra else self.model(**obj.model_dump(), **extra)
         session.add(ins)
+        self._invalidate(session)
 
         if commit:
             await session.commit()
@@ -58,6 +168,7 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             ins_list.append(self.model(**ins.model_dump()))
 
         session.add_all(ins_list)
+        self._invalidate(session)
 
         if commit:
             await session.commit()
@@ -72,21 +183,95 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         limit: int | None = None,
         offset: int | None = None,
     ) -> Sequence[ModelType]:
-        stmt = select(self.model).where(filters).limit(limit).offset(offset)
+        model = self.model
+        stmt = lambda_stmt(lambda: select(model))
+        stmt += lambda s: s.where(filters)  # pyright: ignore[reportUnknownLambdaType]
+        if limit is not None:
+            stmt += lambda s: s.limit(limit)  # pyright: ignore[reportUnknownLambdaType]
+        if offset is not None:
+            stmt += lambda s: s.offset(offset)  # pyright: ignore[reportUnknownLambdaType]
+
         query = await session.execute(stmt)
 
-        return query.scalars().all()
+        return query.unique().scalars().all()
 
-    async def select_first_(
+    @overload
+    def stream_(
+        self,
+        session: AsyncSession,
+        *,
+        filters: Filters = EMPTY_FILTERS,
+        options: Sequence[ExecutableOption] = (),
+        yield_per: int = STREAM_YIELD_PER,
+    ) -> AsyncGenerator[ModelType]: ...
+
+    @overload
+    def stream_(
+        self,
+        session: AsyncSession,
+        *,
+        columns: Sequence[ColumnElement[Any] | InstrumentedAttribute[Any]],
+        filters: Filters = EMPTY_FILTERS,
+        yield_per: int = STREAM_YIELD_PER,
+    ) -> AsyncGenerator[Row[Any]]: ...
+
+    async def stream_(
+        self,
+        session: AsyncSession,
+        *,
+        columns: Sequence[ColumnElement[Any] | InstrumentedAttribute[Any]] | None = None,
+        filters: Filters = EMPTY_FILTERS,
+        options: Sequence[ExecutableOption] = (),
+        yield_per: int = STREAM_YIELD_PER,
+    ) -> AsyncGenerator[ModelType | Row[Any]]:
+        """
+        Every matching instance, or row of `columns`, fetched through a server-side cursor `yield_per` rows at a time.
+
+        Memory only ever holds a batch, and the first one can be worked on while the rest are fetched.
+        Joined eager loads can't be fetched in batches, and would pull in every child of the batch and
+        theirs in turn, so relationships aren't loaded and raise when accessed. Pass loader `options`
+        for the ones needed, such as `selectinload(Model.children).raiseload("*")`. The cursor holds on
+        to the connection until the generator is exhausted, wrap it in `contextlib.aclosing` to stop early.
+        """
+        stmt = select(self.model).options(raiseload("*"), *options) if columns is None else select(*columns)
+
+        result = await session.stream(stmt.where(filters).execution_options(yield_per=yield_per))
+
+        try:
+            if columns is None:
+                async for instance in result.scalars():
+                    yield instance
+            else:
+                async for row in result:
+                    yield row
+        finally:
+            await result.close()
+
+    async def _select_first(
         self,
         session: AsyncSession,
         *,
         filters: Filters = EMPTY_FILTERS,
     ) -> ModelType | None:
-        stmt = select(self.model).where(filters)
+        model = self.model
+        stmt = lambda_stmt(lambda: select(model))
+        stmt += lambda s: s.where(filters)  # pyright: ignore[reportUnknownLambdaType]
+
         query = await session.execute(stmt)
 
-        return query.scalars().first()
+        return query.unique().scalars().first()
+
+    async def select_first_(
+        self,
+        session: AsyncSession,
+        *,
+        filters: Filters = EMPTY_FILTERS,
+    ) -> ModelType | None:
+        key = None
+        if self.cache is not None and (fingerprint := filters_fingerprint(filters)) is not None:
+            key = (self.cache_namespace, "first", fingerprint)
+
+        return await self._cached_first(session, key, filters)
 
     async def select_by_id(
         self,
@@ -94,9 +279,10 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         *,
         pk: PrimaryKeyIDType,
     ) -> ModelType | None:
-        rows = await self.select_first_(
+        rows = await self._cached_first(
             session,
-            filters=self.model.id == pk,  # pyright: ignore[reportUnknownArgumentType, reportAttributeAccessIssue]
+            (self.cache_namespace, "pk", pk),
+            self.model.id == pk,  # pyright: ignore[reportUnknownArgumentType, reportAttributeAccessIssue]
         )
 
         return rows
@@ -128,6 +314,7 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         stmt = update(self.model).where(filters).values(**instance_data)
 
         result = await session.execute(stmt)
+        self._invalidate(session)
 
         if commit:
             await session.commit()
@@ -167,6 +354,7 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             stmt = delete(self.model).where(filters)
 
         result = await session.execute(stmt)
+        self._invalidate(session)
 
         if commit:
             await session.commit()
@@ -0,0 +1,85 @@
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any, Protocol
+
+from prometheus_client import Counter
+
+type CacheKey = tuple[Hashable, ...]
+
+CACHE_REQUESTS = Counter(
+    "crud_cache_requests_total",
+    "Total count of cached CRUD reads by model and result (hit or miss).",
+    ["model", "result"],
+)
+CACHE_EVICTIONS = Counter(
+    "crud_cache_evictions_total",
+    "Total count of entries removed from CRUD caches by model and reason.",
+    ["model", "reason"],
+)
+
+
+class CacheBackend(Protocol):
+    """
+    Storage for cached CRUD reads.
+
+    Keys always start with a namespace (the model's table name), which is what
+    writes invalidate. A shared backend (such as Redis) has to be able to pickle
+    the ORM instances it is given.
+    """
+
+    def get(self, key: CacheKey) -> Any | None: ...
+
+    def set(self, key: CacheKey, value: Any) -> None: ...
+
+    def invalidate(self, namespace: str) -> None: ...
+
+
+class LRUCache:
+    """Per-process cache bounded by both entry count and age."""
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+
+        self._entries: OrderedDict[CacheKey, tuple[float, Any]] = OrderedDict()
+        self._namespaces: dict[str, set[CacheKey]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: CacheKey) -> Any | None:
+        if (entry := self._entries.get(key)) is None:
+            return None
+
+        expires_at, value = entry
+
+        if expires_at < time.monotonic():
+            self._remove(key, reason="ttl")
+            return None
+
+        self._entries.move_to_end(key)
+
+        return value
+
+    def set(self, key: CacheKey, value: Any) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        self._namespaces.setdefault(str(key[0]), set()).add(key)
+
+        while len(self._entries) > self.maxsize:
+            self._remove(next(iter(self._entries)), reason="size")
+
+    def invalidate(self, namespace: str) -> None:
+        for key in self._namespaces.pop(namespace, set()):
+            if self._entries.pop(key, None) is not None:
+                CACHE_EVICTIONS.labels(model=namespace, reason="invalidation").inc()
+
+    def _remove(self, key: CacheKey, *, reason: str) -> None:
+        del self._entries[key]
+
+        namespace = str(key[0])
+        if (keys := self._namespaces.get(namespace)) is not None:
+            keys.discard(key)
+
+        CACHE_EVICTIONS.labels(model=namespace, reason=reason).inc()
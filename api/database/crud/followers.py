@@ -0,0 +1,30 @@
+from datetime import timedelta
+
+from sqlalchemy import Interval, literal
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.functions import now
+
+from api.database.crud.base import CRUDBase
+from api.database.models.warframe.followers import ItemFollowersModel
+from api.routers.schemas.prices import ItemFollowersCreate, ItemFollowersUpdate
+
+
+class ItemFollowersCRUD(CRUDBase[ItemFollowersModel, ItemFollowersCreate, ItemFollowersUpdate]):
+    async def report(self, db: AsyncSession, *, worker: str, followers: dict[str, int]) -> None:
+        """Replace the items `worker` follows, and how many follow each of them."""
+        await self.delete_(db, filters=self.model.worker == worker)
+
+        await self.create_all_(
+            db,
+            obj=(
+                ItemFollowersCreate(worker=worker, item_id=item_id, followers=count)
+                for item_id, count in followers.items()
+            ),
+            commit=False,
+        )
+
+    async def purge_stale(self, db: AsyncSession, *, older_than: timedelta) -> int:
+        return await self.delete_(db, filters=self.model.reported_at < now() - literal(older_than, Interval))
+
+
+item_followers_dao = ItemFollowersCRUD(ItemFollowersModel)
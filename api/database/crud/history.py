@@ -0,0 +1,152 @@
+from collections.abc import AsyncIterator, Sequence
+from datetime import datetime, timedelta
+from typing import Any
+
+from sqlalchemy import Row, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.database.crud.base import CRUDBase
+from api.database.models.warframe.history import PriceSketchModel, PriceSnapshotModel
+from api.market.order_book import OrderBook
+from api.market.sketches import TDigest, bucket_start, cover_window
+from api.routers.schemas.history import (
+    PriceSketchCreate,
+    PriceSketchUpdate,
+    PriceSnapshotCreate,
+    PriceSnapshotUpdate,
+)
+from api.settings import settings
+
+# Rows fetched from the server at a time while streaming history
+HISTORY_CHUNK_SIZE = 10_000
+
+
+class PriceHistoryCRUD(CRUDBase[PriceSnapshotModel, PriceSnapshotCreate, PriceSnapshotUpdate]):
+    async def record(self, db: AsyncSession, *, book: OrderBook) -> PriceSnapshotModel:
+        prices, quantities = book.sell.quantity_frontier()
+
+        return await self.create_(
+            db,
+            obj=PriceSnapshotCreate(
+                item_id=book.item_id,
+                best_sell=book.sell.best_price(),
+                best_buy=book.buy.best_price(),
+                sell_prices=prices,
+                sell_quantities=quantities,
+            ),
+            commit=False,
+        )
+
+    async def stream_item(
+        self,
+        db: AsyncSession,
+        *,
+        item_id: str,
+        since: datetime | None = None,
+        until: datetime | None = None,
+    ) -> AsyncIterator[Sequence[Row[tuple[datetime, list[int], list[int]]]]]:
+        """
+        An item's sell side history in chunks, oldest first.
+
+        Rows are fetched through a server-side cursor, so memory only ever holds one chunk.
+        """
+        filters: list[Any] = [self.model.item_id == item_id]
+        if since is not None:
+            filters.append(self.model.recorded_at >= since)
+        if until is not None:
+            filters.append(self.model.recorded_at < until)
+
+        stmt = (
+            select(self.model.recorded_at, self.model.sell_prices, self.model.sell_quantities)
+            .where(*filters)
+            .order_by(self.model.recorded_at)
+            .execution_options(yield_per=HISTORY_CHUNK_SIZE)
+        )
+        result = await db.stream(stmt)
+
+        async for partition in result.partitions():
+            yield partition
+
+
+class PriceSketchCRUD(CRUDBase[PriceSketchModel, PriceSketchCreate, PriceSketchUpdate]):
+    """Digests of the best prices per bucket, kept up to date as snapshots are recorded."""
+
+    def __init__(self, model: type[PriceSketchModel], *, widths: Sequence[timedelta], compression: int) -> None:
+        super().__init__(model)
+        self.widths = sorted(widths)
+        self.compression = compression
+
+    def _add(self, encoded: bytes, price: int | None) -> bytes:
+        if price is None:
+            return encoded
+
+        return TDigest.from_bytes(encoded).add([price]).to_bytes()
+
+    async def record(self, db: AsyncSession, *, snapshot: PriceSnapshotModel) -> None:
+        """
+        Add a snapshot's best prices to its bucket of every width.
+
+        Missing buckets are created first, then every bucket is locked while its digests
+        are updated, so snapshots recorded by concurrent transactions all count.
+        """
+        # Recording time is only known once the snapshot is written
+        await db.flush()
+
+        empty = TDigest.empty(self.compression).to_bytes()
+        keys = [(width, bucket_start(snapshot.recorded_at, width)) for width in self.widths]
+
+        await db.execute(
+            insert(self.model)
+            .values(
+                [
+                    PriceSketchCreate(
+                        item_id=snapshot.item_id, width=width, bucket=bucket, sell=empty, buy=empty
+                    ).model_dump()
+                    for width, bucket in keys
+                ],
+            )
+            .on_conflict_do_nothing(),
+        )
+
+        stmt = (
+            select(self.model)
+            .where(self.model.item_id == snapshot.item_id, tuple_(self.model.width, self.model.bucket).in_(keys))
+            .order_by(self.model.width)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+        for sketch in await db.scalars(stmt):
+            sketch.sell = self._add(sketch.sell, snapshot.best_sell)
+            sketch.buy = self._add(sketch.buy, snapshot.best_buy)
+
+    async def merge_window(
+        self,
+        db: AsyncSession,
+        *,
+        item_id: str,
+        since: datetime,
+        until: datetime,
+    ) -> tuple[TDigest, TDigest]:
+        """Sell and buy digests of an item over a window, widened to whole buckets of the narrowest width."""
+        keys = cover_window(since, until, self.widths)
+
+        stmt = select(self.model.sell, self.model.buy).where(
+            self.model.item_id == item_id,
+            tuple_(self.model.width, self.model.bucket).in_(keys),
+        )
+        result = await db.execute(stmt)
+        rows = result.tuples().all()
+
+        return (
+            TDigest.merge([TDigest.from_bytes(sell) for sell, _ in rows], self.compression),
+            TDigest.merge([TDigest.from_bytes(buy) for _, buy in rows], self.compression),
+        )
+
+
+price_history_dao = PriceHistoryCRUD(PriceSnapshotModel)
+price_sketch_dao = PriceSketchCRUD(
+    PriceSketchModel,
+    widths=[timedelta(seconds=width) for width in settings.price_sketch_widths],
+    compression=settings.price_sketch_compression,
+)
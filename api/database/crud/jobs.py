@@ -0,0 +1,145 @@
+from collections.abc import Iterable, Sequence
+from datetime import timedelta
+
+from sqlalchemy import ColumnElement, Interval, and_, case, delete, func, literal, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.functions import now
+
+from api.database.crud.base import CRUDBase
+from api.database.models.jobs import JobModel
+from api.routers.schemas.jobs import JobCreate, JobUpdate
+
+
+class JobCRUD(CRUDBase[JobModel, JobCreate, JobUpdate]):
+    def _claimable(self) -> ColumnElement[bool]:
+        return and_(
+            self.model.finished_at.is_(None),
+            self.model.run_at <= now(),
+            self.model.attempts < self.model.max_attempts,
+            or_(self.model.leased_until.is_(None), self.model.leased_until < now()),
+        )
+
+    async def enqueue(self, db: AsyncSession, *, jobs: Iterable[JobCreate]) -> int:
+        """Add jobs, skipping any whose key matches an unfinished job of the same kind, returning how many were."""
+        # Rendered as one multi-row VALUES, so a job without a `run_at` can default to the database's clock
+        rows = [{**job.model_dump(), "run_at": now() if job.run_at is None else job.run_at} for job in jobs]
+        if not rows:
+            return 0
+
+        stmt = (
+            insert(self.model)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=["kind", "key"], index_where=self.model.finished_at.is_(None))
+            .returning(self.model.id)
+        )
+        result = await db.execute(stmt)
+
+        return len(result.all())
+
+    async def claim_batch(
+        self,
+        db: AsyncSession,
+        *,
+        kinds: Iterable[str],
+        worker: str,
+        limit: int,
+        lease: timedelta,
+    ) -> Sequence[JobModel]:
+        """
+        Lease a batch of due jobs to `worker`.
+
+        Rows being claimed by other workers are skipped. The lease is what keeps a job from being
+        claimed again, so it has to be extended for as long as the job runs.
+        """
+        due = (
+            select(self.model.id)
+            .where(self._claimable(), self.model.kind.in_(list(kinds)))
+            .order_by(self.model.run_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        stmt = (
+            update(self.model)
+            .where(self.model.id.in_(due.scalar_subquery()))
+            .values(
+                leased_by=worker,
+                leased_until=now() + literal(lease, Interval),
+                attempts=self.model.attempts + 1,
+            )
+            .returning(self.model)
+            .execution_options(synchronize_session="fetch")
+        )
+        query = await db.scalars(stmt)
+
+        return query.all()
+
+    async def extend_leases(self, db: AsyncSession, *, pk: list[int], worker: str, lease: timedelta) -> int:
+        stmt = (
+            update(self.model)
+            .where(self.model.id.in_(pk), self.model.leased_by == worker)
+            .values(leased_until=now() + literal(lease, Interval))
+        )
+        result = await db.execute(stmt)
+
+        return result.rowcount
+
+    async def complete(self, db: AsyncSession, *, pk: int, worker: str) -> int:
+        stmt = delete(self.model).where(self.model.id == pk, self.model.leased_by == worker)
+        result = await db.execute(stmt)
+
+        return result.rowcount
+
+    async def fail(self, db: AsyncSession, *, pk: int, worker: str, error: str, backoff: timedelta) -> bool:
+        """
+        Release a job for another attempt, waiting twice as long as before the previous one.
+
+        Returns whether the job ran out of attempts, in which case it's kept as finished instead.
+        """
+        exhausted = self.model.attempts >= self.model.max_attempts
+        stmt = (
+            update(self.model)
+            .where(self.model.id == pk, self.model.leased_by == worker)
+            .values(
+                leased_by=None,
+                leased_until=None,
+                last_error=error,
+                run_at=now() + func.power(2, self.model.attempts - 1) * literal(backoff, Interval),
+                finished_at=case((exhausted, now()), else_=None),
+            )
+            .returning(self.model.finished_at.is_not(None))
+        )
+        result = await db.execute(stmt)
+
+        return bool(result.scalar())
+
+    async def expire_abandoned(self, db: AsyncSession) -> int:
+        """Finish jobs whose every attempt ended with an expired lease, such as when workers keep crashing."""
+        stmt = (
+            update(self.model)
+            .where(
+                self.model.finished_at.is_(None),
+                self.model.attempts >= self.model.max_attempts,
+                self.model.leased_until < now(),
+            )
+            .values(finished_at=now(), last_error="Lease expired on every attempt")
+        )
+        result = await db.execute(stmt)
+
+        return result.rowcount
+
+    async def purge_finished(self, db: AsyncSession, *, older_than: timedelta) -> int:
+        return await self.delete_(
+            db,
+            filters=self.model.finished_at < now() - literal(older_than, Interval),
+        )
+
+    async def queue_depth(self, db: AsyncSession) -> dict[str, int]:
+        """Jobs that could be claimed right now, by kind."""
+        stmt = select(self.model.kind, func.count()).where(self._claimable()).group_by(self.model.kind)
+        query = await db.execute(stmt)
+
+        return dict(query.tuples().all())
+
+
+job_dao = JobCRUD(JobModel)
@@ -0,0 +1,105 @@
+from collections.abc import Sequence
+from datetime import timedelta
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import Interval, case, func, literal, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.functions import now
+
+from api.database.crud.base import CRUDBase
+from api.database.models.notifications import NotificationOutboxModel
+from api.routers.schemas.notifications import NotificationCreate, NotificationUpdate
+from api.settings import settings
+
+
+class NotificationOutboxCRUD(CRUDBase[NotificationOutboxModel, NotificationCreate, NotificationUpdate]):
+    async def enqueue(
+        self,
+        db: AsyncSession,
+        *,
+        recipients: list[int],
+        payload: dict[str, Any],
+        order_id: UUID | None = None,
+    ) -> list[NotificationOutboxModel]:
+        """
+        Queue a notification for each recipient.
+
+        Nothing is committed, so the rows are only delivered if the caller's transaction is.
+        """
+        if settings.notification_webhook_url is None:
+            return []
+
+        return await self.create_all_(
+            db,
+            obj=(
+                NotificationCreate(
+                    destination=settings.notification_webhook_url,
+                    user_id=user_id,
+                    order_id=order_id,
+                    payload={**payload, "user_id": user_id},
+                )
+                for user_id in recipients
+            ),
+            commit=False,
+        )
+
+    async def claim_batch(
+        self,
+        db: AsyncSession,
+        *,
+        limit: int,
+        lease: timedelta,
+    ) -> Sequence[NotificationOutboxModel]:
+        """
+        Lease a batch of due notifications for delivery, counting it as an attempt.
+
+        Rows locked by other dispatchers are skipped, and the lease moves `available_at` past the time it
+        takes to send them, so the claiming transaction can end before they're sent. Rows that are never
+        marked, because their dispatcher died, come due again once the lease runs out.
+        """
+        due = (
+            select(self.model.id)
+            .where(
+                self.model.delivered_at.is_(None),
+                self.model.failed_at.is_(None),
+                self.model.available_at <= now(),
+            )
+            .order_by(self.model.available_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        stmt = (
+            update(self.model)
+            .where(self.model.id.in_(due))
+            .values(attempts=self.model.attempts + 1, available_at=now() + literal(lease, Interval))
+            .returning(self.model)
+        )
+        query = await db.execute(stmt)
+
+        return query.scalars().all()
+
+    async def mark_delivered(self, db: AsyncSession, *, pk: list[int]) -> int:
+        return await self.update_(db, filters=self.model.id.in_(pk), obj={"delivered_at": now()})
+
+    async def mark_failed(self, db: AsyncSession, *, pk: list[int], backoff: timedelta, max_attempts: int) -> int:
+        """
+        Schedule another attempt, waiting twice as long as the previous one.
+
+        Rows that have had `max_attempts` are marked failed instead, and the number of them is returned.
+        """
+        stmt = (
+            update(self.model)
+            .where(self.model.id.in_(pk))
+            .values(
+                available_at=now() + func.power(2, self.model.attempts - 1) * literal(backoff, Interval),
+                failed_at=case((self.model.attempts >= max_attempts, now())),
+            )
+            .returning(self.model.failed_at.is_not(None))
+        )
+        result = await db.execute(stmt)
+
+        return sum(result.scalars().all())
+
+
+notification_outbox_dao = NotificationOutboxCRUD(NotificationOutboxModel)
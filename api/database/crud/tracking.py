@@ -1,19 +1,112 @@
+from collections.abc import Sequence
+from datetime import timedelta
+from uuid import UUID
+
+from sqlalchemy import Interval, delete, literal, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.functions import now
 
 from api.database.crud.base import CRUDBase
+from api.database.crud.cache import CacheBackend, LRUCache
 from api.database.models.warframe.tracking import WarframeMarketOrderModel
+from api.market.thresholds import ThresholdIndex
 from api.routers.schemas.tracking import OrderCreate, OrderUpdate
+from api.settings import settings
 
 
 class OrderTrackingCRUD(CRUDBase[WarframeMarketOrderModel, OrderCreate, OrderUpdate]):
+    """
+    Data access for trackers.
+
+    Creating and deleting trackers through here keeps `thresholds` up to date as well,
+    deleted ones are removed from it once the deletion commits.
+    """
+
+    def __init__(
+        self,
+        model: type[WarframeMarketOrderModel],
+        *,
+        thresholds: ThresholdIndex,
+        cache: CacheBackend | None = None,
+    ) -> None:
+        super().__init__(model, cache=cache)
+        self.thresholds = thresholds
+
     async def get_by_user_id(self, db: AsyncSession, *, user_id: int) -> WarframeMarketOrderModel | None:
         return await self.select_first_(db, filters=self.model.user_id == user_id)
 
     async def create(self, db: AsyncSession, *, obj: OrderCreate) -> WarframeMarketOrderModel:
-        return await self.create_(db, obj=obj)
+        order = await self.create_(db, obj=obj)
+        self.thresholds.add(
+            order.item_id,
+            (order.id, order.user_id, order.platinum_threshold, order.minimum_quantity),
+        )
+
+        return order
 
     async def delete(self, db: AsyncSession, *, pk: list[int]) -> int:
-        return await self.delete_(db, filters=self.model.user_id.in_(pk))
+        stmt = delete(self.model).where(self.model.user_id.in_(pk)).returning(self.model.id, self.model.item_id)
+        result = await db.execute(stmt)
+        self._invalidate(db)
+
+        deleted = result.tuples().all()
+        # Until then the trackers may come back, and evaluating them only finds them gone when claiming
+        self._after_commit(db, lambda: self.thresholds.remove(deleted))
+
+        return len(deleted)
+
+    async def get_thresholds(self, db: AsyncSession, *, item_id: str) -> Sequence[tuple[UUID, int, int, int]]:
+        """What it takes to evaluate every tracker on an item, without loading the trackers themselves."""
+        stmt = select(
+            self.model.id,
+            self.model.user_id,
+            self.model.platinum_threshold,
+            self.model.minimum_quantity,
+        ).where(self.model.item_id == item_id)
+        query = await db.execute(stmt)
+
+        return query.tuples().all()
+
+    async def claim_triggered(
+        self,
+        db: AsyncSession,
+        *,
+        pk: Sequence[UUID],
+        cooldown: timedelta,
+    ) -> Sequence[WarframeMarketOrderModel]:
+        """
+        Mark triggered orders as alerted, and return them.
+
+        Orders that alerted within `cooldown` are left out, and since the rows are locked
+        by the update, concurrent evaluations of the same item can't both claim an order.
+        """
+        if not pk:
+            return []
+
+        stmt = (
+            update(self.model)
+            .where(
+                self.model.id.in_(pk),
+                or_(
+                    self.model.alerted_at.is_(None),
+                    self.model.alerted_at <= now() - literal(cooldown, Interval),
+                ),
+            )
+            # Alerting isn't a change made by the user
+            .values(alerted_at=now(), updated_at=self.model.updated_at)
+            .returning(self.model.id)
+        )
+        result = await db.execute(stmt)
+        self._invalidate(db)
+
+        if not (ids := result.scalars().all()):
+            return []
+
+        return await self.select_(db, filters=self.model.id.in_(ids))
 
 
-order_tracking_dao = OrderTrackingCRUD(WarframeMarketOrderModel)
+order_tracking_dao = OrderTrackingCRUD(
+    WarframeMarketOrderModel,
+    thresholds=ThresholdIndex(ttl=settings.threshold_index_ttl),
+    cache=LRUCache(settings.crud_cache_size, settings.crud_cache_ttl) if settings.order_tracking_cache else None,
+)
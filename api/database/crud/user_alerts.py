@@ -3,8 +3,10 @@ from collections.abc import Sequence
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from api.database.crud.base import CRUDBase
+from api.database.crud.cache import LRUCache
 from api.database.models.warframe.tracking import UserOrderAlertsModel
 from api.routers.schemas.user_alerts import UserAlertCreate, UserAlertUpdate
+from api.settings import settings
 
 
 class UserAlertsCRUD(CRUDBase[UserOrderAlertsModel, UserAlertCreate, UserAlertUpdate]):
@@ -18,4 +20,7 @@ class UserAlertsCRUD(CRUDBase[UserOrderAlertsModel, UserAlertCreate, UserAlertUp
         return await self.delete_(db, filters=self.model.id.in_(pk))
 
 
-user_alerts_dao = UserAlertsCRUD(UserOrderAlertsModel)
+user_alerts_dao = UserAlertsCRUD(
+    UserOrderAlertsModel,
+    cache=LRUCache(settings.crud_cache_size, settings.crud_cache_ttl) if settings.user_alerts_cache else None,
+)
@@ -0,0 +1,72 @@
+from typing import Any
+from uuid import uuid4
+
+from prometheus_client import Counter
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, ExecutionContext
+from sqlalchemy.engine.interfaces import CacheStats
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from api.settings import settings
+
+COMPILED_CACHE = Counter(
+    "sqlalchemy_compiled_cache_total",
+    "Total count of executed statements by compiled cache result.",
+    ["result"],
+)
+
+
+def _record_compiled_cache(
+    _conn: Connection,
+    _cursor: Any,
+    _statement: str,
+    _parameters: Any,
+    context: ExecutionContext | None,
+    _executemany: bool,
+) -> None:
+    if context is None:
+        return
+
+    cache_hit: CacheStats = context.cache_hit  # pyright: ignore[reportAttributeAccessIssue, reportUnknownVariableType]
+    COMPILED_CACHE.labels(result=cache_hit.name.lower()).inc()
+
+
+def _prepared_statement_name() -> str:
+    return f"__asyncpg_{uuid4()}__"
+
+
+def create_engine() -> AsyncEngine:
+    """
+    Create the application's database engine.
+
+    asyncpg prepares every statement it runs, and SQLAlchemy keeps a per-connection
+    cache of those prepared statements. Behind pgbouncer in transaction mode, the
+    server connection can change between transactions, so that cache is turned off
+    and statements get unique names instead of asyncpg's sequential ones.
+    """
+    connect_args: dict[str, Any] = {
+        "prepared_statement_cache_size": settings.db_prepared_statement_cache_size,
+    }
+    kwargs: dict[str, Any] = {}
+
+    if settings.db_pgbouncer:
+        connect_args = {
+            "prepared_statement_cache_size": 0,
+            "statement_cache_size": 0,
+            "prepared_statement_name_func": _prepared_statement_name,
+        }
+        # pgbouncer does the pooling, keeping our own would pin server connections
+        kwargs["poolclass"] = NullPool
+
+    engine = create_async_engine(
+        str(settings.db_url),
+        echo=settings.db_echo,
+        query_cache_size=settings.db_query_cache_size,
+        connect_args=connect_args,
+        **kwargs,
+    )
+
+    event.listen(engine.sync_engine, "before_cursor_execute", _record_compiled_cache)
+
+    return engine
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import BigInteger, DateTime, Index, Integer, Text, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql.functions import now
+
+from api.database.base import Base
+
+
+class JobModel(Base):
+    """
+    Background work, claimed by whichever worker gets to it first.
+
+    Finished jobs are deleted, only the ones that ran out of attempts are kept (with `finished_at` set).
+    """
+
+    __tablename__ = "jobs"
+    __table_args__ = (
+        # Only unfinished jobs are ever claimed
+        Index(
+            "ix_jobs_pending",
+            "run_at",
+            postgresql_where=text("finished_at IS NULL"),
+        ),
+        # At most one unfinished job per key and kind
+        Index(
+            "uq_jobs_kind_key",
+            "kind",
+            "key",
+            unique=True,
+            postgresql_where=text("finished_at IS NULL"),
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=now())
+
+    # Which handler runs the job
+    kind: Mapped[str] = mapped_column(Text, nullable=False)
+
+    # Identifies the work being done, enqueuing a job with the key of an unfinished one does nothing
+    key: Mapped[str | None] = mapped_column(Text)
+
+    payload: Mapped[dict[str, Any]] = mapped_column(JSONB, nullable=False)
+
+    # Attempts so far, and when the next one may happen
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    max_attempts: Mapped[int] = mapped_column(Integer, nullable=False)
+    run_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=now())
+
+    # Who is running the job, and until when, unless they keep extending it
+    leased_by: Mapped[str | None] = mapped_column(Text)
+    leased_until: Mapped[datetime | None] = mapped_column(DateTime)
+
+    last_error: Mapped[str | None] = mapped_column(Text)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime)
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import UUID, BigInteger, DateTime, ForeignKey, Index, Integer, Text, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql.functions import now
+
+from api.database.base import Base
+
+
+class NotificationOutboxModel(Base):
+    """
+    Notifications waiting to be delivered.
+
+    Rows are written in the same transaction that decides a notification is due,
+    and a dispatcher delivers them afterwards, so nothing is lost or sent for a rolled back change.
+    """
+
+    __tablename__ = "notification_outbox"
+    __table_args__ = (
+        # Only rows neither delivered nor given up on are ever claimed
+        Index(
+            "ix_notification_outbox_pending",
+            "available_at",
+            postgresql_where=text("delivered_at IS NULL AND failed_at IS NULL"),
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=now())
+
+    # Where the notification is sent, messages for the same destination are delivered together
+    destination: Mapped[str] = mapped_column(Text, nullable=False)
+
+    # Who is being notified
+    user_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+
+    # The tracker that triggered this notification, if any
+    order_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("warframe_market_orders.id", ondelete="CASCADE"),
+    )
+
+    payload: Mapped[dict[str, Any]] = mapped_column(JSONB, nullable=False)
+
+    # Delivery attempts so far, and when the next one may happen
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    available_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=now())
+
+    delivered_at: Mapped[datetime | None] = mapped_column(DateTime)
+
+    # Set once every attempt failed, the notification is never tried again
+    failed_at: Mapped[datetime | None] = mapped_column(DateTime)
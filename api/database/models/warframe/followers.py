@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, Integer, Text
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql.functions import now
+
+from api.database.base import Base
+
+
+class ItemFollowersModel(Base):
+    """
+    How many follow an item in one worker, with live subscriptions and recent summary requests.
+
+    Every worker replaces its rows periodically, and the worker scheduling polls adds them up.
+    Rows of workers that stopped reporting are ignored once they're stale, and then removed.
+    """
+
+    __tablename__ = "item_followers"
+
+    worker: Mapped[str] = mapped_column(Text, primary_key=True)
+
+    # Not a foreign key, subscribers can follow IDs that aren't items, which are never polled
+    item_id: Mapped[str] = mapped_column(Text, primary_key=True)
+
+    followers: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    reported_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=now())
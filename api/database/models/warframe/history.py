@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import ARRAY, DateTime, ForeignKey, Integer, Interval, LargeBinary, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from api.database.base import Base
+
+
+class PriceSnapshotModel(Base):
+    """
+    An item's prices as of one poll of its orders.
+
+    Rather than every order, only the sellers that matter to trackers are kept: the ones
+    offering more at once than any cheaper seller, with their prices and quantities ascending.
+    """
+
+    __tablename__ = "price_history"
+
+    item_id: Mapped[str] = mapped_column(ForeignKey("warframe_items.id"), primary_key=True)
+
+    # When the row is written, rather than when its transaction started, like `now()`
+    recorded_at: Mapped[datetime] = mapped_column(DateTime, primary_key=True, default=func.clock_timestamp())
+
+    best_sell: Mapped[int | None] = mapped_column(Integer)
+    best_buy: Mapped[int | None] = mapped_column(Integer)
+
+    sell_prices: Mapped[list[int]] = mapped_column(ARRAY(Integer), nullable=False)
+    sell_quantities: Mapped[list[int]] = mapped_column(ARRAY(Integer), nullable=False)
+
+
+class PriceSketchModel(Base):
+    """
+    Digests of an item's best prices over one time bucket, for estimating quantiles of any window.
+
+    Each snapshot is added to a bucket of every configured width, so a window can be
+    covered by a few wide buckets and narrow ones at its edges.
+    """
+
+    __tablename__ = "price_sketches"
+
+    item_id: Mapped[str] = mapped_column(ForeignKey("warframe_items.id"), primary_key=True)
+    width: Mapped[timedelta] = mapped_column(Interval, primary_key=True)
+    bucket: Mapped[datetime] = mapped_column(DateTime, primary_key=True)
+
+    # Encoded t-digests of the best sell and buy prices
+    sell: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    buy: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
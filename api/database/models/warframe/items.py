@@ -1,16 +1,54 @@
 from __future__ import annotations
 
-from sqlalchemy import Text
+from datetime import datetime
+from typing import Literal, get_args
+
+from sqlalchemy import Computed, DateTime, ForeignKey, Index, Integer, Text, text
+from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from api.database.base import Base
 from api.database.models.warframe.tracking import WarframeMarketOrderModel
 
+# Languages warframe.market translates item names into
+Language = Literal["en", "ru", "ko", "de", "fr", "pt", "zh-hans", "zh-hant", "es", "it", "pl", "uk"]
+LANGUAGES: tuple[Language, ...] = get_args(Language)
+
+# Item names are kept in English along with the rest of the item
+DEFAULT_LANGUAGE: Language = "en"
+
 
 class WarframeItemModel(Base):
     """All of the available items currently in the game."""
 
     __tablename__ = "warframe_items"
+    __table_args__ = (
+        # Prefix matching with `LIKE 'prefix%'`, whatever the database's collation
+        Index(
+            "ix_warframe_items_item_name_prefix",
+            text("lower(item_name) text_pattern_ops"),
+        ),
+        Index(
+            "ix_warframe_items_url_name_prefix",
+            "url_name",
+            postgresql_ops={"url_name": "text_pattern_ops"},
+        ),
+        # Fuzzy matching with the `%` similarity operator
+        Index(
+            "ix_warframe_items_item_name_trgm",
+            "item_name",
+            postgresql_using="gin",
+            postgresql_ops={"item_name": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_warframe_items_url_name_trgm",
+            "url_name",
+            postgresql_using="gin",
+            postgresql_ops={"url_name": "gin_trgm_ops"},
+        ),
+        # Both columns in one index, so a search and its tags are matched with a single scan
+        Index("ix_warframe_items_search", "search", "tags", postgresql_using="gin"),
+    )
 
     id: Mapped[str] = mapped_column(Text, primary_key=True)
 
@@ -20,10 +58,54 @@ class WarframeItemModel(Base):
     thumb: Mapped[str] = mapped_column(Text, nullable=False)
 
     # The item's name that can be used in a URL
-    url_name: Mapped[str] = mapped_column(Text, nullable=False)
+    url_name: Mapped[str] = mapped_column(Text, nullable=False, unique=True, index=True)
+
+    # Details from the item's own page, filled in after it's synced
+    tags: Mapped[list[str]] = mapped_column(ARRAY(Text), nullable=False, server_default="{}")
+    ducats: Mapped[int | None] = mapped_column(Integer)
+    mastery_level: Mapped[int | None] = mapped_column(Integer)
+
+    # The set the item belongs to, by the ID of the set item itself, which belongs to it too
+    set_id: Mapped[str | None] = mapped_column(Text, index=True)
+
+    # Null until the details are fetched, and again whenever the item changes
+    enriched_at: Mapped[datetime | None] = mapped_column(DateTime)
+    # Attempts at fetching the details since then, and when the next one can be made
+    enrich_attempts: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    enrich_after: Mapped[datetime | None] = mapped_column(DateTime)
+
+    # Words of the name along with the tags, for full-text search
+    search: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed("to_tsvector('simple', item_name) || array_to_tsvector(tags)", persisted=True),
+        deferred=True,
+    )
 
     orders: Mapped[list[WarframeMarketOrderModel]] = relationship(
         "WarframeMarketOrderModel",
         back_populates="item",
         lazy="joined",
     )
+
+
+class WarframeItemNameModel(Base):
+    """An item's name in a language other than English."""
+
+    __tablename__ = "warframe_item_names"
+    __table_args__ = tuple(
+        # One per language, so fuzzy matching only goes through the names in the language searched
+        Index(
+            f"ix_warframe_item_names_{language.replace("-", "_")}_trgm",
+            "item_name",
+            postgresql_using="gin",
+            postgresql_ops={"item_name": "gin_trgm_ops"},
+            postgresql_where=text(f"language = '{language}'"),
+        )
+        for language in LANGUAGES
+        if language != DEFAULT_LANGUAGE
+    )
+
+    item_id: Mapped[str] = mapped_column(ForeignKey("warframe_items.id", ondelete="CASCADE"), primary_key=True)
+    language: Mapped[str] = mapped_column(Text, primary_key=True)
+
+    item_name: Mapped[str] = mapped_column(Text, nullable=False)
@@ -79,8 +79,11 @@ class WarframeMarketOrderModel(Base):
     # How many items the user wants available in one order
     minimum_quantity: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
 
+    # Last time this order alerted anyone, it stays quiet for a cooldown afterwards
+    alerted_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+
     # Which item we're tracking -- it has to exist, of course
-    item_id: Mapped[str] = mapped_column(ForeignKey("warframe_items.id"))
+    item_id: Mapped[str] = mapped_column(ForeignKey("warframe_items.id"), index=True)
     item: Mapped[WarframeItemModel] = relationship(
         "WarframeItemModel",
         back_populates="orders",
@@ -0,0 +1,349 @@
+"""
+Bulk-load a synthetic dataset for scale testing.
+
+Rows are streamed into the target database with COPY, so a dataset of
+100k items and 10M trackers can be built locally in a few minutes:
+
+    python -m api.database.synthetic --items 100000 --trackers 10000000
+
+Price history can be generated for a sample of the items as well, for backtesting:
+
+    python -m api.database.synthetic --history-items 1000 --history-days 365
+
+The tables are expected to already exist (run `alembic upgrade head` first).
+"""
+
+import argparse
+import asyncio
+import math
+import random
+import time
+import uuid
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from hashlib import md5
+from itertools import accumulate
+from typing import Any, cast
+
+import asyncpg
+from loguru import logger as log
+
+from api.settings import settings
+
+# Weighted vocabulary roughly following the shape of the real catalog:
+# most items are prime parts, followed by mods, arcanes and relics.
+PREFIXES = [
+    "Ash",
+    "Atlas",
+    "Banshee",
+    "Ember",
+    "Excalibur",
+    "Frost",
+    "Hydroid",
+    "Loki",
+    "Mag",
+    "Mesa",
+    "Nekros",
+    "Nova",
+    "Nyx",
+    "Oberon",
+    "Rhino",
+    "Saryn",
+    "Trinity",
+    "Valkyr",
+    "Vauban",
+    "Volt",
+    "Wukong",
+    "Zephyr",
+    "Akbronco",
+    "Boltor",
+    "Braton",
+    "Burston",
+    "Fang",
+    "Galatine",
+    "Glaive",
+    "Latron",
+    "Lex",
+    "Nikana",
+    "Orthos",
+    "Paris",
+    "Scindo",
+    "Soma",
+    "Tigris",
+    "Vectis",
+]
+PART_SUFFIXES = [
+    "Blueprint",
+    "Chassis",
+    "Neuroptics",
+    "Systems",
+    "Barrel",
+    "Receiver",
+    "Stock",
+    "Blade",
+    "Handle",
+    "Set",
+]
+MOD_WORDS = [
+    "Adaptation",
+    "Blind Rage",
+    "Continuity",
+    "Flow",
+    "Intensify",
+    "Overextended",
+    "Primed",
+    "Rage",
+    "Redirection",
+    "Serration",
+    "Split Chamber",
+    "Streamline",
+    "Transient Fortitude",
+    "Vitality",
+]
+RELIC_ERAS = ["Lith", "Meso", "Neo", "Axi"]
+ARCANE_WORDS = ["Energize", "Grace", "Guardian", "Avenger", "Fury", "Velocity", "Strike", "Barrier"]
+
+CHUNK_SIZE = 10_000
+
+CATEGORY_WEIGHTS = (("prime", 0.55), ("mod", 0.25), ("relic", 0.12), ("arcane", 0.08))
+
+
+@dataclass(frozen=True, slots=True)
+class DatasetConfig:
+    items: int
+    trackers: int
+    users: int
+    notify_ratio: float
+    skew: float
+    seed: int
+    history_items: int = 0
+    history_days: int = 30
+    history_interval: int = 15
+
+
+def item_name(rng: random.Random) -> str:
+    category = rng.choices(
+        [c for c, _ in CATEGORY_WEIGHTS],
+        weights=[w for _, w in CATEGORY_WEIGHTS],
+    )[0]
+
+    match category:
+        case "prime":
+            return f"{rng.choice(PREFIXES)} Prime {rng.choice(PART_SUFFIXES)}"
+        case "mod":
+            return rng.choice(MOD_WORDS)
+        case "relic":
+            return f"{rng.choice(RELIC_ERAS)} {rng.choice("ABCDGKNOPRSTVZ")}{rng.randint(1, 20)} Relic"
+        case _:
+            return f"Arcane {rng.choice(ARCANE_WORDS)}"
+
+
+def generate_items(config: DatasetConfig, rng: random.Random) -> list[tuple[str, str, str, str]]:
+    """Generate `(id, item_name, thumb, url_name)` rows with unique ids and url names."""
+    rows: list[tuple[str, str, str, str]] = []
+    seen: dict[str, int] = {}
+
+    for n in range(config.items):
+        name = item_name(rng)
+
+        # Duplicate names are made unique the same way the catalog disambiguates variants
+        count = seen.get(name, 0)
+        seen[name] = count + 1
+        if count:
+            name = f"{name} {count + 1}"
+
+        url_name = name.lower().replace(" ", "_")
+        # ObjectId-shaped identifier, like the ones warframe.market hands out
+        item_id = f"{int(time.time()):08x}{n:016x}"
+        digest = md5(url_name.encode(), usedforsecurity=False).hexdigest()
+        thumb = f"items/images/en/thumbs/{url_name}.{digest}.128x128.png"
+
+        rows.append((item_id, name, thumb, url_name))
+
+    return rows
+
+
+def zipf_weights(n: int, skew: float) -> list[float]:
+    """Cumulative weights where the item at rank `k` is `1 / k**skew` as popular as the top one."""
+    return list(accumulate(1.0 / (rank**skew) for rank in range(1, n + 1)))
+
+
+def generate_user_ids(config: DatasetConfig, rng: random.Random) -> list[int]:
+    # Discord snowflakes are 64-bit integers, generally 17-19 digits long
+    return rng.sample(range(10**17, 10**18), config.users)
+
+
+def generate_trackers(
+    config: DatasetConfig,
+    rng: random.Random,
+    item_ids: list[str],
+    user_ids: list[int],
+    notifying: list[uuid.UUID],
+) -> Iterator[tuple[uuid.UUID, datetime, datetime, int, int, int, str]]:
+    """Generate tracker rows, collecting the ids of the ones that notify other users into `notifying`."""
+    cum_weights = zipf_weights(len(item_ids), config.skew)
+    # Popularity is independent of catalog order
+    ranked = rng.sample(item_ids, len(item_ids))
+    now = datetime.now(tz=UTC).replace(tzinfo=None)
+
+    remaining = config.trackers
+    while remaining > 0:
+        chunk = rng.choices(ranked, cum_weights=cum_weights, k=min(remaining, CHUNK_SIZE))
+        remaining -= len(chunk)
+
+        for item_id in chunk:
+            tracker_id = uuid.UUID(int=rng.getrandbits(128), version=4)
+            if rng.random() < config.notify_ratio:
+                notifying.append(tracker_id)
+
+            created_at = now - timedelta(seconds=rng.randint(0, 365 * 24 * 3600))
+            # Platinum prices cluster at the low end, with a long tail of expensive items
+            platinum = max(1, int(rng.lognormvariate(3.0, 1.0)))
+            quantity = 1 if rng.random() < 0.8 else rng.randint(2, 10)
+
+            yield (tracker_id, created_at, created_at, rng.choice(user_ids), platinum, quantity, item_id)
+
+
+def generate_price_history(
+    config: DatasetConfig,
+    rng: random.Random,
+    item_ids: list[str],
+) -> Iterator[tuple[str, datetime, int, int, list[int], list[int]]]:
+    """
+    Generate price history rows for a sample of the items, one every `history_interval` minutes.
+
+    The best price follows a random walk, with bulk sellers asking a little more per item.
+    """
+    step = timedelta(minutes=config.history_interval)
+    snapshots = config.history_days * 24 * 60 // config.history_interval
+    start = datetime.now(tz=UTC).replace(tzinfo=None) - snapshots * step
+
+    for item_id in rng.sample(item_ids, min(config.history_items, len(item_ids))):
+        log_price = rng.gauss(3.0, 1.0)
+
+        for n in range(snapshots):
+            log_price += rng.gauss(0.0, 0.02)
+            best_sell = max(1, round(math.exp(log_price)))
+
+            prices = [best_sell]
+            quantities = [1]
+            for _ in range(rng.randint(0, 3)):
+                prices.append(prices[-1] + max(1, round(prices[-1] * rng.uniform(0.02, 0.2))))
+                quantities.append(quantities[-1] + rng.randint(1, 5))
+
+            best_buy = max(1, round(best_sell * rng.uniform(0.7, 0.95)))
+
+            yield (item_id, start + n * step, best_sell, best_buy, prices, quantities)
+
+
+def generate_associations(
+    rng: random.Random,
+    notifying: list[uuid.UUID],
+    alert_ids: list[int],
+) -> Iterator[tuple[int, uuid.UUID]]:
+    for tracker_id in notifying:
+        for alert_id in rng.sample(alert_ids, min(len(alert_ids), rng.randint(1, 3))):
+            yield (alert_id, tracker_id)
+
+
+async def copy_rows(
+    conn: asyncpg.Connection,
+    table: str,
+    columns: list[str],
+    rows: Iterable[tuple[Any, ...]],
+) -> None:
+    before = time.perf_counter()
+
+    result = cast(str, await conn.copy_records_to_table(table, records=rows, columns=columns))  # pyright: ignore[reportUnknownMemberType]
+
+    log.info(f"{table}: {result} in {time.perf_counter() - before:.2f}s")
+
+
+async def load(dsn: str, config: DatasetConfig, *, truncate: bool) -> None:
+    rng = random.Random(config.seed)  # noqa: S311
+    conn = cast(asyncpg.Connection, await asyncpg.connect(dsn))  # pyright: ignore[reportUnknownMemberType]
+
+    try:
+        async with conn.transaction():
+            if truncate:
+                await conn.execute(
+                    "TRUNCATE user_order_alerts_association, warframe_market_orders, "
+                    "user_order_notifications, price_history, warframe_items CASCADE",
+                )
+
+            items = generate_items(config, rng)
+            await copy_rows(conn, "warframe_items", ["id", "item_name", "thumb", "url_name"], items)
+
+            user_ids = generate_user_ids(config, rng)
+            notifying: list[uuid.UUID] = []
+            await copy_rows(
+                conn,
+                "warframe_market_orders",
+                ["id", "created_at", "updated_at", "user_id", "platinum_threshold", "minimum_quantity", "item_id"],
+                generate_trackers(config, rng, [row[0] for row in items], user_ids, notifying),
+            )
+
+            # `user_order_alerts_association.user_order_alert_id` is a 32-bit column,
+            # so these can't be snowflakes like the tracker owners above
+            alert_ids = rng.sample(range(1, 2**31), config.users)
+            await copy_rows(conn, "user_order_notifications", ["id"], [(alert_id,) for alert_id in alert_ids])
+            await copy_rows(
+                conn,
+                "user_order_alerts_association",
+                ["user_order_alert_id", "warframe_market_order_id"],
+                generate_associations(rng, notifying, alert_ids),
+            )
+
+            if config.history_items:
+                await copy_rows(
+                    conn,
+                    "price_history",
+                    ["item_id", "recorded_at", "best_sell", "best_buy", "sell_prices", "sell_quantities"],
+                    generate_price_history(config, rng, [row[0] for row in items]),
+                )
+
+        await conn.execute("ANALYZE")
+    finally:
+        await conn.close()
+
+
+def parse_args() -> tuple[str, DatasetConfig, bool]:
+    parser = argparse.ArgumentParser(description="Bulk-load a synthetic dataset for scale testing.")
+    parser.add_argument("--dsn", default=str(settings.db_url.with_scheme("postgresql")))
+    parser.add_argument("--items", type=int, default=100_000)
+    parser.add_argument("--trackers", type=int, default=1_000_000, help="total trackers, spread over items")
+    parser.add_argument("--users", type=int, default=50_000)
+    parser.add_argument("--notify-ratio", type=float, default=0.05, help="fraction of trackers notifying others")
+    parser.add_argument("--skew", type=float, default=1.1, help="zipf exponent of tracker popularity per item")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--history-items", type=int, default=0, help="items to generate price history for")
+    parser.add_argument("--history-days", type=int, default=30)
+    parser.add_argument("--history-interval", type=int, default=15, help="minutes between price snapshots")
+    parser.add_argument("--truncate", action="store_true", help="empty the tables before loading")
+
+    args = parser.parse_args()
+
+    config = DatasetConfig(
+        items=args.items,
+        trackers=args.trackers,
+        users=args.users,
+        notify_ratio=args.notify_ratio,
+        skew=args.skew,
+        seed=args.seed,
+        history_items=args.history_items,
+        history_days=args.history_days,
+        history_interval=args.history_interval,
+    )
+
+    return args.dsn, config, args.truncate
+
+
+def main() -> None:
+    dsn, config, truncate = parse_args()
+
+    asyncio.run(load(dsn, config, truncate=truncate))
+
+
+if __name__ == "__main__":
+    main()
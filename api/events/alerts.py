@@ -0,0 +1,67 @@
+import asyncio
+import json
+from collections.abc import AsyncGenerator
+from typing import Any
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.events.broker import Broker
+from api.settings import settings
+
+# Postgres channel alerts are sent over, to reach the subscribers of every worker
+ALERTS_CHANNEL = "ordis_alerts"
+
+# Topic carrying every user's alerts, for bots
+ALL_ALERTS = "all"
+
+alert_broker = Broker("alerts", queue_size=settings.alerts_stream_queue_size)
+
+
+def user_topic(user_id: int) -> str:
+    return f"user:{user_id}"
+
+
+async def publish_alert(session: AsyncSession, *, recipients: list[int], payload: dict[str, Any]) -> None:
+    """Notify every worker of an alert, which Postgres only does once the session's transaction commits."""
+    message = json.dumps({"recipients": recipients, "payload": payload})
+
+    await session.execute(select(func.pg_notify(ALERTS_CHANNEL, message)))
+
+
+def handle_alert_notification(raw: str) -> None:
+    """Fan an alert received from Postgres out to this worker's subscribers."""
+    message = json.loads(raw)
+
+    # Serialized once, whatever the number of subscribers
+    event = f"event: alert\ndata: {json.dumps(message["payload"])}\n\n"
+
+    for user_id in message["recipients"]:
+        alert_broker.publish(user_topic(user_id), event)
+
+    alert_broker.publish(ALL_ALERTS, event)
+
+
+async def alert_stream(topic: str) -> AsyncGenerator[str]:
+    """
+    Server-sent events for the alerts of a topic.
+
+    The topic is only subscribed to once the stream starts, so a client that disconnects before
+    then leaves nothing behind. Comments are sent while idle so proxies keep the connection open.
+    The stream ends if the subscriber falls too far behind, and clients reconnect after `retry` milliseconds.
+    """
+    async with alert_broker.subscribe(topic) as subscription:
+        yield f"retry: {settings.alerts_stream_retry_ms}\n: connected\n\n"
+
+        while True:
+            try:
+                async with asyncio.timeout(settings.alerts_stream_heartbeat):
+                    event = await subscription.get()
+            except TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+
+            if event is None:
+                return
+
+            yield event
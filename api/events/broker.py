@@ -0,0 +1,139 @@
+import asyncio
+from collections.abc import AsyncIterator
+from typing import Self
+
+from prometheus_client import Counter, Gauge
+
+SUBSCRIBERS = Gauge(
+    "event_broker_subscribers",
+    "Gauge of subscribers currently connected to an event broker.",
+    ["broker"],
+    multiprocess_mode="livesum",
+)
+DROPPED_SUBSCRIBERS = Counter(
+    "event_broker_dropped_subscribers_total",
+    "Total count of subscribers dropped for not keeping up.",
+    ["broker"],
+)
+
+
+class Subscription:
+    """
+    One consumer's view of a broker.
+
+    Messages wait in a bounded queue. A consumer that lets it fill up
+    is closed instead of buffering without limit, and is expected to reconnect.
+    """
+
+    __slots__ = ("_broker", "_queue", "closed", "topics")
+
+    def __init__(self, broker: "Broker", topics: set[str], maxsize: int) -> None:
+        self._broker = broker
+        self._queue: asyncio.Queue[str | None] = asyncio.Queue(maxsize)
+        self.topics = topics
+        self.closed = False
+
+    def put(self, message: str) -> None:
+        if self.closed:
+            return
+
+        try:
+            self._queue.put_nowait(message)
+        except asyncio.QueueFull:
+            DROPPED_SUBSCRIBERS.labels(broker=self._broker.name).inc()
+            self.close()
+
+    def close(self) -> None:
+        if self.closed:
+            return
+
+        self.closed = True
+        self._broker.unsubscribe(self)
+
+        # Wake up the consumer, making room for the sentinel if needed
+        if self._queue.full():
+            self._queue.get_nowait()
+        self._queue.put_nowait(None)
+
+    async def get(self) -> str | None:
+        """Wait for the next message, `None` means the subscription was closed."""
+        return await self._queue.get()
+
+    def __aiter__(self) -> AsyncIterator[str]:
+        return self._iterate()
+
+    async def _iterate(self) -> AsyncIterator[str]:
+        while (message := await self.get()) is not None:
+            yield message
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *_: object) -> None:
+        self.close()
+
+
+class Broker:
+    """
+    In-process publish/subscribe by topic.
+
+    Messages are already serialized when published, so fanning one out
+    costs a queue insert per subscriber and nothing else.
+    """
+
+    def __init__(self, name: str, *, queue_size: int) -> None:
+        self.name = name
+        self.queue_size = queue_size
+
+        self._topics: dict[str, set[Subscription]] = {}
+
+    def subscribe(self, *topics: str) -> Subscription:
+        subscription = Subscription(self, set(), self.queue_size)
+        self.add_topics(subscription, *topics)
+
+        SUBSCRIBERS.labels(broker=self.name).inc()
+
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self.remove_topics(subscription, *subscription.topics)
+
+        SUBSCRIBERS.labels(broker=self.name).dec()
+
+    def add_topics(self, subscription: Subscription, *topics: str) -> None:
+        if subscription.closed:
+            return
+
+        for topic in topics:
+            self._topics.setdefault(topic, set()).add(subscription)
+
+        subscription.topics.update(topics)
+
+    def remove_topics(self, subscription: Subscription, *topics: str) -> None:
+        for topic in topics:
+            if (subscribers := self._topics.get(topic)) is None:
+                continue
+
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._topics[topic]
+
+        subscription.topics.difference_update(topics)
+
+    def publish(self, topic: str, message: str) -> int:
+        """Hand a message to every subscriber of `topic`, returning how many there were."""
+        subscribers = self._topics.get(topic)
+        if not subscribers:
+            return 0
+
+        # Copied, since overflowing subscribers remove themselves
+        for subscription in tuple(subscribers):
+            subscription.put(message)
+
+        return len(subscribers)
+
+    def subscriber_count(self, topic: str) -> int:
+        return len(self._topics.get(topic, ()))
+
+    def topics(self) -> set[str]:
+        return set(self._topics)
@@ -0,0 +1,56 @@
+import asyncio
+from collections.abc import Callable
+from typing import Any, cast
+
+import asyncpg
+from loguru import logger as log
+
+RECONNECT_DELAY = 5.0
+
+
+class PostgresListener:
+    """
+    Relays Postgres notifications to in-process handlers.
+
+    Each worker holds one dedicated connection, which is how a notification sent
+    from any worker or node reaches the subscribers connected to this one.
+    Needs a direct connection, since LISTEN doesn't survive transaction-mode pgbouncer.
+    """
+
+    def __init__(self, dsn: str, handlers: dict[str, Callable[[str], None]]) -> None:
+        self.dsn = dsn
+        self.handlers = handlers
+
+    async def run(self) -> None:
+        while True:
+            try:
+                await self._listen()
+            # Dropped connections and timeouts alike, the listener only stops when cancelled
+            except Exception:
+                log.exception(f"Listener connection failed, reconnecting in {RECONNECT_DELAY} seconds")
+
+            await asyncio.sleep(RECONNECT_DELAY)
+
+    async def _listen(self) -> None:
+        conn = cast(asyncpg.Connection, await asyncpg.connect(self.dsn))  # pyright: ignore[reportUnknownMemberType]
+        terminated = asyncio.Event()
+
+        try:
+            conn.add_termination_listener(lambda _conn: terminated.set())  # pyright: ignore[reportUnknownLambdaType]
+
+            for channel, handler in self.handlers.items():
+                await conn.add_listener(channel, self._callback(handler))
+
+            await terminated.wait()
+        finally:
+            await conn.close()
+
+    @staticmethod
+    def _callback(handler: Callable[[str], None]) -> Callable[..., None]:
+        def callback(_conn: Any, _pid: int, channel: str, payload: str) -> None:
+            try:
+                handler(payload)
+            except Exception:
+                log.exception(f"Failed handling notification on {channel}")
+
+        return callback
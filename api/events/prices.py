@@ -0,0 +1,52 @@
+import json
+from datetime import UTC, datetime
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.events.broker import Broker
+from api.settings import settings
+
+# Postgres channel order book summaries are sent over, to reach every worker
+PRICES_CHANNEL = "ordis_prices"
+
+ITEM_TOPIC_PREFIX = "item:"
+
+price_broker = Broker("prices", queue_size=settings.prices_stream_queue_size)
+
+# Last message published for each item, sent straight away to new subscribers
+latest_prices: dict[str, str] = {}
+
+
+def item_topic(item_id: str) -> str:
+    return f"{ITEM_TOPIC_PREFIX}{item_id}"
+
+
+def subscribed_items() -> set[str]:
+    return {
+        topic.removeprefix(ITEM_TOPIC_PREFIX) for topic in price_broker.topics() if topic.startswith(ITEM_TOPIC_PREFIX)
+    }
+
+
+def publish_price(item_id: str, **prices: int | None) -> int:
+    """Serialize an item's prices once and hand them to each of its subscribers."""
+    message = json.dumps(
+        {
+            "type": "price",
+            "item_id": item_id,
+            **prices,
+            "updated_at": datetime.now(tz=UTC).isoformat(),
+        },
+    )
+    latest_prices[item_id] = message
+
+    return price_broker.publish(item_topic(item_id), message)
+
+
+def forget_price(item_id: str) -> None:
+    latest_prices.pop(item_id, None)
+
+
+async def notify_book_summary(session: AsyncSession, message: str) -> None:
+    """Send an order book summary to every worker, which Postgres only does once the session's transaction commits."""
+    await session.execute(select(func.pg_notify(PRICES_CHANNEL, message)))
@@ -0,0 +1,219 @@
+import asyncio
+import math
+import os
+import socket
+import time
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from loguru import logger as log
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from api.database.crud.jobs import job_dao
+from api.database.models.jobs import JobModel
+from api.routers.schemas.jobs import JobCreate
+
+type JobHandler = Callable[[AsyncSession, dict[str, Any]], Awaitable[None]]
+
+JOBS = Counter(
+    "jobs_total",
+    "Total count of job attempts by kind and result.",
+    ["kind", "result"],
+)
+JOB_LATENCY = Histogram(
+    "job_latency_seconds",
+    "Histogram of how long jobs waited between becoming due and being claimed (in seconds).",
+    ["kind"],
+    buckets=(0.05, 0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 300),
+)
+JOB_DURATION = Histogram(
+    "job_duration_seconds",
+    "Histogram of how long job attempts took to run (in seconds).",
+    ["kind"],
+)
+QUEUE_DEPTH = Gauge(
+    "job_queue_depth",
+    "Gauge of jobs that are due and waiting to be claimed, by kind.",
+    ["kind"],
+    # Every worker reads the same table
+    multiprocess_mode="max",
+)
+
+
+class LeaseLostError(Exception):
+    """The job was claimed by another worker while it ran, after its lease ran out."""
+
+
+def worker_name() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class JobWorker:
+    """
+    Runs jobs from the shared queue.
+
+    Every worker claims batches of due jobs with `FOR UPDATE SKIP LOCKED` and holds a lease
+    on each while it runs, so workers never wait on each other and adding workers adds throughput.
+    A handler runs in the same transaction that completes its job, so its database changes
+    are only committed if the job is. Jobs whose lease runs out, because their worker died, are
+    claimed again by another one.
+
+    Periodic jobs are enqueued by every worker for the next multiple of their interval,
+    and deduplication leaves a single one of them waiting.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        handlers: dict[str, JobHandler],
+        *,
+        periodic: dict[str, float] | None = None,
+        batch_size: int,
+        concurrency: int,
+        max_attempts: int,
+        lease: timedelta,
+        backoff: timedelta,
+        retention: timedelta,
+        poll_interval: float = 1.0,
+        name: str | None = None,
+    ) -> None:
+        self.session_factory = session_factory
+        self.handlers = handlers
+        self.periodic = periodic or {}
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.lease = lease
+        self.backoff = backoff
+        self.retention = retention
+        self.poll_interval = poll_interval
+        self.name = name or worker_name()
+
+        self._running: dict[int, asyncio.Task[None]] = {}
+
+    async def run(self) -> None:
+        maintenance = asyncio.create_task(self._maintain())
+
+        try:
+            while True:
+                try:
+                    claimed = await self.run_once()
+                except Exception:
+                    log.exception("Claiming jobs failed")
+                    claimed = 0
+
+                if len(self._running) >= self.concurrency:
+                    await asyncio.wait(self._running.values(), return_when=asyncio.FIRST_COMPLETED)
+                elif claimed < self.batch_size:
+                    await asyncio.sleep(self.poll_interval)
+        finally:
+            maintenance.cancel()
+            for task in self._running.values():
+                task.cancel()
+
+            # Jobs roll back before the engine they run on is disposed
+            await asyncio.gather(maintenance, *self._running.values(), return_exceptions=True)
+
+    async def run_once(self) -> int:
+        """Claim as many jobs as there are free slots and start them, returning how many were claimed."""
+        limit = min(self.batch_size, self.concurrency - len(self._running))
+        if limit <= 0:
+            return 0
+
+        async with self.session_factory() as session, session.begin():
+            jobs = await job_dao.claim_batch(
+                session,
+                kinds=self.handlers.keys(),
+                worker=self.name,
+                limit=limit,
+                lease=self.lease,
+            )
+
+        claimed_at = datetime.now(tz=UTC).replace(tzinfo=None)
+        for job in jobs:
+            JOB_LATENCY.labels(kind=job.kind).observe(max(0.0, (claimed_at - job.run_at).total_seconds()))
+
+            task = asyncio.create_task(self._execute(job))
+            self._running[job.id] = task
+            task.add_done_callback(lambda _, job_id=job.id: self._running.pop(job_id, None))
+
+        return len(jobs)
+
+    async def join(self) -> None:
+        """Wait for every running job to finish."""
+        while self._running:
+            await asyncio.gather(*self._running.values(), return_exceptions=True)
+
+    async def enqueue_periodic(self) -> int:
+        current = time.time()
+
+        jobs = [
+            JobCreate(
+                kind=kind,
+                key=kind,
+                max_attempts=self.max_attempts,
+                run_at=datetime.fromtimestamp(math.floor(current / interval + 1) * interval, tz=UTC).replace(
+                    tzinfo=None,
+                ),
+            )
+            for kind, interval in self.periodic.items()
+        ]
+
+        async with self.session_factory() as session, session.begin():
+            return await job_dao.enqueue(session, jobs=jobs)
+
+    async def _execute(self, job: JobModel) -> None:
+        before = time.perf_counter()
+
+        try:
+            async with self.session_factory() as session, session.begin():
+                await self.handlers[job.kind](session, job.payload)
+                # Rolls back the handler's changes, the worker holding the job now runs it again
+                if not await job_dao.complete(session, pk=job.id, worker=self.name):
+                    raise LeaseLostError(f"Job {job.id} is leased by another worker")
+        except LeaseLostError as e:
+            log.warning(f"{e}, discarding attempt {job.attempts} ({job.kind})")
+            JOBS.labels(kind=job.kind, result="lost").inc()
+        except Exception as e:
+            log.exception(f"Job {job.id} ({job.kind}) failed on attempt {job.attempts}")
+            await self._fail(job, repr(e))
+        else:
+            JOBS.labels(kind=job.kind, result="succeeded").inc()
+        finally:
+            JOB_DURATION.labels(kind=job.kind).observe(time.perf_counter() - before)
+
+    async def _fail(self, job: JobModel, error: str) -> None:
+        try:
+            async with self.session_factory() as session, session.begin():
+                exhausted = await job_dao.fail(session, pk=job.id, worker=self.name, error=error, backoff=self.backoff)
+        except Exception:
+            # The lease runs out instead, and another worker retries the job
+            log.exception(f"Failed releasing job {job.id}")
+            return
+
+        JOBS.labels(kind=job.kind, result="failed" if exhausted else "retried").inc()
+
+    async def _maintain(self) -> None:
+        """Keep leases of running jobs alive, and the queue tidy, until cancelled."""
+        while True:
+            await asyncio.sleep(self.lease.total_seconds() / 3)
+
+            try:
+                async with self.session_factory() as session, session.begin():
+                    if self._running:
+                        await job_dao.extend_leases(session, pk=list(self._running), worker=self.name, lease=self.lease)
+
+                    await job_dao.expire_abandoned(session)
+                    await job_dao.purge_finished(session, older_than=self.retention)
+
+                    depth = await job_dao.queue_depth(session)
+
+                for kind in self.handlers:
+                    QUEUE_DEPTH.labels(kind=kind).set(depth.get(kind, 0))
+
+                if self.periodic:
+                    await self.enqueue_periodic()
+            except Exception:
+                log.exception("Job queue maintenance failed")
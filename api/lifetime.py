@@ -1,6 +1,8 @@
+import asyncio
 import time
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
+from datetime import timedelta
 
 from fastapi import FastAPI
 from loguru import logger as log
@@ -21,7 +23,7 @@ from prometheus_client.openmetrics.exposition import (
 from prometheus_fastapi_instrumentator.instrumentation import (
     PrometheusFastApiInstrumentator,
 )
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker
 from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
 from starlette.requests import Request
 from starlette.responses import Response
@@ -29,7 +31,20 @@ from starlette.routing import Match
 from starlette.status import HTTP_200_OK, HTTP_500_INTERNAL_SERVER_ERROR
 from starlette.types import ASGIApp
 
+from api.database.engine import create_engine
+from api.events.alerts import ALERTS_CHANNEL, handle_alert_notification
+from api.events.listener import PostgresListener
+from api.events.prices import PRICES_CHANNEL
+from api.jobs.worker import JobWorker
+from api.market.autocomplete import ITEM_NAMES_JOB, run_item_names_rebuild, run_item_names_refresh
+from api.market.catalog import CATALOG_SYNC_JOB, run_catalog_sync
+from api.market.enrichment import ENRICH_JOB, ItemEnricher
+from api.market.prices import POLL_JOB, PricePoller
+from api.market.scheduler import PollScheduler
+from api.market.thumbnails import run_thumbnail_prewarm
+from api.notifications.dispatcher import create_dispatcher
 from api.settings import settings
+from api.warmup import warm_up
 
 INFO = Gauge("fastapi_app_info", "FastAPI application information.", ["app_name"])
 REQUESTS = Counter(
@@ -139,7 +154,7 @@ def metrics(_request: Request) -> Response:
 
 
 def _setup_db(app: FastAPI) -> None:
-    engine = create_async_engine(str(settings.db_url), echo=settings.db_echo)
+    engine = create_engine()
     session_factory = async_sessionmaker(
         engine,
         expire_on_commit=False,
@@ -148,6 +163,93 @@ def _setup_db(app: FastAPI) -> None:
     app.state.db_session_factory = session_factory
 
 
+def _setup_notifications(app: FastAPI) -> None:
+    app.state.notification_dispatcher = None
+    app.state.notification_task = None
+
+    if settings.notification_webhook_url is None:
+        log.warning("Notification webhook not configured, alerts will not be delivered.")
+        return
+
+    dispatcher = create_dispatcher(app.state.db_session_factory)
+    app.state.notification_dispatcher = dispatcher
+    app.state.notification_task = asyncio.create_task(dispatcher.run())
+
+
+async def _stop_notifications(app: FastAPI) -> None:
+    if app.state.notification_task is not None:
+        app.state.notification_task.cancel()
+        await asyncio.gather(app.state.notification_task, return_exceptions=True)
+    if app.state.notification_dispatcher is not None:
+        await app.state.notification_dispatcher.close()
+
+
+def _setup_listener(app: FastAPI) -> None:
+    listener = PostgresListener(
+        str(settings.db_session_url),
+        {
+            ALERTS_CHANNEL: handle_alert_notification,
+            PRICES_CHANNEL: app.state.price_poller.handle_summary_notification,
+        },
+    )
+    app.state.listener_task = asyncio.create_task(listener.run())
+
+
+def _setup_prices(app: FastAPI) -> None:
+    poller = PricePoller(
+        app.state.db_session_factory,
+        scheduler=PollScheduler(
+            budget=settings.prices_poll_rps,
+            min_interval=settings.prices_poll_min_interval,
+            max_interval=settings.prices_poll_max_interval,
+        ),
+        rate=settings.prices_poll_rps,
+        demand_interval=settings.prices_demand_interval,
+        alert_cooldown=timedelta(seconds=settings.alert_cooldown),
+    )
+    app.state.price_poller = poller
+    app.state.price_task = asyncio.create_task(poller.run(str(settings.db_session_url)))
+
+
+def _setup_autocomplete(app: FastAPI) -> None:
+    app.state.autocomplete_task = asyncio.create_task(
+        run_item_names_refresh(settings.catalog_snapshot_poll_interval),
+    )
+
+
+def _setup_thumbnails(app: FastAPI) -> None:
+    app.state.thumbnail_task = None
+
+    if settings.thumbnail_prewarm:
+        app.state.thumbnail_task = asyncio.create_task(
+            run_thumbnail_prewarm(app.state.db_session_factory, settings.thumbnail_prewarm_interval),
+        )
+
+
+def _setup_jobs(app: FastAPI) -> None:
+    worker = JobWorker(
+        app.state.db_session_factory,
+        {
+            POLL_JOB: app.state.price_poller.poll_item,
+            CATALOG_SYNC_JOB: run_catalog_sync,
+            ENRICH_JOB: ItemEnricher(app.state.db_session_factory).run,
+            ITEM_NAMES_JOB: run_item_names_rebuild,
+        },
+        periodic={
+            CATALOG_SYNC_JOB: settings.catalog_sync_interval,
+            ITEM_NAMES_JOB: settings.autocomplete_refresh_interval,
+        },
+        batch_size=settings.jobs_batch_size,
+        concurrency=settings.jobs_concurrency,
+        max_attempts=settings.jobs_max_attempts,
+        lease=timedelta(seconds=settings.jobs_lease),
+        backoff=timedelta(seconds=settings.jobs_backoff),
+        retention=timedelta(seconds=settings.jobs_retention),
+        poll_interval=settings.jobs_poll_interval,
+    )
+    app.state.job_task = asyncio.create_task(worker.run())
+
+
 def setup_opentelemetry(
     app: FastAPI,
     app_name: str = "ordis-api",
@@ -220,8 +322,28 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None]:
     setup_opentelemetry(app)
     setup_prometheus(app)
     app.middleware_stack = app.build_middleware_stack()
+    await warm_up(app)
+    _setup_notifications(app)
+    _setup_prices(app)
+    _setup_autocomplete(app)
+    _setup_thumbnails(app)
+    _setup_jobs(app)
+    _setup_listener(app)
 
     yield
 
+    # Fail readiness checks first, so load balancers drain this worker
+    app.state.ready = False
+    if app.state.warmup_task is not None:
+        app.state.warmup_task.cancel()
+
+    tasks = [app.state.price_task, app.state.autocomplete_task, app.state.job_task, app.state.listener_task]
+    if app.state.thumbnail_task is not None:
+        tasks.append(app.state.thumbnail_task)
+    for task in tasks:
+        task.cancel()
+    # Waited for, so nothing is still using a connection when the engine is disposed
+    await asyncio.gather(*tasks, return_exceptions=True)
+    await _stop_notifications(app)
     await app.state.db_engine.dispose()
     stop_opentelemetry(app)
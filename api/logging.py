@@ -7,6 +7,7 @@ from api.settings import settings
 
 FILTER_LOG_ENDPOINTS = {
     "/metrics",
+    "/api/ready",
     "/api/openapi.json",
     "/api/docs",
 }
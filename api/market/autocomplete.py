@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import re
+import time
+from bisect import bisect_left
+from collections.abc import Iterable
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from loguru import logger as log
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.database.models.warframe.items import WarframeItemModel
+from api.database.models.warframe.tracking import WarframeMarketOrderModel
+from api.market.snapshot import CatalogSnapshot, encode_snapshot, map_snapshot, write_snapshot
+from api.settings import settings
+
+if TYPE_CHECKING:
+    # The item routes serve completions from here
+    from api.routers.schemas.items import WarframeItemRow
+
+ITEM_NAMES_JOB = "rebuild_item_names"
+
+# URL names separate words with underscores, and punctuation isn't worth typing
+SEPARATORS = re.compile(r"[\W_]+")
+
+# Sorts after anything a key could continue with
+KEY_END = "\U0010ffff"
+
+# Most completions asked for at once, Discord shows up to 25 choices
+MAX_COMPLETIONS = 25
+
+# Prefixes matching more keys than this are ranked when the index is built, rather than on every keystroke
+WIDE_PREFIX_KEYS = 256
+
+
+def normalize(name: str) -> str:
+    return " ".join(SEPARATORS.sub(" ", name.casefold()).split())
+
+
+def name_keys(item: WarframeItemRow) -> set[str]:
+    """Every word suffix of an item's name and URL name, so any word of the name can start a search."""
+    keys: set[str] = set()
+
+    for name in (item["item_name"], item["url_name"]):
+        words = normalize(name).split()
+        keys.update(" ".join(words[start:]) for start in range(len(words)))
+
+    return keys
+
+
+class ItemNameIndex:
+    """
+    Prefix search over item names, served from a catalog snapshot.
+
+    Keys are kept sorted, so the ones starting with a prefix are a contiguous range found
+    with a binary search. Items are ranked by popularity when the index is built, so the
+    best completions are the lowest ranks in that range.
+
+    With a `path`, the snapshot is written there and memory mapped, so one worker builds it
+    and the others map the file once it's replaced, paying for the catalog once per host.
+    """
+
+    def __init__(self, path: Path | None = None) -> None:
+        self.path = path
+
+        self._snapshot = CatalogSnapshot(encode_snapshot([], [], {}, version=0))
+        # Of the file the snapshot was mapped from, which changes whenever it's replaced
+        self._mapped: tuple[int, int] | None = None
+
+    def __len__(self) -> int:
+        return len(self._snapshot)
+
+    @property
+    def version(self) -> int:
+        """When the snapshot was built, in nanoseconds since the epoch."""
+        return self._snapshot.version
+
+    def rebuild(self, items: Iterable[tuple[WarframeItemRow, int]]) -> None:
+        """Replace the items, given with their popularity."""
+        ranked = sorted(items, key=lambda item: (-item[1], len(item[0]["item_name"]), item[0]["item_name"]))
+        entries = sorted({(key, rank) for rank, (item, _) in enumerate(ranked) for key in name_keys(item)})
+        wide = self._rank_wide_prefixes([key for key, _ in entries], [rank for _, rank in entries])
+
+        snapshot = encode_snapshot([item for item, _ in ranked], entries, wide, version=time.time_ns())
+        if self.path is None:
+            self._snapshot = CatalogSnapshot(snapshot)
+            return
+
+        write_snapshot(self.path, snapshot)
+        self.reload()
+
+    def reload(self) -> bool:
+        """Map the snapshot file if it was replaced since it was last mapped, returning whether it was."""
+        if self.path is None:
+            return False
+
+        try:
+            stat = self.path.stat()
+            if (stat.st_ino, stat.st_mtime_ns) == self._mapped:
+                return False
+
+            snapshot, stat = map_snapshot(self.path)
+        except FileNotFoundError:
+            return False
+        except ValueError as e:
+            log.warning(f"Ignoring catalog snapshot {self.path}: {e}")
+            return False
+
+        # Searches hold on to the snapshot they started with, the old map is closed once they're done
+        self._snapshot = snapshot
+        self._mapped = (stat.st_ino, stat.st_mtime_ns)
+
+        return True
+
+    @staticmethod
+    def _span(keys: list[str], prefix: str) -> tuple[int, int]:
+        start = bisect_left(keys, prefix)
+
+        return start, bisect_left(keys, prefix + KEY_END, lo=start)
+
+    @classmethod
+    def _rank_wide_prefixes(cls, keys: list[str], ranks: list[int]) -> dict[str, list[int]]:
+        """
+        Best completions of every wide prefix.
+
+        Only the prefixes extending a wide one can be wide themselves, so they're found
+        by extending wide prefixes a character at a time, starting from the empty one.
+        """
+        wide: dict[str, list[int]] = {}
+        pending = [""]
+
+        while pending:
+            prefix = pending.pop()
+            start, end = cls._span(keys, prefix)
+            if end - start <= WIDE_PREFIX_KEYS:
+                continue
+
+            wide[prefix] = heapq.nsmallest(MAX_COMPLETIONS, set(ranks[start:end]))
+            pending.extend({key[: len(prefix) + 1] for key in keys[start:end] if len(key) > len(prefix)})
+
+        return wide
+
+    def complete(self, prefix: str, limit: int = MAX_COMPLETIONS) -> list[WarframeItemRow]:
+        """The most popular items with a word of their name starting with `prefix`."""
+        prefix = normalize(prefix)
+        snapshot = self._snapshot
+
+        if (wide := snapshot.wide(prefix)) is not None:
+            ranks = list(wide[:limit])
+        else:
+            ranks = heapq.nsmallest(limit, set(snapshot.ranks(*snapshot.span(prefix))))
+
+        return [snapshot.item(rank) for rank in ranks]
+
+
+async def refresh_item_names(session: AsyncSession) -> None:
+    """Rebuild the index from the catalog, weighing items by how many trackers they have."""
+    stmt = (
+        select(
+            WarframeItemModel.id,
+            WarframeItemModel.thumb,
+            WarframeItemModel.item_name,
+            WarframeItemModel.url_name,
+            func.count(WarframeMarketOrderModel.id),
+        )
+        .outerjoin(WarframeMarketOrderModel, WarframeMarketOrderModel.item_id == WarframeItemModel.id)
+        .group_by(WarframeItemModel.id)
+    )
+    rows = await session.execute(stmt)
+
+    items: list[tuple[WarframeItemRow, int]] = [
+        ({"id": item_id, "thumb": thumb, "item_name": item_name, "url_name": url_name}, trackers)
+        for item_id, thumb, item_name, url_name, trackers in rows.tuples()
+    ]
+    item_names.rebuild(items)
+
+
+async def run_item_names_rebuild(session: AsyncSession, _payload: dict[str, Any]) -> None:
+    """Job handler rebuilding the snapshot, picking up tracker changes made by any worker."""
+    await refresh_item_names(session)
+
+
+async def run_item_names_refresh(interval: float) -> None:
+    """Keep mapping the latest snapshot, whichever worker rebuilt it."""
+    while True:
+        await asyncio.sleep(interval)
+
+        try:
+            if item_names.reload():
+                log.debug(f"Mapped catalog snapshot {item_names.version}")
+        except Exception:
+            log.exception("Failed mapping the catalog snapshot")
+
+
+item_names = ItemNameIndex(settings.catalog_snapshot_path)
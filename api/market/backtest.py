@@ -0,0 +1,210 @@
+import asyncio
+import itertools
+from collections import defaultdict
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Self
+
+import numpy as np
+import numpy.typing as npt
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.database.crud.history import price_history_dao
+
+type Timestamps = npt.NDArray[np.datetime64]
+type Integers = npt.NDArray[np.int64]
+type SnapshotRow = tuple[datetime, Sequence[int], Sequence[int]] | Row[tuple[datetime, list[int], list[int]]]
+
+# Stands in for the price of a quantity nobody offers, which no threshold reaches
+NO_PRICE = np.iinfo(np.int64).max
+
+# Cells of the (trackers x snapshots) comparison evaluated at once, bounding memory to a few MiB
+BLOCK_CELLS = 1 << 22
+
+
+@dataclass(frozen=True, slots=True)
+class Tracker:
+    item_id: str
+    platinum_threshold: int
+    minimum_quantity: int
+
+
+@dataclass(frozen=True, slots=True)
+class SellHistory:
+    """
+    An item's sell side history, as flat arrays.
+
+    Snapshot `i` has the frontier entries from `offsets[i]` up to `offsets[i + 1]`,
+    prices ascending and quantities strictly increasing.
+    """
+
+    recorded_at: Timestamps
+    offsets: Integers
+    prices: Integers
+    quantities: Integers
+
+    def __len__(self) -> int:
+        return len(self.recorded_at)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[SnapshotRow]) -> Self:
+        recorded_at: list[datetime] = []
+        lengths: list[int] = [0]
+        prices: list[int] = []
+        quantities: list[int] = []
+
+        for timestamp, snapshot_prices, snapshot_quantities in rows:
+            recorded_at.append(timestamp)
+            lengths.append(len(snapshot_prices))
+            prices.extend(snapshot_prices)
+            quantities.extend(snapshot_quantities)
+
+        return cls(
+            recorded_at=np.array(recorded_at, dtype="datetime64[us]"),
+            offsets=np.cumsum(lengths, dtype=np.int64),
+            prices=np.array(prices, dtype=np.int64),
+            quantities=np.array(quantities, dtype=np.int64),
+        )
+
+    @classmethod
+    def concatenate(cls, parts: Sequence[Self]) -> Self:
+        """Join consecutive stretches of history."""
+        if not parts:
+            return cls.from_rows(())
+
+        starts = np.cumsum([0, *(len(part.prices) for part in parts[:-1])])
+
+        return cls(
+            recorded_at=np.concatenate([part.recorded_at for part in parts]),
+            offsets=np.concatenate(
+                [parts[0].offsets[:1], *(part.offsets[1:] + start for part, start in zip(parts, starts, strict=True))],
+            ),
+            prices=np.concatenate([part.prices for part in parts]),
+            quantities=np.concatenate([part.quantities for part in parts]),
+        )
+
+    def best_prices(self, quantities: Integers) -> Integers:
+        """
+        Best price for each of `quantities` in every snapshot, shaped `(quantities, snapshots)`.
+
+        Like `BookSide.best_with_quantity`, a single seller has to offer the whole quantity.
+        """
+        best = np.full((len(quantities), len(self)), NO_PRICE, dtype=np.int64)
+        snapshot = np.repeat(np.arange(len(self)), np.diff(self.offsets))
+
+        for row, quantity in enumerate(quantities):
+            entries = np.flatnonzero(self.quantities >= quantity)
+            # Prices ascend within a snapshot, so its first entry offering enough is the best one
+            snapshots, first = np.unique(snapshot[entries], return_index=True)
+            best[row, snapshots] = self.prices[entries[first]]
+
+        return best
+
+
+def apply_cooldown(triggered_at: Timestamps, cooldown: np.timedelta64) -> Timestamps:
+    """When alerts go out, given every time a tracker is triggered and a cooldown after each alert."""
+    if len(triggered_at) == 0 or cooldown <= np.timedelta64(0, "us"):
+        return triggered_at
+
+    # Index of the first trigger past the cooldown of each one
+    following = np.searchsorted(triggered_at, triggered_at + cooldown).tolist()
+
+    alerts: list[int] = []
+    index = 0
+    while index < len(following):
+        alerts.append(index)
+        index = following[index]
+
+    return triggered_at[alerts]
+
+
+def backtest_item(
+    history: SellHistory,
+    thresholds: Integers,
+    minimum_quantities: Integers,
+    *,
+    cooldown: timedelta,
+) -> list[Timestamps]:
+    """
+    When each of an item's trackers would have alerted over its history.
+
+    Trackers sharing a threshold and a minimum quantity alert together, so each distinct pair
+    is compared against the whole history once, in blocks of pairs.
+    """
+    quantities, quantity_index = np.unique(minimum_quantities, return_inverse=True)
+    pairs, pair_index = np.unique(np.stack((quantity_index, thresholds)), axis=1, return_inverse=True)
+
+    best = history.best_prices(quantities)
+    window = np.timedelta64(cooldown)
+    alerts: list[Timestamps] = []
+
+    block = max(1, BLOCK_CELLS // max(1, len(history)))
+    for start in range(0, pairs.shape[1], block):
+        pair_quantities, pair_thresholds = pairs[:, start : start + block]
+
+        triggered = best[pair_quantities] <= pair_thresholds[:, None]
+        rows, columns = np.nonzero(triggered)
+        # Row-major, so each pair's triggers are contiguous and in time order
+        bounds = np.searchsorted(rows, np.arange(len(pair_thresholds) + 1))
+
+        alerts.extend(
+            apply_cooldown(history.recorded_at[columns[low:high]], window) for low, high in itertools.pairwise(bounds)
+        )
+
+    return [alerts[pair] for pair in pair_index.ravel()]
+
+
+async def load_sell_history(
+    session: AsyncSession,
+    *,
+    item_id: str,
+    since: datetime | None = None,
+    until: datetime | None = None,
+) -> SellHistory:
+    """An item's sell side history, converted to arrays one streamed chunk at a time."""
+    parts = [
+        SellHistory.from_rows(chunk)
+        async for chunk in price_history_dao.stream_item(session, item_id=item_id, since=since, until=until)
+    ]
+
+    return SellHistory.concatenate(parts)
+
+
+async def backtest(
+    session: AsyncSession,
+    trackers: Sequence[Tracker],
+    *,
+    cooldown: timedelta,
+    since: datetime | None = None,
+    until: datetime | None = None,
+) -> list[Timestamps]:
+    """
+    When each tracker would have alerted over the recorded price history, in the same order as `trackers`.
+
+    Items are replayed one at a time, and the number crunching happens off the event loop.
+    """
+    by_item: defaultdict[str, list[int]] = defaultdict(list)
+    for index, tracker in enumerate(trackers):
+        by_item[tracker.item_id].append(index)
+
+    alerts: list[Timestamps] = [np.array([], dtype="datetime64[us]")] * len(trackers)
+
+    for item_id, indices in by_item.items():
+        history = await load_sell_history(session, item_id=item_id, since=since, until=until)
+        if not len(history):
+            continue
+
+        item_alerts = await asyncio.to_thread(
+            backtest_item,
+            history,
+            np.array([trackers[index].platinum_threshold for index in indices], dtype=np.int64),
+            np.array([trackers[index].minimum_quantity for index in indices], dtype=np.int64),
+            cooldown=cooldown,
+        )
+
+        for index, tracker_alerts in zip(indices, item_alerts, strict=True):
+            alerts[index] = tracker_alerts
+
+    return alerts
@@ -0,0 +1,125 @@
+import asyncio
+from collections.abc import Iterable
+from typing import Any
+
+from loguru import logger as log
+from sqlalchemy import ARRAY, Text, func, literal, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.database.models.warframe.items import DEFAULT_LANGUAGE, WarframeItemModel, WarframeItemNameModel
+from api.market.autocomplete import refresh_item_names
+from api.market.client import get_all_warframe_items
+from api.market.enrichment import enqueue_enrichment
+from api.market.rate import TokenBucket
+from api.settings import settings
+
+CATALOG_SYNC_JOB = "sync_catalog"
+
+# Every language of a sync can be fetched at once, syncs are hours apart
+catalog_budget = TokenBucket(settings.catalog_fetch_rate, burst=max(1, len(settings.catalog_languages)))
+
+
+async def _fetch_language(language: str) -> list[Any]:
+    await catalog_budget.acquire()
+
+    return await get_all_warframe_items(language)
+
+
+async def fetch_catalog(languages: Iterable[str]) -> dict[str, list[Any]]:
+    """
+    Every item in English and each of `languages`, fetched concurrently.
+
+    Only English is required, a language that fails to fetch is left out until the next sync.
+    """
+    languages = list(dict.fromkeys([DEFAULT_LANGUAGE, *languages]))
+    results = await asyncio.gather(*map(_fetch_language, languages), return_exceptions=True)
+
+    catalog: dict[str, list[Any]] = {}
+    for language, result in zip(languages, results, strict=True):
+        if isinstance(result, BaseException):
+            if language == DEFAULT_LANGUAGE:
+                raise result
+
+            log.opt(exception=result).warning(f"Failed fetching item names in {language}")
+            continue
+
+        catalog[language] = result
+
+    return catalog
+
+
+async def sync_catalog(session: AsyncSession, catalog: dict[str, list[Any]]) -> int:
+    """
+    Add the items that aren't in the database yet, returning how many there were, and index their names.
+
+    Names in other languages are upserted, one batch per language. New and changed items
+    are enriched with their details afterwards, by a job.
+    """
+    result = await session.execute(
+        # Items whose ID or URL name is taken are skipped alike
+        insert(WarframeItemModel).on_conflict_do_nothing().returning(WarframeItemModel.id),
+        catalog[DEFAULT_LANGUAGE],
+    )
+    new = len(result.all())
+
+    # Items renamed or given a new thumbnail upstream have their details fetched again too
+    upstream = (
+        func.unnest(
+            literal([item["id"] for item in catalog[DEFAULT_LANGUAGE]], ARRAY(Text)),
+            literal([item["item_name"] for item in catalog[DEFAULT_LANGUAGE]], ARRAY(Text)),
+            literal([item["thumb"] for item in catalog[DEFAULT_LANGUAGE]], ARRAY(Text)),
+        )
+        .table_valued("id", "item_name", "thumb")
+        .render_derived()
+    )
+    result = await session.execute(
+        update(WarframeItemModel)
+        .where(
+            WarframeItemModel.id == upstream.c.id,
+            or_(WarframeItemModel.item_name != upstream.c.item_name, WarframeItemModel.thumb != upstream.c.thumb),
+        )
+        .values(
+            item_name=upstream.c.item_name,
+            thumb=upstream.c.thumb,
+            enriched_at=None,
+            enrich_attempts=0,
+            enrich_after=None,
+        ),
+    )
+    changed = result.rowcount
+
+    known = set(await session.scalars(select(WarframeItemModel.id)))
+    stmt = insert(WarframeItemNameModel)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[WarframeItemNameModel.item_id, WarframeItemNameModel.language],
+        set_={"item_name": stmt.excluded.item_name},
+        where=WarframeItemNameModel.item_name != stmt.excluded.item_name,
+    )
+
+    for language, items in catalog.items():
+        if language == DEFAULT_LANGUAGE:
+            continue
+
+        names = [
+            {"item_id": item["id"], "language": language, "item_name": item["item_name"]}
+            for item in items
+            if item["id"] in known
+        ]
+        if names:
+            await session.execute(stmt, names)
+
+    # Other workers map the new snapshot the next time they check for one
+    if new or changed:
+        await refresh_item_names(session)
+
+    await enqueue_enrichment(session)
+
+    return new
+
+
+async def run_catalog_sync(session: AsyncSession, _payload: dict[str, Any]) -> None:
+    """Job handler syncing the catalog with warframe.market."""
+    new = await sync_catalog(session, await fetch_catalog(settings.catalog_languages))
+
+    log.info(f"Catalog sync added {new} new items")
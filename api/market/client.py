@@ -0,0 +1,57 @@
+from typing import Any
+
+from httpx import AsyncClient, AsyncHTTPTransport
+
+from api.market.http_cache import CachingTransport
+from api.settings import settings
+
+warframe_market_api = AsyncClient(
+    base_url="https://api.warframe.market/v1",
+    timeout=15.0,
+    transport=CachingTransport(
+        AsyncHTTPTransport(),
+        settings.http_cache_dir,
+        max_bytes=settings.http_cache_max_bytes,
+        stale_if_error=settings.http_cache_stale_if_error,
+    ),
+)
+
+# Images and other static assets, such as the thumbnails items point at
+warframe_market_static = AsyncClient(
+    base_url="https://warframe.market/static/assets",
+    timeout=15.0,
+)
+
+
+async def get_all_warframe_items(language: str = "en") -> list[Any]:
+    r = await warframe_market_api.get("/items", headers={"Language": language})
+    r.raise_for_status()
+
+    data = r.json()
+
+    items = data["payload"]["items"]
+
+    return items
+
+
+async def get_item_orders(url_name: str) -> list[Any]:
+    r = await warframe_market_api.get(f"/items/{url_name}/orders")
+    r.raise_for_status()
+
+    data = r.json()
+
+    orders = data["payload"]["orders"]
+
+    return orders
+
+
+async def get_item_details(url_name: str) -> list[Any]:
+    """Details of an item, and of every other item in its set."""
+    r = await warframe_market_api.get(f"/items/{url_name}")
+    r.raise_for_status()
+
+    data = r.json()
+
+    items = data["payload"]["item"]["items_in_set"]
+
+    return items
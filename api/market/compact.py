@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.database.models.warframe.items import WarframeItemModel
+
+if TYPE_CHECKING:
+    from api.routers.schemas.items import WarframeItemRow
+
+# Plain columns, so rows come straight from the cursor without hydrating any ORM instances
+CATALOG_STMT = select(
+    WarframeItemModel.id,
+    WarframeItemModel.thumb,
+    WarframeItemModel.item_name,
+    WarframeItemModel.url_name,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class CatalogItem:
+    id: str
+    thumb: str
+    item_name: str
+    url_name: str
+
+    def as_row(self) -> WarframeItemRow:
+        return {"id": self.id, "thumb": self.thumb, "item_name": self.item_name, "url_name": self.url_name}
+
+
+class CompactCatalog:
+    """
+    The item catalog held in process, for a fraction of the memory of ORM instances or row dicts.
+
+    Items are stored by column rather than as an object each, and looked up as records. IDs
+    and URL names are strings, each one shared by its column and the map finding items by it.
+    Thumbnails and names are only read to serve an item, so they're packed into one UTF-8
+    buffer with an array of offsets, without the header every string object carries.
+
+    Rows are expected to have unique IDs and URL names, as the table keeps them.
+    """
+
+    __slots__ = ("_bounds", "_by_id", "_by_url_name", "_ids", "_text", "_url_names")
+
+    def __init__(self) -> None:
+        self._ids: list[str] = []
+        self._url_names: list[str] = []
+        self._by_id: dict[str, int] = {}
+        self._by_url_name: dict[str, int] = {}
+        # The thumbnail and then the name of each item, and the offset each one ends at
+        self._text = bytearray()
+        self._bounds = array("I", [0])
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Sequence[str]]) -> CompactCatalog:
+        catalog = cls()
+        catalog.add_rows(rows)
+
+        return catalog
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __iter__(self) -> Iterator[CatalogItem]:
+        return map(self._item, range(len(self._ids)))
+
+    def add_rows(self, rows: Iterable[Sequence[str]]) -> None:
+        """Add items from rows of their ID, thumbnail, name and URL name."""
+        for item_id, thumb, item_name, url_name in rows:
+            index = len(self._ids)
+
+            self._ids.append(item_id)
+            self._url_names.append(url_name)
+            self._by_id[item_id] = index
+            self._by_url_name[url_name] = index
+
+            self._text += thumb.encode()
+            self._bounds.append(len(self._text))
+            self._text += item_name.encode()
+            self._bounds.append(len(self._text))
+
+    def _item(self, index: int) -> CatalogItem:
+        thumb_start, thumb_end, name_end = self._bounds[2 * index : 2 * index + 3]
+
+        return CatalogItem(
+            self._ids[index],
+            self._text[thumb_start:thumb_end].decode(),
+            self._text[thumb_end:name_end].decode(),
+            self._url_names[index],
+        )
+
+    def get(self, item_id: str) -> CatalogItem | None:
+        if (index := self._by_id.get(item_id)) is None:
+            return None
+
+        return self._item(index)
+
+    def get_by_url_name(self, url_name: str) -> CatalogItem | None:
+        if (index := self._by_url_name.get(url_name)) is None:
+            return None
+
+        return self._item(index)
+
+
+async def load_compact_catalog(session: AsyncSession, *, partition_size: int = 1000) -> CompactCatalog:
+    """The catalog, read from a server-side cursor a partition of rows at a time."""
+    connection = await session.connection()
+    result = await connection.stream(CATALOG_STMT.execution_options(yield_per=partition_size))
+
+    catalog = CompactCatalog()
+    async for partition in result.partitions():
+        catalog.add_rows(partition)
+
+    return catalog
@@ -0,0 +1,165 @@
+import asyncio
+from collections import defaultdict
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from httpx import HTTPError
+from loguru import logger as log
+from prometheus_client import Counter
+from sqlalchemy import ColumnElement, Interval, and_, exists, func, literal, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.sql.functions import now
+
+from api.database.models.warframe.items import WarframeItemModel
+from api.market.client import get_item_details
+from api.market.rate import TokenBucket
+from api.routers.schemas.jobs import JobCreate
+from api.settings import settings
+
+ENRICHED_ITEMS = Counter(
+    "enriched_items_total",
+    "Total count of items whose details were fetched, by result.",
+    ["result"],
+)
+
+ENRICH_JOB = "enrich_items"
+
+enrichment_budget = TokenBucket(settings.enrichment_fetch_rate, burst=settings.enrichment_concurrency)
+
+
+def set_details(members: list[Any], enriched_at: datetime) -> list[dict[str, Any]]:
+    """Rows updating every item of a set, from the details of any one of them."""
+    set_id = next((member["id"] for member in members if member.get("set_root")), None)
+
+    return [
+        {
+            "id": member["id"],
+            "tags": member.get("tags", []),
+            "ducats": member.get("ducats"),
+            "mastery_level": member.get("mastery_level"),
+            "set_id": set_id,
+            "enriched_at": enriched_at,
+            "enrich_attempts": 0,
+            "enrich_after": None,
+        }
+        for member in members
+    ]
+
+
+def group_sets(pending: dict[str, str]) -> list[list[tuple[str, str]]]:
+    """
+    Pending items grouped by the first two words of their URL names, set items first.
+
+    Parts of a set share those words, like `ash_prime_set` and `ash_prime_chassis`, so each
+    group is enriched one item at a time, and a set is fetched once rather than once per part.
+    """
+    groups: defaultdict[str, list[tuple[str, str]]] = defaultdict(list)
+    for item_id, url_name in pending.items():
+        groups["_".join(url_name.split("_")[:2])].append((item_id, url_name))
+
+    return [sorted(group, key=lambda item: (not item[1].endswith("_set"), item[1])) for group in groups.values()]
+
+
+def pending_enrichment() -> ColumnElement[bool]:
+    """Items missing their details, which haven't run out of attempts at fetching them."""
+    return and_(
+        WarframeItemModel.enriched_at.is_(None),
+        WarframeItemModel.enrich_attempts < settings.enrichment_max_attempts,
+    )
+
+
+async def enqueue_enrichment(session: AsyncSession) -> int:
+    """Enqueue enriching the items missing their details, if there are any and it isn't queued already."""
+    # The DAO imports its schemas from `api.routers`, which syncs the catalog from here
+    from api.database.crud.jobs import job_dao
+
+    if not await session.scalar(select(exists().where(pending_enrichment()))):
+        return 0
+
+    return await job_dao.enqueue(
+        session,
+        jobs=[JobCreate(kind=ENRICH_JOB, key=ENRICH_JOB, max_attempts=settings.jobs_max_attempts)],
+    )
+
+
+class ItemEnricher:
+    """
+    Job handler fetching the details of a batch of items missing them, and writing them at once.
+
+    The batch is claimed in a transaction of its own, with `SKIP LOCKED`, before anything is
+    fetched. Claiming an item counts as an attempt and pushes the next one back, twice as far
+    each time, so concurrent jobs enrich different items and items that fail, or whose job dies,
+    are retried later rather than at the head of every batch. Items out of attempts are left
+    until the catalog sync finds them changed.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession]) -> None:
+        self.session_factory = session_factory
+
+    async def claim_batch(self) -> dict[str, str]:
+        """URL names of a batch of items due to be enriched, by ID."""
+        due = (
+            select(WarframeItemModel.id)
+            .where(
+                pending_enrichment(),
+                or_(WarframeItemModel.enrich_after.is_(None), WarframeItemModel.enrich_after <= now()),
+            )
+            .order_by(WarframeItemModel.url_name)
+            .limit(settings.enrichment_batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        backoff = literal(timedelta(seconds=settings.enrichment_backoff), Interval)
+        stmt = (
+            update(WarframeItemModel)
+            .where(WarframeItemModel.id.in_(due))
+            .values(
+                enrich_attempts=WarframeItemModel.enrich_attempts + 1,
+                enrich_after=now() + func.power(2, WarframeItemModel.enrich_attempts) * backoff,
+            )
+            .returning(WarframeItemModel.id, WarframeItemModel.url_name)
+        )
+
+        async with self.session_factory() as session, session.begin():
+            return dict((await session.execute(stmt)).tuples().all())
+
+    async def run(self, session: AsyncSession, _payload: dict[str, Any]) -> None:
+        pending = await self.claim_batch()
+        if not pending:
+            return
+
+        semaphore = asyncio.Semaphore(settings.enrichment_concurrency)
+        enriched_at = datetime.now(tz=UTC).replace(tzinfo=None)
+        details: dict[str, dict[str, Any]] = {}
+
+        async def enrich(group: list[tuple[str, str]]) -> None:
+            async with semaphore:
+                for item_id, url_name in group:
+                    # Filled in along with another item of its set
+                    if item_id in details:
+                        continue
+
+                    await enrichment_budget.acquire()
+
+                    try:
+                        members = await get_item_details(url_name)
+                    except HTTPError as e:
+                        log.warning(f"Failed fetching details of {url_name}: {e}")
+                        ENRICHED_ITEMS.labels(result="failed").inc()
+                        continue
+
+                    # Items outside of the batch may be claimed by another job
+                    details.update(
+                        (row["id"], row) for row in set_details(members, enriched_at) if row["id"] in pending
+                    )
+
+        await asyncio.gather(*map(enrich, group_sets(pending)))
+
+        if details:
+            await session.execute(update(WarframeItemModel), list(details.values()))
+            ENRICHED_ITEMS.labels(result="succeeded").inc(len(details))
+
+        # There may be more, the follow-up can't be deduplicated against this job while it's running
+        if len(pending) == settings.enrichment_batch_size:
+            from api.database.crud.jobs import job_dao
+
+            await job_dao.enqueue(session, jobs=[JobCreate(kind=ENRICH_JOB, max_attempts=settings.jobs_max_attempts)])
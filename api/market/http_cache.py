@@ -0,0 +1,231 @@
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import time
+from contextlib import suppress
+from dataclasses import dataclass
+from pathlib import Path
+
+import httpx
+from prometheus_client import Counter
+
+HTTP_CACHE_LOOKUPS = Counter(
+    "http_cache_lookups_total",
+    "Total count of upstream requests answered by the HTTP cache, by result.",
+    ["result"],
+)
+
+# Request headers upstream varies its responses on, each value is cached separately
+VARY_HEADERS = ("language", "platform")
+
+
+@dataclass(frozen=True, slots=True)
+class CachedResponse:
+    status_code: int
+    headers: list[tuple[str, str]]
+    # The body as it came over the wire, before any content encoding is undone
+    content: bytes
+    # When the response was stored or last revalidated
+    validated_at: float
+
+    @property
+    def max_age(self) -> float:
+        """Seconds the response is fresh for after it's validated, zero unless upstream allows more."""
+        directives = [
+            directive.strip().lower()
+            for name, value in self.headers
+            if name.lower() == "cache-control"
+            for directive in value.split(",")
+        ]
+        if "no-cache" in directives:
+            return 0.0
+
+        for directive in directives:
+            if directive.startswith("max-age="):
+                with suppress(ValueError):
+                    return float(directive.removeprefix("max-age="))
+
+        return 0.0
+
+    def to_response(self, request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            self.status_code,
+            headers=self.headers,
+            stream=httpx.ByteStream(self.content),
+            request=request,
+        )
+
+
+def cacheable(response: httpx.Response) -> bool:
+    """Whether a response can be stored, being successful, allowed, and able to be revalidated or fresh."""
+    cache_control = response.headers.get("cache-control", "").lower()
+
+    return (
+        response.status_code == httpx.codes.OK
+        and "no-store" not in cache_control
+        and ("etag" in response.headers or "last-modified" in response.headers or "max-age" in cache_control)
+    )
+
+
+class CachingTransport(httpx.AsyncBaseTransport):
+    """
+    Transport caching upstream responses on local disk, shared by every worker on the host.
+
+    Responses to `GET` requests are stored with their validators, and requested again with
+    `If-None-Match` and `If-Modified-Since`, so unchanged resources come back as an empty 304.
+    They're only served without asking upstream while their `max-age` allows it. When upstream
+    fails, with a server error or no response at all, a response validated within the last
+    `stale_if_error` seconds is served instead.
+
+    Files are written under a temporary name and renamed into place, so a worker never reads one
+    half written. Responses are evicted least recently validated first once they take more than
+    `max_bytes`.
+    """
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        directory: Path,
+        *,
+        max_bytes: int,
+        stale_if_error: float,
+    ) -> None:
+        self.transport = transport
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.stale_if_error = stale_if_error
+
+        # Bytes of responses on disk, as far as this worker knows, counted on the first write
+        self._size: int | None = None
+
+    def _path(self, request: httpx.Request) -> Path:
+        key = [str(request.url), *(request.headers.get(name, "") for name in VARY_HEADERS)]
+        digest = hashlib.sha256("\n".join(key).encode()).hexdigest()
+
+        return self.directory / "responses" / digest[:2] / digest
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if request.method != "GET":
+            return await self.transport.handle_async_request(request)
+
+        path = self._path(request)
+        cached = await asyncio.to_thread(self._load, path)
+
+        if cached is None:
+            HTTP_CACHE_LOOKUPS.labels(result="miss").inc()
+        elif time.time() - cached.validated_at < cached.max_age:
+            HTTP_CACHE_LOOKUPS.labels(result="hit").inc()
+            return cached.to_response(request)
+        else:
+            headers = dict(cached.headers)
+            if etag := headers.get("etag"):
+                request.headers["If-None-Match"] = etag
+            if last_modified := headers.get("last-modified"):
+                request.headers["If-Modified-Since"] = last_modified
+
+        try:
+            response = await self.transport.handle_async_request(request)
+        except httpx.TransportError:
+            if (stale := self._stale(cached)) is None:
+                raise
+
+            return stale.to_response(request)
+
+        if cached is not None and response.status_code == httpx.codes.NOT_MODIFIED:
+            await response.aclose()
+            HTTP_CACHE_LOOKUPS.labels(result="revalidated").inc()
+
+            with suppress(FileNotFoundError):
+                os.utime(path)
+
+            return cached.to_response(request)
+
+        if response.is_server_error and (stale := self._stale(cached)) is not None:
+            await response.aclose()
+            return stale.to_response(request)
+
+        if not cacheable(response):
+            return response
+
+        # Read from the transport's stream, the body stays encoded and the client decodes it once
+        stream = response.stream
+        assert isinstance(stream, httpx.AsyncByteStream)
+        try:
+            content = b"".join([chunk async for chunk in stream])
+        finally:
+            await stream.aclose()
+
+        stored = CachedResponse(response.status_code, response.headers.multi_items(), content, time.time())
+        await asyncio.to_thread(self._store, path, stored)
+
+        return stored.to_response(request)
+
+    def _stale(self, cached: CachedResponse | None) -> CachedResponse | None:
+        if cached is None or time.time() - cached.validated_at > self.stale_if_error:
+            return None
+
+        HTTP_CACHE_LOOKUPS.labels(result="stale").inc()
+
+        return cached
+
+    def _load(self, path: Path) -> CachedResponse | None:
+        try:
+            with path.open("rb") as file:
+                validated_at = os.fstat(file.fileno()).st_mtime
+                metadata = json.loads(file.readline())
+                content = file.read()
+        except FileNotFoundError:
+            return None
+
+        return CachedResponse(
+            metadata["status_code"],
+            [(header[0], header[1]) for header in metadata["headers"]],
+            content,
+            validated_at,
+        )
+
+    def _store(self, path: Path, cached: CachedResponse) -> None:
+        (self.directory / "tmp").mkdir(parents=True, exist_ok=True)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        fd, temporary = tempfile.mkstemp(dir=self.directory / "tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(json.dumps({"status_code": cached.status_code, "headers": cached.headers}).encode())
+                file.write(b"\n")
+                file.write(cached.content)
+
+            os.replace(temporary, path)
+        except BaseException:
+            with suppress(FileNotFoundError):
+                os.unlink(temporary)
+            raise
+
+        size = path.stat().st_size
+        if self._size is None or self._size + size > self.max_bytes:
+            self._evict()
+        else:
+            self._size += size
+
+    def _evict(self) -> None:
+        """Remove the least recently validated responses until the rest fit in `max_bytes`."""
+        responses: list[tuple[float, int, Path]] = []
+        for path in (self.directory / "responses").glob("*/*"):
+            with suppress(FileNotFoundError):
+                stat = path.stat()
+                responses.append((stat.st_mtime, stat.st_size, path))
+
+        size = sum(response_size for _, response_size, _ in responses)
+        for _, response_size, path in sorted(responses):
+            if size <= self.max_bytes:
+                break
+
+            path.unlink(missing_ok=True)
+            size -= response_size
+
+        self._size = size
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
@@ -0,0 +1,248 @@
+import sys
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from itertools import accumulate, islice
+from typing import Any
+
+from prometheus_client import Counter, Gauge
+
+ORDER_BOOK_BYTES = Gauge(
+    "order_book_bytes",
+    "Gauge of the approximate memory held by in-memory order books.",
+    multiprocess_mode="livesum",
+)
+ORDER_BOOK_CHANGES = Counter(
+    "order_book_changes_total",
+    "Total count of orders applied to order books by kind of change.",
+    ["change"],
+)
+
+# Orders from players who can trade right now
+TRADING_STATUSES = frozenset(("ingame", "online"))
+
+
+@dataclass(slots=True)
+class BookOrder:
+    id: str
+    platinum: int
+    quantity: int
+    user: str
+
+
+@dataclass(frozen=True, slots=True)
+class OrderBookDiff:
+    added: int = 0
+    changed: int = 0
+    removed: int = 0
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.changed or self.removed)
+
+
+class BookSide:
+    """
+    One side of an order book.
+
+    Orders are grouped into price levels, whose prices are kept in a sorted array, so every
+    lookup by price is a binary search. Cumulative quantities per level are rebuilt once
+    after a batch of changes, rather than on every change.
+    """
+
+    __slots__ = ("_cumulative", "_dirty", "_levels", "_orders", "_prices", "descending")
+
+    def __init__(self, *, descending: bool) -> None:
+        # Buyers are best first when highest, sellers when lowest
+        self.descending = descending
+
+        self._orders: dict[str, BookOrder] = {}
+        self._levels: dict[int, dict[str, BookOrder]] = {}
+        self._prices = array("l")
+        self._cumulative = array("q")
+        self._dirty = False
+
+    def __len__(self) -> int:
+        return len(self._orders)
+
+    def __contains__(self, order_id: str) -> bool:
+        return order_id in self._orders
+
+    def get(self, order_id: str) -> BookOrder | None:
+        return self._orders.get(order_id)
+
+    def add(self, order: BookOrder) -> None:
+        if (level := self._levels.get(order.platinum)) is None:
+            level = self._levels[order.platinum] = {}
+            insort(self._prices, order.platinum)
+
+        level[order.id] = order
+        self._orders[order.id] = order
+        self._dirty = True
+
+    def remove(self, order_id: str) -> BookOrder | None:
+        if (order := self._orders.pop(order_id, None)) is None:
+            return None
+
+        level = self._levels[order.platinum]
+        del level[order_id]
+
+        if not level:
+            del self._levels[order.platinum]
+            del self._prices[bisect_left(self._prices, order.platinum)]
+
+        self._dirty = True
+
+        return order
+
+    def set_quantity(self, order_id: str, quantity: int) -> None:
+        self._orders[order_id].quantity = quantity
+        self._dirty = True
+
+    def ids(self) -> set[str]:
+        return set(self._orders)
+
+    def best_price(self) -> int | None:
+        if not self._prices:
+            return None
+
+        return self._prices[-1] if self.descending else self._prices[0]
+
+    def best(self, n: int) -> list[BookOrder]:
+        """The `n` best orders, by price."""
+        return list(islice(self._iterate(), n))
+
+    def best_with_quantity(self, quantity: int) -> BookOrder | None:
+        """The best order for at least `quantity` items at once."""
+        return next((order for order in self._iterate() if order.quantity >= quantity), None)
+
+    def quantity_frontier(self) -> tuple[list[int], list[int]]:
+        """
+        Prices and quantities of the orders offering more at once than any better priced one.
+
+        The best order for a minimum quantity is always one of these, so they're all it takes
+        to answer `best_with_quantity` for any quantity later on.
+        """
+        prices: list[int] = []
+        quantities: list[int] = []
+
+        for order in self._iterate():
+            if not quantities or order.quantity > quantities[-1]:
+                prices.append(order.platinum)
+                quantities.append(order.quantity)
+
+        return prices, quantities
+
+    def quantity_at_or_below(self, platinum: int) -> int:
+        """Total quantity on offer at `platinum` or less."""
+        self._rebuild()
+
+        index = bisect_right(self._prices, platinum)
+
+        return self._cumulative[index - 1] if index else 0
+
+    def quantity_at_or_above(self, platinum: int) -> int:
+        """Total quantity on offer at `platinum` or more."""
+        self._rebuild()
+
+        if not self._cumulative:
+            return 0
+
+        index = bisect_left(self._prices, platinum)
+
+        return self._cumulative[-1] - (self._cumulative[index - 1] if index else 0)
+
+    def levels(self) -> tuple[array[int], array[int]]:
+        """Copies of the ascending level prices and the cumulative quantity up to each of them."""
+        self._rebuild()
+
+        return array("l", self._prices), array("q", self._cumulative)
+
+    def nbytes(self) -> int:
+        """Approximate size in memory, including the orders themselves."""
+        return (
+            sys.getsizeof(self._orders)
+            + sys.getsizeof(self._levels)
+            + sum(map(sys.getsizeof, self._levels.values()))
+            + sum(sys.getsizeof(order) + sys.getsizeof(order.id) + sys.getsizeof(order.user) for order in self)
+            + self._prices.buffer_info()[1] * self._prices.itemsize
+            + self._cumulative.buffer_info()[1] * self._cumulative.itemsize
+        )
+
+    def __iter__(self) -> Iterator[BookOrder]:
+        return iter(self._orders.values())
+
+    def _iterate(self) -> Iterator[BookOrder]:
+        prices = reversed(self._prices) if self.descending else iter(self._prices)
+
+        for price in prices:
+            yield from self._levels[price].values()
+
+    def _rebuild(self) -> None:
+        if not self._dirty:
+            return
+
+        self._cumulative = array(
+            "q",
+            accumulate(sum(order.quantity for order in self._levels[price].values()) for price in self._prices),
+        )
+        self._dirty = False
+
+
+class OrderBook:
+    """
+    Live orders for one item, kept up to date by applying each upstream fetch as a diff.
+
+    Only orders from players who can trade right now are kept.
+    """
+
+    __slots__ = ("buy", "item_id", "sell")
+
+    def __init__(self, item_id: str) -> None:
+        self.item_id = item_id
+        self.sell = BookSide(descending=False)
+        self.buy = BookSide(descending=True)
+
+    def apply(self, orders: Iterable[dict[str, Any]]) -> OrderBookDiff:
+        """Bring the book in line with a fetch of every order for the item."""
+        incoming: dict[str, dict[str, BookOrder]] = {"sell": {}, "buy": {}}
+
+        for order in orders:
+            if not order["visible"] or order["user"]["status"] not in TRADING_STATUSES:
+                continue
+
+            incoming[order["order_type"]][order["id"]] = BookOrder(
+                id=order["id"],
+                platinum=order["platinum"],
+                quantity=order["quantity"],
+                user=order["user"]["ingame_name"],
+            )
+
+        added = changed = removed = 0
+
+        for side, fetched in ((self.sell, incoming["sell"]), (self.buy, incoming["buy"])):
+            for order_id in side.ids() - fetched.keys():
+                side.remove(order_id)
+                removed += 1
+
+            for order_id, order in fetched.items():
+                if (current := side.get(order_id)) is None:
+                    side.add(order)
+                    added += 1
+                elif current.platinum != order.platinum:
+                    # Moves to another price level
+                    side.remove(order_id)
+                    side.add(order)
+                    changed += 1
+                elif current.quantity != order.quantity:
+                    side.set_quantity(order_id, order.quantity)
+                    changed += 1
+
+        ORDER_BOOK_CHANGES.labels(change="added").inc(added)
+        ORDER_BOOK_CHANGES.labels(change="changed").inc(changed)
+        ORDER_BOOK_CHANGES.labels(change="removed").inc(removed)
+
+        return OrderBookDiff(added=added, changed=changed, removed=removed)
+
+    def nbytes(self) -> int:
+        return sys.getsizeof(self) + self.sell.nbytes() + self.buy.nbytes()
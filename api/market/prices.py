@@ -0,0 +1,330 @@
+import asyncio
+import math
+import time
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime, timedelta
+from typing import Any, cast
+
+import asyncpg
+from httpx import HTTPError
+from loguru import logger as log
+from prometheus_client import Counter, Gauge
+from sqlalchemy import Interval, func, literal, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from api.database.crud.followers import item_followers_dao
+from api.database.crud.history import price_history_dao, price_sketch_dao
+from api.database.crud.jobs import job_dao
+from api.database.crud.tracking import order_tracking_dao
+from api.database.models.warframe.followers import ItemFollowersModel
+from api.database.models.warframe.items import WarframeItemModel
+from api.database.models.warframe.tracking import WarframeMarketOrderModel
+from api.events.prices import (
+    forget_price,
+    item_topic,
+    notify_book_summary,
+    price_broker,
+    publish_price,
+    subscribed_items,
+)
+from api.jobs.worker import worker_name
+from api.market.client import get_item_orders
+from api.market.order_book import ORDER_BOOK_BYTES, OrderBook
+from api.market.scheduler import ItemDemand, PollScheduler
+from api.market.summaries import OrderBookSummary, summary_cache
+from api.notifications.alerts import evaluate_order_book
+from api.routers.schemas.jobs import JobCreate
+
+PRICE_POLLS = Counter(
+    "price_polls_total",
+    "Total count of upstream order fetches by result.",
+    ["result"],
+)
+POLLED_ITEMS = Gauge(
+    "price_polled_items",
+    "Gauge of followed items, which are polled for prices.",
+    multiprocess_mode="livesum",
+)
+
+POLL_JOB = "poll_item"
+
+# Advisory lock held by the worker scheduling polls for every worker
+SCHEDULER_LOCK = 0x6F7264697301
+
+# Intervals after which an item's followers, or its summaries, are taken to have stopped
+FOLLOW_EXPIRY = 3
+
+
+@dataclass(frozen=True, slots=True)
+class PriceSummary:
+    best_sell: int | None
+    best_buy: int | None
+    sellers: int
+    buyers: int
+
+
+def summarize(summary: OrderBookSummary) -> PriceSummary:
+    return PriceSummary(
+        best_sell=summary.sellers[0].platinum if summary.sellers else None,
+        best_buy=summary.buyers[0].platinum if summary.buyers else None,
+        sellers=summary.sell_count,
+        buyers=summary.buy_count,
+    )
+
+
+class PricePoller:
+    """
+    Keeps the prices of the items anyone is following up to date.
+
+    An item is followed while it has a tracker in the database, or a live subscriber or a recently
+    requested summary in any worker. Every worker reports what it follows to the database, and a single
+    one, holding the scheduler lock, adds the reports up with the trackers and schedules every item
+    within the whole `rate`. Due items are enqueued as poll jobs, deduplicated by item, with their
+    `run_at` spaced `1 / rate` seconds apart, so upstream is polled no faster than that however many
+    workers there are. The lock is released along with its connection, and another worker takes over.
+
+    The worker running the job applies the fetch to its order book, evaluates the item's trackers
+    against it, records it in the price history and its statistics, and notifies every worker of the
+    book's new summary through Postgres. Each of them caches it and publishes it to live subscribers
+    if it changed, and the scheduling worker feeds it back to its scheduler. Items no summary arrived
+    for in a while are no longer followed, and are dropped from the books and caches of each worker.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        *,
+        scheduler: PollScheduler,
+        rate: float,
+        demand_interval: float,
+        alert_cooldown: timedelta,
+        name: str | None = None,
+    ) -> None:
+        self.session_factory = session_factory
+        self.scheduler = scheduler
+        self.rate = rate
+        self.demand_interval = demand_interval
+        self.alert_cooldown = alert_cooldown
+        self.name = name or worker_name()
+
+        # Books of the items this worker has polled
+        self.books: dict[str, OrderBook] = {}
+
+        self._summaries: dict[str, PriceSummary] = {}
+        self._summarized_at: dict[str, float] = {}
+        # Wall clock time the last enqueued poll may run at
+        self._last_slot = -math.inf
+
+    async def run(self, dsn: str) -> None:
+        await asyncio.gather(self._follow(), self._schedule(dsn))
+
+    async def _follow(self) -> None:
+        while True:
+            try:
+                await self.report_followers()
+            except Exception:
+                log.exception("Failed reporting followed items")
+
+            self.forget_stale()
+
+            await asyncio.sleep(self.demand_interval)
+
+    async def _schedule(self, dsn: str) -> None:
+        """
+        Schedule polls for every worker whenever this one holds the scheduler lock.
+
+        The lock is held by a connection of its own, opened straight from `dsn` rather than the pool,
+        since it only lasts as long as the server session it was taken in.
+        """
+        while True:
+            try:
+                connection = cast(asyncpg.Connection, await asyncpg.connect(dsn))  # pyright: ignore[reportUnknownMemberType]
+                try:
+                    if await self.claim_scheduler(connection):
+                        await self._schedule_polls(connection)
+                finally:
+                    # Releases the lock
+                    await connection.close()
+            except Exception:
+                log.exception("Failed scheduling price polls")
+
+            await asyncio.sleep(self.demand_interval)
+
+    async def claim_scheduler(self, connection: asyncpg.Connection) -> bool:
+        """Take the scheduler lock for as long as `connection` is open, unless another worker holds it."""
+        claimed = await connection.fetchval("SELECT pg_try_advisory_lock($1)", SCHEDULER_LOCK)  # pyright: ignore[reportUnknownVariableType]
+
+        return claimed is True
+
+    async def _schedule_polls(self, connection: asyncpg.Connection) -> None:
+        log.info("Scheduling price polls for every worker")
+        refreshed_at = -math.inf
+
+        try:
+            while True:
+                if time.monotonic() - refreshed_at >= self.demand_interval:
+                    # Fails once the connection is lost, and the lock with it
+                    await connection.execute("SELECT 1")
+
+                    try:
+                        await self.refresh_demand()
+                    except Exception:
+                        log.exception("Failed refreshing item demand")
+
+                    refreshed_at = time.monotonic()
+
+                try:
+                    await self.enqueue_due()
+                except Exception:
+                    log.exception("Failed enqueuing price polls")
+
+                await asyncio.sleep(min(self.scheduler.wait_time(time.monotonic()), self.demand_interval))
+        finally:
+            # Whoever takes over starts from the demand again
+            self.scheduler.update_demand({}, time.monotonic())
+            POLLED_ITEMS.set(0)
+
+    async def report_followers(self) -> None:
+        """Record which items this worker follows, and how many follow each, for the scheduling worker."""
+        followers = {item_id: price_broker.subscriber_count(item_topic(item_id)) for item_id in subscribed_items()}
+        # Someone asking for an item's summary is following it too
+        for item_id in summary_cache.requested_items():
+            followers[item_id] = followers.get(item_id, 0) + 1
+
+        async with self.session_factory() as session, session.begin():
+            await item_followers_dao.report(session, worker=self.name, followers=followers)
+
+    def forget_stale(self) -> None:
+        """Drop what this worker keeps of items without a summary for a while, which are no longer followed."""
+        # Every followed item is polled at least once per `max_interval`
+        expired_before = time.monotonic() - FOLLOW_EXPIRY * self.scheduler.max_interval
+
+        for item_id, summarized_at in list(self._summarized_at.items()):
+            if summarized_at >= expired_before:
+                continue
+
+            del self._summarized_at[item_id]
+            self.books.pop(item_id, None)
+            order_tracking_dao.thresholds.discard(item_id)
+            self._summaries.pop(item_id, None)
+            summary_cache.discard(item_id)
+            forget_price(item_id)
+
+        ORDER_BOOK_BYTES.set(sum(book.nbytes() for book in self.books.values()))
+
+    async def refresh_demand(self) -> None:
+        """Update which items are followed, and how much each of them is in demand."""
+        demands = await self.item_demand()
+        POLLED_ITEMS.set(len(demands))
+
+        self.scheduler.update_demand(demands, time.monotonic())
+
+    async def enqueue_due(self) -> int:
+        """Enqueue a poll of every item that is due, returning how many weren't already queued."""
+        now = time.monotonic()
+        due = self.scheduler.pop_due(now)
+        if not due:
+            return 0
+
+        jobs: list[JobCreate] = []
+        current = time.time()
+        for item in due:
+            self._last_slot = max(current, self._last_slot + 1 / self.rate)
+            # Polls that can run straight away are left to the database's clock
+            run_at = None
+            if self._last_slot > current:
+                run_at = datetime.fromtimestamp(self._last_slot, tz=UTC).replace(tzinfo=None)
+
+            # Rescheduled properly once the poll's summary arrives, this only covers polls that fail
+            self.scheduler.postpone(item.item_id, now + self._last_slot - current)
+
+            jobs.append(
+                JobCreate(
+                    kind=POLL_JOB,
+                    key=item.item_id,
+                    payload={"item_id": item.item_id, "url_name": item.demand.url_name},
+                    # The next poll is scheduled anyway, retrying would only delay it
+                    max_attempts=1,
+                    run_at=run_at,
+                ),
+            )
+
+        async with self.session_factory() as session, session.begin():
+            return await job_dao.enqueue(session, jobs=jobs)
+
+    async def item_demand(self) -> dict[str, ItemDemand]:
+        """Demand for each item followed in any worker, by item ID."""
+        stale_after = timedelta(seconds=FOLLOW_EXPIRY * self.demand_interval)
+
+        trackers = (
+            select(
+                WarframeMarketOrderModel.item_id,
+                func.count().label("trackers"),
+                func.max(WarframeMarketOrderModel.platinum_threshold).label("threshold"),
+            )
+            .group_by(WarframeMarketOrderModel.item_id)
+            .subquery()
+        )
+        followers = (
+            select(ItemFollowersModel.item_id, func.sum(ItemFollowersModel.followers).label("followers"))
+            .where(ItemFollowersModel.reported_at >= func.now() - literal(stale_after, Interval))
+            .group_by(ItemFollowersModel.item_id)
+            .subquery()
+        )
+        stmt = (
+            select(
+                WarframeItemModel.id,
+                WarframeItemModel.url_name,
+                func.coalesce(trackers.c.trackers, 0),
+                trackers.c.threshold,
+                func.coalesce(followers.c.followers, 0),
+            )
+            .outerjoin(trackers, trackers.c.item_id == WarframeItemModel.id)
+            .outerjoin(followers, followers.c.item_id == WarframeItemModel.id)
+            .where(or_(trackers.c.item_id.is_not(None), followers.c.item_id.is_not(None)))
+        )
+
+        async with self.session_factory() as session, session.begin():
+            rows = await session.execute(stmt)
+            await item_followers_dao.purge_stale(session, older_than=stale_after)
+
+        return {
+            item_id: ItemDemand(url_name=url_name, trackers=count, subscribers=int(subscribers), threshold=threshold)
+            for item_id, url_name, count, threshold, subscribers in rows.tuples()
+        }
+
+    async def poll_item(self, session: AsyncSession, payload: dict[str, Any]) -> None:
+        """Job handler polling one item."""
+        item_id: str = payload["item_id"]
+
+        try:
+            orders = await get_item_orders(payload["url_name"])
+        except HTTPError:
+            PRICE_POLLS.labels(result="error").inc()
+            raise
+
+        PRICE_POLLS.labels(result="ok").inc()
+
+        book = self.books.setdefault(item_id, OrderBook(item_id))
+        book.apply(orders)
+        self._summarized_at[item_id] = time.monotonic()
+
+        await evaluate_order_book(session, book, cooldown=self.alert_cooldown)
+        snapshot = await price_history_dao.record(session, book=book)
+        await price_sketch_dao.record(session, snapshot=snapshot)
+        await notify_book_summary(session, OrderBookSummary.from_book(book, summary_cache.depth).to_json())
+
+    def handle_summary_notification(self, raw: str) -> None:
+        """Take in a summary of a poll, made by any worker."""
+        summary = OrderBookSummary.from_json(raw)
+        price = summarize(summary)
+
+        summary_cache.store(summary)
+        self._summarized_at[summary.item_id] = time.monotonic()
+        self.scheduler.record_poll(summary.item_id, price.best_sell, time.monotonic())
+
+        if self._summaries.get(summary.item_id) == price:
+            return
+
+        self._summaries[summary.item_id] = price
+        publish_price(summary.item_id, **asdict(price))
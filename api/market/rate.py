@@ -0,0 +1,38 @@
+import asyncio
+import time
+
+
+class TokenBucket:
+    """Allows `rate` operations per second on average, and bursts of up to `burst` at once."""
+
+    def __init__(self, rate: float, burst: float) -> None:
+        self.rate = rate
+        self.burst = burst
+
+        self._tokens = burst
+        self._updated_at = time.monotonic()
+
+    def _refill(self) -> None:
+        current = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (current - self._updated_at) * self.rate)
+        self._updated_at = current
+
+    def try_acquire(self) -> bool:
+        self._refill()
+
+        if self._tokens < 1:
+            return False
+
+        self._tokens -= 1
+
+        return True
+
+    def retry_after(self) -> float:
+        """Seconds until a token is available."""
+        self._refill()
+
+        return max(0.0, (1 - self._tokens) / self.rate)
+
+    async def acquire(self) -> None:
+        while not self.try_acquire():
+            await asyncio.sleep(self.retry_after())
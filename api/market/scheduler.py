@@ -0,0 +1,195 @@
+import heapq
+import math
+from dataclasses import dataclass
+
+from prometheus_client import Gauge, Histogram
+
+POLL_LAG = Histogram(
+    "price_poll_lag_seconds",
+    "Histogram of how late items were polled after becoming due (in seconds).",
+    buckets=(0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300),
+)
+SCHEDULED_RATE = Gauge(
+    "price_poll_scheduled_rate",
+    "Gauge of polls per second the scheduler plans to make across all items.",
+    multiprocess_mode="livesum",
+)
+
+# How much each signal raises an item's share of the budget
+SUBSCRIBER_WEIGHT = 2.0
+# An item whose best price moves by 5% between polls on average gets twice the share
+VOLATILITY_WEIGHT = 20.0
+# An item priced right at its nearest threshold gets five times the share
+PROXIMITY_WEIGHT = 4.0
+# Smoothing of the volatility average, higher values forget older polls faster
+VOLATILITY_ALPHA = 0.3
+
+
+@dataclass(frozen=True, slots=True)
+class ItemDemand:
+    url_name: str
+    trackers: int = 0
+    subscribers: int = 0
+    # Highest tracker threshold, which is the first to trigger as the price drops
+    threshold: int | None = None
+
+
+@dataclass(slots=True)
+class ScheduledItem:
+    item_id: str
+    demand: ItemDemand
+    due: float
+    interval: float
+    polled_at: float | None = None
+    best_sell: int | None = None
+    volatility: float = 0.0
+
+    def score(self) -> float:
+        score = 1 + math.log1p(self.demand.trackers) + SUBSCRIBER_WEIGHT * math.log1p(self.demand.subscribers)
+        score *= 1 + VOLATILITY_WEIGHT * self.volatility
+
+        if self.best_sell and self.demand.threshold is not None:
+            gap = (self.best_sell - self.demand.threshold) / self.best_sell
+            score *= 1 + PROXIMITY_WEIGHT * (1 - min(max(gap, 0.0), 1.0))
+
+        return score
+
+
+def allocate_intervals(
+    scores: dict[str, float],
+    budget: float,
+    *,
+    min_interval: float,
+    max_interval: float,
+) -> dict[str, float]:
+    """
+    Split `budget` polls per second between items in proportion to their scores.
+
+    Items whose share would have them polled more often than `min_interval` are capped,
+    and what they don't use goes to the others. Idle items are still polled every `max_interval`.
+    """
+    intervals: dict[str, float] = {}
+    remaining_rate = budget
+    remaining_score = sum(scores.values())
+    max_rate = 1 / min_interval
+
+    # Highest first, since only they can hit the cap
+    for item_id, score in sorted(scores.items(), key=lambda item: item[1], reverse=True):
+        rate = min(max_rate, remaining_rate * score / remaining_score) if remaining_score > 0 else 0.0
+
+        intervals[item_id] = max_interval if rate <= 0 else min(max_interval, 1 / rate)
+
+        remaining_rate = max(0.0, remaining_rate - rate)
+        remaining_score -= score
+
+    return intervals
+
+
+class PollScheduler:
+    """
+    Decides when each followed item is polled next.
+
+    Items wait in a heap keyed by their due time, and the budget is reallocated between them
+    whenever their demand is updated, based on demand, price volatility and how close
+    the best price is to triggering a tracker.
+    """
+
+    def __init__(self, *, budget: float, min_interval: float, max_interval: float) -> None:
+        self.budget = budget
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+
+        self.items: dict[str, ScheduledItem] = {}
+        # Entries are left behind when an item is rescheduled or removed, and skipped when popped
+        self._heap: list[tuple[float, str]] = []
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def update_demand(self, demands: dict[str, ItemDemand], now: float) -> set[str]:
+        """Follow exactly the items in `demands`, returning the ones no longer followed."""
+        removed = self.items.keys() - demands.keys()
+        for item_id in removed:
+            del self.items[item_id]
+
+        for item_id, demand in demands.items():
+            if (item := self.items.get(item_id)) is None:
+                # New items are polled straight away
+                self.items[item_id] = ScheduledItem(item_id, demand, due=now, interval=self.max_interval)
+                heapq.heappush(self._heap, (now, item_id))
+            else:
+                item.demand = demand
+
+        self._reallocate()
+
+        return removed
+
+    def pop_due(self, now: float) -> list[ScheduledItem]:
+        due: list[ScheduledItem] = []
+
+        while self._heap and self._heap[0][0] <= now:
+            due_at, item_id = heapq.heappop(self._heap)
+
+            if not self._is_current(due_at, item_id):
+                continue
+
+            item = self.items[item_id]
+
+            POLL_LAG.observe(now - due_at)
+            # In flight until the poll is recorded
+            item.due = math.inf
+            due.append(item)
+
+        return due
+
+    def wait_time(self, now: float) -> float:
+        """Seconds until the next item is due."""
+        while self._heap and not self._is_current(*self._heap[0]):
+            heapq.heappop(self._heap)
+
+        if not self._heap:
+            return self.max_interval
+
+        return max(0.0, self._heap[0][0] - now)
+
+    def record_poll(self, item_id: str, best_sell: int | None, now: float) -> None:
+        if (item := self.items.get(item_id)) is None:
+            return
+
+        if item.best_sell and best_sell is not None:
+            change = abs(best_sell - item.best_sell) / item.best_sell
+            item.volatility = VOLATILITY_ALPHA * change + (1 - VOLATILITY_ALPHA) * item.volatility
+
+        item.best_sell = best_sell
+        item.polled_at = now
+        self._schedule(item, now + item.interval)
+
+    def postpone(self, item_id: str, now: float) -> None:
+        """Try again after the item's interval, keeping what's known about its price."""
+        if (item := self.items.get(item_id)) is not None:
+            self._schedule(item, now + item.interval)
+
+    def _reallocate(self) -> None:
+        intervals = allocate_intervals(
+            {item_id: item.score() for item_id, item in self.items.items()},
+            self.budget,
+            min_interval=self.min_interval,
+            max_interval=self.max_interval,
+        )
+
+        for item_id, interval in intervals.items():
+            item = self.items[item_id]
+            item.interval = interval
+
+            # Waiting items that now deserve a shorter interval are brought forward
+            if item.polled_at is not None and item.due != math.inf and item.polled_at + interval < item.due:
+                self._schedule(item, item.polled_at + interval)
+
+        SCHEDULED_RATE.set(sum(1 / interval for interval in intervals.values()))
+
+    def _schedule(self, item: ScheduledItem, due: float) -> None:
+        item.due = due
+        heapq.heappush(self._heap, (due, item.item_id))
+
+    def _is_current(self, due: float, item_id: str) -> bool:
+        return (item := self.items.get(item_id)) is not None and item.due == due
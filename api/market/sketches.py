@@ -0,0 +1,214 @@
+import math
+import struct
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Self
+
+import numpy as np
+import numpy.typing as npt
+
+type Floats = npt.NDArray[np.float64]
+type Weights = npt.NDArray[np.uint32]
+
+# Format version, compression, minimum, maximum and number of centroids
+HEADER = struct.Struct("<BHddI")
+FORMAT_VERSION = 1
+
+# Buckets of every width are aligned to this
+EPOCH = datetime(1970, 1, 1)  # noqa: DTZ001
+
+
+@dataclass(frozen=True, slots=True)
+class TDigest:
+    """
+    A merging t-digest, summarizing a stream of values to estimate its quantiles.
+
+    Values are grouped into centroids, each a mean and a count, and the centroids near either
+    end of the distribution are kept smaller than the ones in the middle, so extreme quantiles
+    stay accurate. There are at most around `compression / 2` centroids, whatever the count.
+
+    Digests merge into a digest of every value they were built from, so they can be kept
+    per time bucket and combined into any window afterwards.
+    """
+
+    compression: int
+    means: Floats
+    weights: Weights
+    minimum: float
+    maximum: float
+
+    @classmethod
+    def empty(cls, compression: int) -> Self:
+        return cls(
+            compression=compression,
+            means=np.empty(0, dtype=np.float64),
+            weights=np.empty(0, dtype=np.uint32),
+            minimum=math.inf,
+            maximum=-math.inf,
+        )
+
+    @classmethod
+    def of(cls, values: Iterable[float], compression: int) -> Self:
+        means = np.fromiter(values, dtype=np.float64)
+        if not len(means):
+            return cls.empty(compression)
+
+        return cls.compress(
+            means,
+            np.ones(len(means), dtype=np.uint32),
+            compression,
+            minimum=float(means.min()),
+            maximum=float(means.max()),
+        )
+
+    @classmethod
+    def merge(cls, digests: Sequence[Self], compression: int) -> Self:
+        if not digests:
+            return cls.empty(compression)
+
+        return cls.compress(
+            np.concatenate([digest.means for digest in digests]),
+            np.concatenate([digest.weights for digest in digests]),
+            compression,
+            minimum=min(digest.minimum for digest in digests),
+            maximum=max(digest.maximum for digest in digests),
+        )
+
+    @classmethod
+    def compress(
+        cls,
+        means: Floats,
+        weights: Weights,
+        compression: int,
+        *,
+        minimum: float,
+        maximum: float,
+    ) -> Self:
+        """
+        Merge neighbouring centroids while they fit in a unit of the scale function.
+
+        The scale function `k(q) = compression / 2π * asin(2q - 1)` is steep near the ends,
+        so centroids there only merge with few others. Centroids are grouped by the unit
+        their lower quantile falls in, which is the greedy merge done all at once.
+        """
+        if not len(means):
+            return cls.empty(compression)
+
+        order = np.argsort(means, kind="stable")
+        means, weights = means[order], weights[order]
+
+        cumulative = np.cumsum(weights, dtype=np.float64)
+        lower = (cumulative - weights) / cumulative[-1]
+        scale = compression / (2 * math.pi) * np.arcsin(2 * lower - 1)
+
+        _, group = np.unique(np.floor(scale), return_inverse=True)
+        merged_weights = np.bincount(group, weights=weights)
+        merged_means = np.bincount(group, weights=means * weights) / merged_weights
+
+        return cls(
+            compression=compression,
+            means=merged_means,
+            weights=merged_weights.astype(np.uint32),
+            minimum=minimum,
+            maximum=maximum,
+        )
+
+    def __len__(self) -> int:
+        return int(self.weights.sum())
+
+    def add(self, values: Iterable[float]) -> Self:
+        return self.merge([self, self.of(values, self.compression)], self.compression)
+
+    def mean(self) -> float:
+        return float(np.average(self.means, weights=self.weights)) if len(self.means) else math.nan
+
+    def quantiles(self, quantiles: Sequence[float]) -> list[float]:
+        """
+        Estimated values at each of `quantiles`, between 0 and 1.
+
+        A centroid's mean is taken to sit at the middle of its weight,
+        and values between centroids are interpolated linearly.
+        """
+        if not len(self.means):
+            return [math.nan] * len(quantiles)
+
+        total = float(self.weights.sum())
+        centers = np.cumsum(self.weights, dtype=np.float64) - self.weights / 2
+
+        estimates = np.interp(
+            np.asarray(quantiles, dtype=np.float64) * total,
+            np.concatenate(([0.0], centers, [total])),
+            np.concatenate(([self.minimum], self.means, [self.maximum])),
+        )
+
+        return estimates.tolist()
+
+    def to_bytes(self) -> bytes:
+        """Compact encoding, 8 bytes per centroid, trading the means' precision past 7 digits."""
+        header = HEADER.pack(FORMAT_VERSION, self.compression, self.minimum, self.maximum, len(self.means))
+
+        return header + self.means.astype("<f4").tobytes() + self.weights.astype("<u4").tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> Self:
+        version, compression, minimum, maximum, size = HEADER.unpack_from(data)
+        if version != FORMAT_VERSION:
+            msg = f"Unknown t-digest format version {version}"
+            raise ValueError(msg)
+
+        means = np.frombuffer(data, dtype="<f4", count=size, offset=HEADER.size)
+        weights = np.frombuffer(data, dtype="<u4", count=size, offset=HEADER.size + 4 * size)
+
+        return cls(
+            compression=compression,
+            means=means.astype(np.float64),
+            weights=weights.astype(np.uint32),
+            minimum=minimum,
+            maximum=maximum,
+        )
+
+
+def bucket_start(timestamp: datetime, width: timedelta) -> datetime:
+    return timestamp - (timestamp - EPOCH) % width
+
+
+def widen_window(since: datetime, until: datetime, width: timedelta) -> tuple[datetime, datetime]:
+    """Widen a window to whole buckets."""
+    end = bucket_start(until, width)
+
+    return bucket_start(since, width), end if end == until else end + width
+
+
+def cover_window(since: datetime, until: datetime, widths: Sequence[timedelta]) -> list[tuple[timedelta, datetime]]:
+    """
+    The fewest buckets covering `since` up to `until`, as `(width, start)` pairs.
+
+    `widths` go from narrowest to widest, each a multiple of the one before it. The window is
+    widened to the narrowest buckets, then covered with the widest buckets that fit in it,
+    leaving narrower ones for its edges. A year of hours and days takes at most 411 buckets.
+    """
+    since, until = widen_window(since, until, widths[0])
+
+    buckets: list[tuple[timedelta, datetime]] = []
+    ranges = [(since, until)]
+
+    for width in reversed(widths):
+        remaining: list[tuple[datetime, datetime]] = []
+
+        for start, end in ranges:
+            first = bucket_start(start, width)
+            if first < start:
+                first += width
+            last = bucket_start(end, width)
+
+            if first >= last:
+                remaining.append((start, end))
+                continue
+
+            buckets.extend((width, first + n * width) for n in range((last - first) // width))
+            remaining.extend(edge for edge in ((start, first), (last, end)) if edge[0] < edge[1])
+
+        ranges = remaining
+
+    return sorted(buckets, key=lambda bucket: bucket[1])
@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import tempfile
+from array import array
+from bisect import bisect_left
+from collections.abc import Buffer, Iterable
+from contextlib import suppress
+from itertools import batched
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from api.routers.schemas.items import WarframeItemRow
+
+MAGIC = b"ORDISCAT"
+# Bumped whenever the layout changes, snapshots written by other versions are rebuilt rather than read
+FORMAT = 1
+
+# Sorts after the UTF-8 of anything a key could continue with
+UTF8_KEY_END = "\U0010ffff".encode()
+
+# Fields of each item, stored one after the other
+ITEM_FIELDS = ("id", "thumb", "item_name", "url_name")
+
+# Blobs of UTF-8, and arrays of offsets into them, in the order they're laid out
+SECTIONS = (
+    "items",
+    "item_bounds",
+    "keys",
+    "key_bounds",
+    "key_ranks",
+    "wide",
+    "wide_bounds",
+    "wide_starts",
+    "wide_ranks",
+)
+
+# Magic, format, version, then the offset and size of every section
+HEADER = struct.Struct(f"<8sIQ{2 * len(SECTIONS)}I")
+
+
+def _strings(strings: Iterable[str]) -> tuple[bytes, array[int]]:
+    """Strings as one blob of UTF-8, and the offsets each one starts and the last one ends at."""
+    encoded = [string.encode() for string in strings]
+    bounds = array("I", [0])
+    for string in encoded:
+        bounds.append(bounds[-1] + len(string))
+
+    return b"".join(encoded), bounds
+
+
+def encode_snapshot(
+    items: list[WarframeItemRow],
+    keys: list[tuple[str, int]],
+    wide: dict[str, list[int]],
+    *,
+    version: int,
+) -> bytes:
+    """
+    A catalog snapshot, from items ordered by rank, sorted search keys with their ranks, and wide prefixes.
+
+    Arrays are in native byte order, snapshots are only ever read on the host that wrote them.
+    """
+    item_blob, item_bounds = _strings(item[field] for item in items for field in ITEM_FIELDS)
+    key_blob, key_bounds = _strings(key for key, _ in keys)
+    wide_prefixes = sorted(wide)
+    wide_blob, wide_bounds = _strings(wide_prefixes)
+
+    wide_ranks = array("I")
+    wide_starts = array("I", [0])
+    for prefix in wide_prefixes:
+        wide_ranks.extend(wide[prefix])
+        wide_starts.append(len(wide_ranks))
+
+    sections = [
+        item_blob,
+        item_bounds.tobytes(),
+        key_blob,
+        key_bounds.tobytes(),
+        array("I", [rank for _, rank in keys]).tobytes(),
+        wide_blob,
+        wide_bounds.tobytes(),
+        wide_starts.tobytes(),
+        wide_ranks.tobytes(),
+    ]
+
+    bounds: list[int] = []
+    body = bytearray()
+    for section in sections:
+        # Arrays are cast in place, so every section starts aligned for them
+        body.extend(bytes(-(HEADER.size + len(body)) % 4))
+        bounds.extend((HEADER.size + len(body), len(section)))
+        body.extend(section)
+
+    return HEADER.pack(MAGIC, FORMAT, version, *bounds) + body
+
+
+class CatalogSnapshot:
+    """
+    Read-only view of a catalog snapshot, without copying it.
+
+    Items are looked up by rank, and search keys by binary search over their UTF-8, which
+    sorts the same as the strings do. Backed by a memory map, every worker on the host
+    shares the same pages of the file.
+    """
+
+    def __init__(self, buffer: Buffer) -> None:
+        view = memoryview(buffer)
+        if len(view) < HEADER.size:
+            raise ValueError("Truncated catalog snapshot")
+
+        magic, version_format, self.version, *bounds = HEADER.unpack_from(view)
+        if magic != MAGIC or version_format != FORMAT:
+            raise ValueError(f"Not a catalog snapshot of format {FORMAT}")
+
+        (
+            self._items,
+            item_bounds,
+            self._keys,
+            key_bounds,
+            key_ranks,
+            self._wide,
+            wide_bounds,
+            wide_starts,
+            wide_ranks,
+        ) = (view[offset : offset + size] for offset, size in batched(bounds, 2))
+
+        self._item_bounds = item_bounds.cast("I")
+        self._key_bounds = key_bounds.cast("I")
+        self._key_ranks = key_ranks.cast("I")
+        self._wide_bounds = wide_bounds.cast("I")
+        self._wide_starts = wide_starts.cast("I")
+        self._wide_ranks = wide_ranks.cast("I")
+
+    def __len__(self) -> int:
+        return (len(self._item_bounds) - 1) // len(ITEM_FIELDS)
+
+    def item(self, rank: int) -> WarframeItemRow:
+        start = rank * len(ITEM_FIELDS)
+        bounds = self._item_bounds[start : start + len(ITEM_FIELDS) + 1]
+        item_id, thumb, item_name, url_name = (
+            str(self._items[bounds[field] : bounds[field + 1]], "utf-8") for field in range(len(ITEM_FIELDS))
+        )
+
+        return {"id": item_id, "thumb": thumb, "item_name": item_name, "url_name": url_name}
+
+    def _key(self, index: int) -> bytes:
+        return bytes(self._keys[self._key_bounds[index] : self._key_bounds[index + 1]])
+
+    def _wide_prefix(self, index: int) -> bytes:
+        return bytes(self._wide[self._wide_bounds[index] : self._wide_bounds[index + 1]])
+
+    def span(self, prefix: str) -> tuple[int, int]:
+        """Indexes of the first key starting with `prefix`, and of the first one after them."""
+        encoded = prefix.encode()
+        indexes = range(len(self._key_ranks))
+        start = bisect_left(indexes, encoded, key=self._key)
+
+        return start, bisect_left(indexes, encoded + UTF8_KEY_END, lo=start, key=self._key)
+
+    def ranks(self, start: int, end: int) -> memoryview:
+        """Ranks of the items of the keys between two indexes, with an item repeated for each of its keys."""
+        return self._key_ranks[start:end]
+
+    def wide(self, prefix: str) -> memoryview | None:
+        """Best ranks of a prefix matching too many keys to rank on the spot, or None for other prefixes."""
+        encoded = prefix.encode()
+        index = bisect_left(range(len(self._wide_starts) - 1), encoded, key=self._wide_prefix)
+        if index == len(self._wide_starts) - 1 or self._wide_prefix(index) != encoded:
+            return None
+
+        return self._wide_ranks[self._wide_starts[index] : self._wide_starts[index + 1]]
+
+
+def write_snapshot(path: Path, snapshot: bytes) -> None:
+    """Replace the snapshot at `path`, renaming it into place so readers only ever see a whole one."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    fd, temporary = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(snapshot)
+
+        os.replace(temporary, path)
+    except BaseException:
+        with suppress(FileNotFoundError):
+            os.unlink(temporary)
+        raise
+
+
+def map_snapshot(path: Path) -> tuple[CatalogSnapshot, os.stat_result]:
+    """The snapshot at `path`, memory mapped, and the stat of the file it was mapped from."""
+    with path.open("rb") as file:
+        stat = os.fstat(file.fileno())
+        # The map stays valid after the file is closed, and after it's replaced by a newer snapshot
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    return CatalogSnapshot(mapped), stat
@@ -0,0 +1,154 @@
+import asyncio
+import json
+import time
+from array import array
+from bisect import bisect_right
+from dataclasses import dataclass, replace
+from datetime import UTC, datetime
+
+from api.market.client import get_item_orders
+from api.market.order_book import BookOrder, OrderBook
+from api.market.rate import TokenBucket
+from api.settings import settings
+
+# Price levels kept in a summary, which has to fit in a Postgres notification
+MAX_SUMMARY_LEVELS = 200
+
+
+@dataclass(frozen=True, slots=True)
+class OrderBookSummary:
+    """
+    Snapshot of the top of an order book, detached from the live book.
+
+    Only the cheapest `MAX_SUMMARY_LEVELS` sell prices are kept, so quantities above them are undercounted.
+    """
+
+    item_id: str
+    sellers: tuple[BookOrder, ...]
+    buyers: tuple[BookOrder, ...]
+    sell_count: int
+    buy_count: int
+    sell_prices: array[int]
+    sell_cumulative: array[int]
+    updated_at: datetime
+
+    @classmethod
+    def from_book(cls, book: OrderBook, depth: int) -> "OrderBookSummary":
+        sell_prices, sell_cumulative = book.sell.levels()
+
+        return cls(
+            item_id=book.item_id,
+            # Copied, since orders in the book are updated in place
+            sellers=tuple(map(replace, book.sell.best(depth))),
+            buyers=tuple(map(replace, book.buy.best(depth))),
+            sell_count=len(book.sell),
+            buy_count=len(book.buy),
+            sell_prices=sell_prices[:MAX_SUMMARY_LEVELS],
+            sell_cumulative=sell_cumulative[:MAX_SUMMARY_LEVELS],
+            updated_at=datetime.now(tz=UTC),
+        )
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "item_id": self.item_id,
+                "sellers": [[o.id, o.platinum, o.quantity, o.user] for o in self.sellers],
+                "buyers": [[o.id, o.platinum, o.quantity, o.user] for o in self.buyers],
+                "sell_count": self.sell_count,
+                "buy_count": self.buy_count,
+                "sell_prices": self.sell_prices.tolist(),
+                "sell_cumulative": self.sell_cumulative.tolist(),
+                "updated_at": self.updated_at.isoformat(),
+            },
+            separators=(",", ":"),
+        )
+
+    @classmethod
+    def from_json(cls, raw: str) -> "OrderBookSummary":
+        data = json.loads(raw)
+
+        return cls(
+            item_id=data["item_id"],
+            sellers=tuple(BookOrder(*order) for order in data["sellers"]),
+            buyers=tuple(BookOrder(*order) for order in data["buyers"]),
+            sell_count=data["sell_count"],
+            buy_count=data["buy_count"],
+            sell_prices=array("l", data["sell_prices"]),
+            sell_cumulative=array("q", data["sell_cumulative"]),
+            updated_at=datetime.fromisoformat(data["updated_at"]),
+        )
+
+    @property
+    def spread(self) -> int | None:
+        if not self.sellers or not self.buyers:
+            return None
+
+        return self.sellers[0].platinum - self.buyers[0].platinum
+
+    def quantity_at_or_below(self, platinum: int) -> int:
+        index = bisect_right(self.sell_prices, platinum)
+
+        return self.sell_cumulative[index - 1] if index else 0
+
+
+class SummaryCache:
+    """
+    Latest summary of each followed item's order book.
+
+    Requesting an item's summary keeps it followed, and so refreshed in the background,
+    for `ttl` seconds after the last request.
+    """
+
+    def __init__(self, *, depth: int, ttl: float) -> None:
+        self.depth = depth
+        self.ttl = ttl
+
+        self._summaries: dict[str, OrderBookSummary] = {}
+        self._requested_at: dict[str, float] = {}
+        self._refreshing: dict[str, asyncio.Task[OrderBookSummary]] = {}
+
+    def get(self, item_id: str) -> OrderBookSummary | None:
+        self._requested_at[item_id] = time.monotonic()
+
+        return self._summaries.get(item_id)
+
+    def update(self, book: OrderBook) -> OrderBookSummary:
+        summary = OrderBookSummary.from_book(book, self.depth)
+        self.store(summary)
+
+        return summary
+
+    def store(self, summary: OrderBookSummary) -> None:
+        self._summaries[summary.item_id] = summary
+
+    def discard(self, item_id: str) -> None:
+        self._summaries.pop(item_id, None)
+
+    def requested_items(self) -> set[str]:
+        expired_before = time.monotonic() - self.ttl
+
+        for item_id, requested_at in list(self._requested_at.items()):
+            if requested_at < expired_before:
+                del self._requested_at[item_id]
+
+        return set(self._requested_at)
+
+    async def refresh(self, item_id: str, url_name: str) -> OrderBookSummary:
+        """Summarize a fresh fetch of the item's orders, sharing the fetch between concurrent callers."""
+        if (task := self._refreshing.get(item_id)) is None:
+            task = self._refreshing[item_id] = asyncio.create_task(self._refresh(item_id, url_name))
+            task.add_done_callback(lambda _: self._refreshing.pop(item_id, None))
+
+        return await asyncio.shield(task)
+
+    async def _refresh(self, item_id: str, url_name: str) -> OrderBookSummary:
+        book = OrderBook(item_id)
+        book.apply(await get_item_orders(url_name))
+
+        return self.update(book)
+
+
+summary_cache = SummaryCache(depth=settings.orders_summary_depth, ttl=settings.orders_summary_ttl)
+
+# Shared by every fetch the best orders endpoint makes on demand
+refresh_budget = TokenBucket(settings.orders_refresh_rate, settings.orders_refresh_burst)
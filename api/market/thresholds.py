@@ -0,0 +1,200 @@
+import sys
+import time
+import uuid
+from collections.abc import Iterable, Sequence
+from typing import Self
+
+import numpy as np
+import numpy.typing as npt
+from prometheus_client import Gauge
+
+from api.market.order_book import OrderBook
+
+THRESHOLD_INDEX_TRACKERS = Gauge(
+    "threshold_index_trackers",
+    "Gauge of trackers held in the in-memory threshold index.",
+    multiprocess_mode="livesum",
+)
+
+# Room for this many trackers is made for an item at first
+INITIAL_CAPACITY = 8
+
+# ID, user ID, platinum threshold and minimum quantity
+type TrackerThreshold = tuple[uuid.UUID, int, int, int]
+
+
+class ItemThresholds:
+    """
+    The trackers of one item, as contiguous arrays.
+
+    Arrays grow by doubling, and a removed tracker is replaced by the last one,
+    so both are amortized constant time and the live trackers always come first.
+    IDs are kept as the `UUID` objects themselves, so matches don't have to be converted back.
+    """
+
+    __slots__ = ("_ids", "_positions", "_quantities", "_size", "_thresholds", "_user_ids", "loaded_at")
+
+    def __init__(self, loaded_at: float, capacity: int = INITIAL_CAPACITY) -> None:
+        self.loaded_at = loaded_at
+
+        self._ids = np.empty(capacity, dtype=object)
+        self._user_ids = np.empty(capacity, dtype=np.int64)
+        self._thresholds = np.empty(capacity, dtype=np.int64)
+        self._quantities = np.empty(capacity, dtype=np.int64)
+        self._positions: dict[uuid.UUID, int] = {}
+        self._size = 0
+
+    @classmethod
+    def from_trackers(cls, trackers: Sequence[TrackerThreshold], loaded_at: float) -> Self:
+        """Build from distinct trackers, filling each array at once."""
+        item = cls(loaded_at, capacity=max(INITIAL_CAPACITY, len(trackers)))
+        if not trackers:
+            return item
+
+        ids, user_ids, thresholds, quantities = zip(*trackers, strict=True)
+        size = len(trackers)
+
+        item._ids[:size] = ids
+        item._user_ids[:size] = user_ids
+        item._thresholds[:size] = thresholds
+        item._quantities[:size] = quantities
+        item._positions = {tracker_id: position for position, tracker_id in enumerate(ids)}
+        item._size = size
+
+        return item
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, tracker_id: uuid.UUID) -> bool:
+        return tracker_id in self._positions
+
+    def add(self, tracker_id: uuid.UUID, user_id: int, platinum_threshold: int, minimum_quantity: int) -> None:
+        if tracker_id in self._positions:
+            return
+
+        if self._size == len(self._ids):
+            self._grow(2 * len(self._ids))
+
+        position = self._size
+        self._ids[position] = tracker_id
+        self._user_ids[position] = user_id
+        self._thresholds[position] = platinum_threshold
+        self._quantities[position] = minimum_quantity
+        self._positions[tracker_id] = position
+        self._size += 1
+
+    def remove(self, tracker_id: uuid.UUID) -> bool:
+        if (position := self._positions.pop(tracker_id, None)) is None:
+            return False
+
+        self._size -= 1
+        last = self._size
+
+        if position != last:
+            for array in (self._ids, self._user_ids, self._thresholds, self._quantities):
+                array[position] = array[last]
+
+            self._positions[self._ids[position]] = position
+
+        return True
+
+    def triggered(self, prices: npt.NDArray[np.int64], quantities: npt.NDArray[np.int64]) -> list[uuid.UUID]:
+        """
+        Trackers a side's quantity frontier satisfies, in one pass over every tracker.
+
+        The frontier's quantities increase strictly, so the first entry offering a tracker's minimum
+        quantity is found with a binary search, and it's the cheapest seller offering that much.
+        """
+        if not self._size or not len(prices):
+            return []
+
+        minimum_quantities = self._quantities[: self._size]
+        index = np.searchsorted(quantities, minimum_quantities)
+        offered = index < len(quantities)
+
+        best = prices[np.minimum(index, len(prices) - 1)]
+        matches = np.flatnonzero(offered & (best <= self._thresholds[: self._size]))
+
+        return self._ids[matches].tolist()
+
+    def user_ids(self) -> npt.NDArray[np.int64]:
+        return self._user_ids[: self._size]
+
+    def nbytes(self) -> int:
+        arrays = sum(array.nbytes for array in (self._ids, self._user_ids, self._thresholds, self._quantities))
+
+        # The IDs themselves are shared with whoever loaded them
+        return arrays + sys.getsizeof(self._positions)
+
+    def _grow(self, capacity: int) -> None:
+        for name in ("_ids", "_user_ids", "_thresholds", "_quantities"):
+            current: npt.NDArray[np.generic] = getattr(self, name)
+            grown = np.empty(capacity, dtype=current.dtype)
+            grown[: self._size] = current[: self._size]
+            setattr(self, name, grown)
+
+
+class ThresholdIndex:
+    """
+    Trackers by item, for evaluating order books without going through the database.
+
+    Items are loaded the first time they're evaluated. Trackers created through the DAO are
+    applied straight away, and deleted ones once their deletion commits. Trackers changed by
+    other workers are picked up when an item is reloaded, every `ttl` seconds.
+    """
+
+    def __init__(self, *, ttl: float) -> None:
+        self.ttl = ttl
+
+        self.items: dict[str, ItemThresholds] = {}
+
+    def __len__(self) -> int:
+        return sum(map(len, self.items.values()))
+
+    def is_stale(self, item_id: str) -> bool:
+        return (item := self.items.get(item_id)) is None or time.monotonic() - item.loaded_at >= self.ttl
+
+    def load(self, item_id: str, trackers: Sequence[TrackerThreshold]) -> ItemThresholds:
+        """Replace an item's trackers with the ones in the database."""
+        item = ItemThresholds.from_trackers(trackers, time.monotonic())
+
+        if (previous := self.items.get(item_id)) is not None:
+            THRESHOLD_INDEX_TRACKERS.dec(len(previous))
+
+        self.items[item_id] = item
+        THRESHOLD_INDEX_TRACKERS.inc(len(item))
+
+        return item
+
+    def add(self, item_id: str, tracker: TrackerThreshold) -> None:
+        # Items that aren't loaded get the tracker along with the rest when they are
+        if (item := self.items.get(item_id)) is not None and tracker[0] not in item:
+            item.add(*tracker)
+            THRESHOLD_INDEX_TRACKERS.inc()
+
+    def remove(self, trackers: Iterable[tuple[uuid.UUID, str]]) -> None:
+        """Remove trackers, given as `(tracker ID, item ID)` pairs."""
+        for tracker_id, item_id in trackers:
+            if (item := self.items.get(item_id)) is not None and item.remove(tracker_id):
+                THRESHOLD_INDEX_TRACKERS.dec()
+
+    def triggered(self, book: OrderBook) -> list[uuid.UUID]:
+        """Trackers on the book's item that a single seller in it satisfies."""
+        if (item := self.items.get(book.item_id)) is None:
+            return []
+
+        prices, quantities = book.sell.quantity_frontier()
+
+        return item.triggered(np.array(prices, dtype=np.int64), np.array(quantities, dtype=np.int64))
+
+    def discard(self, item_id: str) -> None:
+        if (item := self.items.pop(item_id, None)) is not None:
+            THRESHOLD_INDEX_TRACKERS.dec(len(item))
+
+    def clear(self) -> None:
+        self.items.clear()
+        THRESHOLD_INDEX_TRACKERS.set(0)
+
+    def nbytes(self) -> int:
+        return sum(item.nbytes() for item in self.items.values())
@@ -0,0 +1,218 @@
+import asyncio
+import fcntl
+import hashlib
+import os
+import tempfile
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager, suppress
+from dataclasses import dataclass
+from pathlib import Path
+
+from httpx import HTTPError
+from loguru import logger as log
+from prometheus_client import Counter
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from api.database.models.warframe.items import WarframeItemModel
+from api.market.client import warframe_market_static
+from api.settings import settings
+
+THUMBNAIL_LOOKUPS = Counter(
+    "thumbnail_lookups_total",
+    "Total count of thumbnail lookups by result.",
+    ["result"],
+)
+
+# Images are only marked as used again this often, rather than on every hit
+TOUCH_INTERVAL = 3600.0
+
+
+@dataclass(frozen=True, slots=True)
+class Thumbnail:
+    path: Path
+    # SHA-256 of the image, which is also its name
+    digest: str
+    stat: os.stat_result
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.digest}"'
+
+
+class ThumbnailCache:
+    """
+    Thumbnails kept on local disk, shared by every worker on the host.
+
+    Images are stored by the SHA-256 of their content under `blobs/`, and `refs/` maps each
+    upstream path, by its own hash, to the image. Files are written under a temporary name
+    and renamed into place, so a worker never sees one half written.
+
+    Images are evicted least recently used first once they take more than `max_bytes`,
+    and a ref left pointing at an evicted image is a miss like any other.
+    """
+
+    def __init__(self, directory: Path, *, max_bytes: int) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+        self._fetching: dict[str, asyncio.Future[Thumbnail]] = {}
+        # Bytes of images on disk, as far as this worker knows, counted on the first write
+        self._size: int | None = None
+
+    def _ref(self, thumb: str) -> Path:
+        return self.directory / "refs" / hashlib.sha256(thumb.encode()).hexdigest()
+
+    def _blob(self, digest: str) -> Path:
+        return self.directory / "blobs" / digest[:2] / digest
+
+    def lookup(self, thumb: str) -> Thumbnail | None:
+        """
+        The cached thumbnail for an upstream path, without opening the image.
+
+        This is two small reads of local metadata, cheaper done in place than handed to a thread.
+        """
+        try:
+            digest = self._ref(thumb).read_text()
+            path = self._blob(digest)
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+
+        if time.time() - stat.st_mtime > TOUCH_INTERVAL:
+            with suppress(FileNotFoundError):
+                os.utime(path)
+
+        return Thumbnail(path, digest, stat)
+
+    async def get(self, thumb: str) -> Thumbnail:
+        """The thumbnail for an upstream path, fetched if it isn't cached."""
+        if (thumbnail := self.lookup(thumb)) is not None:
+            THUMBNAIL_LOOKUPS.labels(result="hit").inc()
+            return thumbnail
+
+        THUMBNAIL_LOOKUPS.labels(result="miss").inc()
+
+        # Requests for the same thumbnail wait on a single fetch
+        if (fetching := self._fetching.get(thumb)) is None:
+            fetching = asyncio.ensure_future(self._fetch(thumb))
+            self._fetching[thumb] = fetching
+            fetching.add_done_callback(lambda _: self._fetching.pop(thumb, None))
+
+        return await asyncio.shield(fetching)
+
+    async def _fetch(self, thumb: str) -> Thumbnail:
+        for directory in ("refs", "blobs", "tmp"):
+            (self.directory / directory).mkdir(parents=True, exist_ok=True)
+
+        fd, temporary = tempfile.mkstemp(dir=self.directory / "tmp")
+        digest = hashlib.sha256()
+
+        try:
+            with os.fdopen(fd, "wb") as file:
+                async with warframe_market_static.stream("GET", thumb) as response:
+                    response.raise_for_status()
+
+                    async for chunk in response.aiter_bytes():
+                        digest.update(chunk)
+                        file.write(chunk)
+
+            thumbnail = self._store(temporary, thumb, digest.hexdigest())
+        except BaseException:
+            with suppress(FileNotFoundError):
+                os.unlink(temporary)
+            raise
+
+        if self._size is None or self._size + thumbnail.stat.st_size > self.max_bytes:
+            await asyncio.to_thread(self._evict)
+        else:
+            self._size += thumbnail.stat.st_size
+
+        return thumbnail
+
+    def _store(self, temporary: str, thumb: str, digest: str) -> Thumbnail:
+        path = self._blob(digest)
+        path.parent.mkdir(exist_ok=True)
+        os.replace(temporary, path)
+
+        fd, ref = tempfile.mkstemp(dir=self.directory / "tmp")
+        with os.fdopen(fd, "w") as file:
+            file.write(digest)
+        os.replace(ref, self._ref(thumb))
+
+        return Thumbnail(path, digest, path.stat())
+
+    def _evict(self) -> None:
+        """Remove the least recently used images until the rest fit in `max_bytes`."""
+        images: list[tuple[float, int, Path]] = []
+        for path in (self.directory / "blobs").glob("*/*"):
+            with suppress(FileNotFoundError):
+                stat = path.stat()
+                images.append((stat.st_mtime, stat.st_size, path))
+
+        size = sum(image_size for _, image_size, _ in images)
+        for _, image_size, path in sorted(images):
+            if size <= self.max_bytes:
+                break
+
+            path.unlink(missing_ok=True)
+            size -= image_size
+
+        self._size = size
+
+    @contextmanager
+    def exclusive(self, name: str) -> Iterator[bool]:
+        """Whether no other worker on the host holds the lock `name`, which is held until the context exits."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        # Closing the file releases the lock, as does the worker exiting
+        with (self.directory / f"{name}.lock").open("a") as file:
+            try:
+                fcntl.flock(file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                yield False
+            else:
+                yield True
+
+    async def prewarm(self, thumbs: Iterable[str], concurrency: int) -> int:
+        """Fetch every thumbnail that isn't cached, returning how many were."""
+        semaphore = asyncio.Semaphore(concurrency)
+        missing = [thumb for thumb in dict.fromkeys(thumbs) if self.lookup(thumb) is None]
+
+        async def fetch(thumb: str) -> bool:
+            async with semaphore:
+                try:
+                    await self.get(thumb)
+                except HTTPError as e:
+                    log.warning(f"Failed fetching thumbnail {thumb}: {e}")
+                    return False
+
+                return True
+
+        return sum(await asyncio.gather(*map(fetch, missing)))
+
+
+async def run_thumbnail_prewarm(session_factory: async_sessionmaker[AsyncSession], interval: float) -> None:
+    """
+    Keep every thumbnail of the catalog cached on this host, fetching the ones that aren't every `interval`.
+
+    Each host has a cache of its own, so each one prewarms it, including the thumbnails of items
+    that other hosts synced. Only one worker per host does so at a time.
+    """
+    while True:
+        try:
+            with thumbnail_cache.exclusive("prewarm") as exclusive:
+                if exclusive:
+                    async with session_factory() as session:
+                        thumbs = (await session.scalars(select(WarframeItemModel.thumb))).all()
+
+                    if fetched := await thumbnail_cache.prewarm(thumbs, settings.thumbnail_prewarm_concurrency):
+                        log.info(f"Prewarmed {fetched} thumbnails")
+        except Exception:
+            log.exception("Failed prewarming thumbnails")
+
+        await asyncio.sleep(interval)
+
+
+thumbnail_cache = ThumbnailCache(settings.thumbnail_cache_dir, max_bytes=settings.thumbnail_cache_max_bytes)
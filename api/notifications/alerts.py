@@ -0,0 +1,72 @@
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.database.crud.notifications import notification_outbox_dao
+from api.database.crud.tracking import order_tracking_dao
+from api.database.models.warframe.tracking import WarframeMarketOrderModel
+from api.events.alerts import publish_alert
+from api.market.order_book import OrderBook
+
+
+def alert_recipients(order: WarframeMarketOrderModel) -> list[int]:
+    """The tracker's owner followed by everyone else it notifies, without duplicates."""
+    return list(dict.fromkeys([order.user_id, *(user.id for user in order.notify_users)]))
+
+
+def order_alert_payload(order: WarframeMarketOrderModel, *, platinum: int, quantity: int) -> dict[str, Any]:
+    return {
+        "type": "order_alert",
+        "order_id": str(order.id),
+        "item_id": order.item_id,
+        "platinum_threshold": order.platinum_threshold,
+        "minimum_quantity": order.minimum_quantity,
+        "platinum": platinum,
+        "quantity": quantity,
+        "triggered_at": datetime.now(tz=UTC).isoformat(),
+    }
+
+
+async def trigger_order_alert(
+    session: AsyncSession,
+    *,
+    order: WarframeMarketOrderModel,
+    platinum: int,
+    quantity: int,
+) -> None:
+    """
+    Alert everyone following a tracker.
+
+    Webhook delivery goes through the outbox and streaming subscribers are notified through Postgres,
+    both of which only happen once the session's transaction commits.
+    """
+    recipients = alert_recipients(order)
+    payload = order_alert_payload(order, platinum=platinum, quantity=quantity)
+
+    await notification_outbox_dao.enqueue(session, recipients=recipients, payload=payload, order_id=order.id)
+    await publish_alert(session, recipients=recipients, payload=payload)
+
+
+async def evaluate_order_book(session: AsyncSession, book: OrderBook, *, cooldown: timedelta) -> int:
+    """
+    Alert every order on the item that the book's sellers satisfy, returning how many there were.
+
+    An order is satisfied by a single seller offering at least its minimum quantity at or below
+    its threshold. Orders are matched in memory by the threshold index, the database only
+    decides which of them are past their cooldown.
+    """
+    thresholds = order_tracking_dao.thresholds
+    if thresholds.is_stale(book.item_id):
+        thresholds.load(book.item_id, await order_tracking_dao.get_thresholds(session, item_id=book.item_id))
+
+    orders = await order_tracking_dao.claim_triggered(session, pk=thresholds.triggered(book), cooldown=cooldown)
+
+    for order in orders:
+        # Matched against this same book by the index, so there always is one
+        if (seller := book.sell.best_with_quantity(order.minimum_quantity)) is None:
+            continue
+
+        await trigger_order_alert(session, order=order, platinum=seller.platinum, quantity=seller.quantity)
+
+    return len(orders)
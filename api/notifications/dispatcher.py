@@ -0,0 +1,153 @@
+import asyncio
+from collections import defaultdict
+from collections.abc import Sequence
+from datetime import timedelta
+from itertools import batched
+
+from httpx import AsyncClient, HTTPError
+from loguru import logger as log
+from prometheus_client import Counter, Histogram
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from api.database.crud.notifications import notification_outbox_dao
+from api.database.models.notifications import NotificationOutboxModel
+from api.settings import settings
+
+NOTIFICATIONS = Counter(
+    "notifications_total",
+    "Total count of notifications handled by the dispatcher, by result.",
+    ["result"],
+)
+DISPATCH_BATCH_SIZE = Histogram(
+    "notification_dispatch_batch_size",
+    "Histogram of notifications claimed per dispatcher batch.",
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000),
+)
+
+
+class NotificationDispatcher:
+    """
+    Delivers notifications from the outbox.
+
+    Each batch is leased in one short transaction, and sent once it has ended, so no row locks or
+    connections are held while waiting on destinations. Notifications are grouped by destination
+    and split into requests of up to `chunk_size`, sent `concurrency` at a time. Another short
+    transaction marks them delivered, due again with a backoff, or failed after `max_attempts`.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        client: AsyncClient,
+        *,
+        batch_size: int,
+        chunk_size: int,
+        concurrency: int,
+        max_attempts: int,
+        lease: timedelta,
+        send_retries: int = 2,
+        backoff: timedelta = timedelta(seconds=5),
+        poll_interval: float = 1.0,
+    ) -> None:
+        self.session_factory = session_factory
+        self.client = client
+        self.batch_size = batch_size
+        self.chunk_size = chunk_size
+        self.max_attempts = max_attempts
+        self.lease = lease
+        self.send_retries = send_retries
+        self.backoff = backoff
+        self.poll_interval = poll_interval
+
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(self) -> None:
+        while True:
+            try:
+                claimed = await self.dispatch_once()
+            except Exception:
+                log.exception("Notification dispatch failed")
+                claimed = 0
+
+            # Keep draining while there is a backlog, otherwise wait for new rows
+            if claimed < self.batch_size:
+                await asyncio.sleep(self.poll_interval)
+
+    async def dispatch_once(self) -> int:
+        """Deliver one batch of due notifications, returning how many were claimed."""
+        async with self.session_factory() as session, session.begin():
+            rows = await notification_outbox_dao.claim_batch(session, limit=self.batch_size, lease=self.lease)
+
+        if not rows:
+            return 0
+
+        DISPATCH_BATCH_SIZE.observe(len(rows))
+
+        by_destination: defaultdict[str, list[NotificationOutboxModel]] = defaultdict(list)
+        for row in rows:
+            by_destination[row.destination].append(row)
+
+        requests = [
+            (destination, chunk)
+            for destination, group in by_destination.items()
+            for chunk in batched(group, self.chunk_size)
+        ]
+        results = await asyncio.gather(*(self._send(destination, chunk) for destination, chunk in requests))
+
+        delivered: list[int] = []
+        failed: list[int] = []
+        for sent, (_, chunk) in zip(results, requests, strict=True):
+            (delivered if sent else failed).extend(row.id for row in chunk)
+
+        dead = 0
+        async with self.session_factory() as session, session.begin():
+            if delivered:
+                await notification_outbox_dao.mark_delivered(session, pk=delivered)
+            if failed:
+                dead = await notification_outbox_dao.mark_failed(
+                    session,
+                    pk=failed,
+                    backoff=self.backoff,
+                    max_attempts=self.max_attempts,
+                )
+
+        NOTIFICATIONS.labels(result="delivered").inc(len(delivered))
+        NOTIFICATIONS.labels(result="failed").inc(len(failed) - dead)
+        NOTIFICATIONS.labels(result="dead").inc(dead)
+
+        return len(rows)
+
+    async def _send(self, destination: str, rows: Sequence[NotificationOutboxModel]) -> bool:
+        body = {"notifications": [row.payload for row in rows]}
+
+        async with self._semaphore:
+            for attempt in range(self.send_retries + 1):
+                try:
+                    response = await self.client.post(destination, json=body)
+                    response.raise_for_status()
+                except HTTPError as e:
+                    log.warning(f"Delivering {len(rows)} notifications failed (attempt {attempt + 1}): {e}")
+                else:
+                    return True
+
+                if attempt < self.send_retries:
+                    await asyncio.sleep(0.1 * 2**attempt)
+
+        return False
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+def create_dispatcher(session_factory: async_sessionmaker[AsyncSession]) -> NotificationDispatcher:
+    client = AsyncClient(timeout=settings.notification_timeout)
+
+    return NotificationDispatcher(
+        session_factory,
+        client,
+        batch_size=settings.notification_batch_size,
+        chunk_size=settings.notification_chunk_size,
+        concurrency=settings.notification_concurrency,
+        max_attempts=settings.notification_max_attempts,
+        lease=timedelta(seconds=settings.notification_lease),
+    )
@@ -1,4 +1,4 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException, Request, status
 
 router = APIRouter()
 
@@ -10,3 +10,14 @@ def health_check() -> None:
 
     It returns 200 if the project is healthy.
     """
+
+
+@router.get("/ready")
+def readiness_check(request: Request) -> None:
+    """
+    Checks if this worker has finished warming up.
+
+    It returns 503 until the worker is ready to take traffic, and again once it starts shutting down.
+    """
+    if not getattr(request.app.state, "ready", False):
+        raise HTTPException(status.HTTP_503_SERVICE_UNAVAILABLE, "Worker is not ready")
@@ -0,0 +1,60 @@
+from typing import Any, ClassVar
+
+from pydantic import TypeAdapter
+from starlette.responses import FileResponse, Response
+from starlette.types import Receive, Scope, Send
+
+from api.routers.schemas.items import WarframeItemBatchRows, WarframeItemRow, WarframeItemSearchRows
+
+
+class TypeAdapterJSONResponse(Response):
+    """
+    JSON response encoded by a precompiled pydantic serializer.
+
+    Returning one of these from a route skips FastAPI's `response_model` validation,
+    so it's only meant for data we already trust, such as rows from our own database.
+    The `response_model` on the route is still used for the OpenAPI schema.
+    """
+
+    media_type = "application/json"
+
+    adapter: ClassVar[TypeAdapter[Any]]
+
+    def render(self, content: Any) -> bytes:
+        return self.adapter.dump_json(content)
+
+
+class WarframeItemJSONResponse(TypeAdapterJSONResponse):
+    adapter = TypeAdapter(WarframeItemRow)
+
+
+class WarframeItemListJSONResponse(TypeAdapterJSONResponse):
+    adapter = TypeAdapter(list[WarframeItemRow])
+
+
+class WarframeItemBatchJSONResponse(TypeAdapterJSONResponse):
+    adapter = TypeAdapter(WarframeItemBatchRows)
+
+
+class WarframeItemSearchJSONResponse(TypeAdapterJSONResponse):
+    adapter = TypeAdapter(WarframeItemSearchRows)
+
+
+class PathSendFileResponse(FileResponse):
+    """
+    File response handing the server the file's path rather than its bytes, when it can send files itself.
+
+    Servers supporting the ASGI path send extension can `sendfile` it straight from the page cache,
+    otherwise the file is streamed in chunks as usual. The file's stat has to be given up front.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if "http.response.pathsend" not in scope.get("extensions", {}) or scope["method"] == "HEAD":
+            await super().__call__(scope, receive, send)
+            return
+
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        await send({"type": "http.response.pathsend", "path": str(self.path)})
+
+        if self.background is not None:
+            await self.background()
@@ -0,0 +1,30 @@
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+from api.routers.schemas.history import HistoryDatetime
+from api.routers.schemas.tracking import OrderCreate
+
+
+class BacktestRequest(BaseModel):
+    # Existing trackers, by ID
+    order_ids: list[UUID] = []
+    # Hypothetical trackers, which don't have to exist
+    orders: list[OrderCreate] = []
+
+    since: HistoryDatetime | None = None
+    until: HistoryDatetime | None = None
+
+    # Seconds a tracker stays quiet after alerting, the live cooldown when left out
+    cooldown: float | None = Field(default=None, ge=0)
+
+
+class BacktestResult(BaseModel):
+    order_id: UUID | None
+    item_id: str
+    platinum_threshold: int
+    minimum_quantity: int
+    triggers: int
+    # Earliest first, and cut off after a limit
+    triggered_at: list[datetime]
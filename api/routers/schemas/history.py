@@ -0,0 +1,38 @@
+from datetime import UTC, datetime, timedelta
+from typing import Annotated
+
+from pydantic import AfterValidator, BaseModel
+
+
+def naive_utc(value: datetime) -> datetime:
+    """A datetime as the naive UTC history is stored in, taking naive ones to be UTC already."""
+    if value.tzinfo is None:
+        return value
+
+    return value.astimezone(UTC).replace(tzinfo=None)
+
+
+# Bounds of windows over price history, with or without an offset
+HistoryDatetime = Annotated[datetime, AfterValidator(naive_utc)]
+
+
+class PriceSnapshotCreate(BaseModel):
+    item_id: str
+    best_sell: int | None
+    best_buy: int | None
+    sell_prices: list[int]
+    sell_quantities: list[int]
+
+
+class PriceSnapshotUpdate(BaseModel): ...
+
+
+class PriceSketchCreate(BaseModel):
+    item_id: str
+    width: timedelta
+    bucket: datetime
+    sell: bytes
+    buy: bytes
+
+
+class PriceSketchUpdate(BaseModel): ...
@@ -1,3 +1,6 @@
+from datetime import datetime
+from typing import TypedDict
+
 from pydantic import BaseModel
 
 
@@ -10,3 +13,50 @@ class WarframeItemResponse(BaseModel):
     thumb: str
     item_name: str
     url_name: str
+
+
+class WarframeItemDetailsResponse(BaseModel):
+    id: str
+    tags: list[str]
+    ducats: int | None
+    mastery_level: int | None
+    # ID of the set item, for items in a set
+    set_id: str | None
+    # Null until the details have been fetched
+    enriched_at: datetime | None
+
+
+class WarframeItemRow(TypedDict):
+    """Trusted row straight from the database, serialized without validation."""
+
+    id: str
+    thumb: str
+    item_name: str
+    url_name: str
+
+
+class ItemBatchRequest(BaseModel):
+    ids: list[str] = []
+    url_names: list[str] = []
+
+
+class ItemBatchResponse(BaseModel):
+    # In the same order as requested, with null for any that weren't found
+    ids: list[WarframeItemResponse | None]
+    url_names: list[WarframeItemResponse | None]
+
+
+class WarframeItemBatchRows(TypedDict):
+    ids: list[WarframeItemRow | None]
+    url_names: list[WarframeItemRow | None]
+
+
+class ItemSearchResponse(BaseModel):
+    items: list[WarframeItemResponse]
+    # Passed as `after` for the next page, null on the last one
+    next: str | None
+
+
+class WarframeItemSearchRows(TypedDict):
+    items: list[WarframeItemRow]
+    next: str | None
@@ -0,0 +1,15 @@
+from datetime import datetime
+from typing import Any
+
+from pydantic import BaseModel
+
+
+class JobCreate(BaseModel):
+    kind: str
+    key: str | None = None
+    payload: dict[str, Any] = {}
+    max_attempts: int
+    run_at: datetime | None = None
+
+
+class JobUpdate(BaseModel): ...
@@ -0,0 +1,14 @@
+from typing import Any
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class NotificationCreate(BaseModel):
+    destination: str
+    user_id: int
+    order_id: UUID | None = None
+    payload: dict[str, Any]
+
+
+class NotificationUpdate(BaseModel): ...
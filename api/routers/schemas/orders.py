@@ -0,0 +1,20 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class MarketOrderResponse(BaseModel):
+    user: str
+    platinum: int
+    quantity: int
+
+
+class BestOrdersResponse(BaseModel):
+    item_id: str
+    sellers: list[MarketOrderResponse]
+    buyers: list[MarketOrderResponse]
+    spread: int | None
+    # Quantity sellers offer at or below the requested threshold
+    volume_at_threshold: int | None
+    # When the order book was last fetched
+    updated_at: datetime
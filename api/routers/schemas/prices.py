@@ -0,0 +1,20 @@
+from pydantic import BaseModel
+
+
+class PriceSubscriptionRequest(BaseModel):
+    subscribe: list[str] = []
+    unsubscribe: list[str] = []
+
+
+class PriceSubscriptionError(BaseModel):
+    type: str = "error"
+    detail: str
+
+
+class ItemFollowersCreate(BaseModel):
+    worker: str
+    item_id: str
+    followers: int
+
+
+class ItemFollowersUpdate(BaseModel): ...
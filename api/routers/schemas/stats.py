@@ -0,0 +1,26 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class PriceQuantile(BaseModel):
+    quantile: float
+    platinum: float
+
+
+class PriceStats(BaseModel):
+    # Snapshots with a price on this side
+    count: int
+    minimum: int
+    maximum: int
+    mean: float
+    quantiles: list[PriceQuantile]
+
+
+class PriceStatsResponse(BaseModel):
+    item_id: str
+    # The window, widened to whole buckets
+    since: datetime
+    until: datetime
+    sell: PriceStats | None
+    buy: PriceStats | None
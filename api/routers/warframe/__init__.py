@@ -1,11 +1,13 @@
 from fastapi import APIRouter
 
 from .items import router as items_router
+from .prices import router as prices_router
 from .tracking import router as order_tracking_router
 
 router = APIRouter(prefix="/warframe")
 
 router.include_router(items_router, prefix="/items")
 router.include_router(order_tracking_router, prefix="/track")
+router.include_router(prices_router, prefix="/prices")
 
 __all__ = ("router",)
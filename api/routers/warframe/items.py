@@ -1,31 +1,111 @@
-from typing import Any
+import json
+import mimetypes
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import UTC, datetime, timedelta
+from math import ceil
+from typing import Annotated
 
-from fastapi import APIRouter, HTTPException, status
-from httpx import AsyncClient
-from sqlalchemy import func, or_, select
-from sqlalchemy.dialects.postgresql import insert
+from fastapi import APIRouter, Header, HTTPException, Query, Response, status
+from httpx import HTTPError
+from sqlalchemy import (
+    ARRAY,
+    REAL,
+    ColumnElement,
+    StatementLambdaElement,
+    Text,
+    and_,
+    any_,
+    bindparam,
+    cast,
+    func,
+    lambda_stmt,
+    literal,
+    literal_column,
+    or_,
+    select,
+    union_all,
+)
+from sqlalchemy.dialects.postgresql import REGCONFIG
 
+from api.database.crud.history import price_sketch_dao
 from api.database.dependencies import DBSession
-from api.database.models.warframe.items import WarframeItemModel
-from api.routers.schemas.items import ItemsSyncResponse, WarframeItemResponse
+from api.database.models.warframe.items import (
+    DEFAULT_LANGUAGE,
+    Language,
+    WarframeItemModel,
+    WarframeItemNameModel,
+)
+from api.market.autocomplete import MAX_COMPLETIONS, item_names, normalize
+from api.market.catalog import fetch_catalog, sync_catalog
+from api.market.sketches import TDigest, widen_window
+from api.market.summaries import refresh_budget, summary_cache
+from api.market.thumbnails import thumbnail_cache
+from api.routers.responses import (
+    PathSendFileResponse,
+    WarframeItemBatchJSONResponse,
+    WarframeItemJSONResponse,
+    WarframeItemListJSONResponse,
+    WarframeItemSearchJSONResponse,
+)
+from api.routers.schemas.history import HistoryDatetime
+from api.routers.schemas.items import (
+    ItemBatchRequest,
+    ItemBatchResponse,
+    ItemSearchResponse,
+    ItemsSyncResponse,
+    WarframeItemDetailsResponse,
+    WarframeItemResponse,
+    WarframeItemRow,
+)
+from api.routers.schemas.orders import BestOrdersResponse, MarketOrderResponse
+from api.routers.schemas.stats import PriceQuantile, PriceStats, PriceStatsResponse
+from api.settings import settings
 
 router = APIRouter()
 
-warframe_market_api = AsyncClient(
-    base_url="https://api.warframe.market/v1",
-    headers={"Language": "en"},
-    timeout=15.0,
+# Selecting plain columns skips ORM hydration and the eagerly joined orders,
+# the rows are then serialized as-is by the response class.
+# Hot queries are lambda statements, so the construct itself is cached along with its compiled form.
+ITEM_COLUMNS = (
+    WarframeItemModel.id,
+    WarframeItemModel.thumb,
+    WarframeItemModel.item_name,
+    WarframeItemModel.url_name,
+)
+# Names in another language, falling back to English for items without one
+LOCALIZED_ITEM_COLUMNS = (
+    WarframeItemModel.id,
+    WarframeItemModel.thumb,
+    func.coalesce(WarframeItemNameModel.item_name, WarframeItemModel.item_name).label("item_name"),
+    WarframeItemModel.url_name,
 )
 
+# Each list is bound as a single array parameter, so the statement is the same whatever their lengths
+ITEM_BATCH_STMT = select(*ITEM_COLUMNS).where(
+    or_(
+        WarframeItemModel.id == any_(bindparam("ids", type_=ARRAY(Text))),
+        WarframeItemModel.url_name == any_(bindparam("url_names", type_=ARRAY(Text))),
+    ),
+)
+
+# The same configuration as the search column, which doesn't stem or drop any words
+SEARCH_CONFIG = literal_column("'simple'", REGCONFIG)
 
-async def get_all_warframe_items() -> list[Any]:
-    r = await warframe_market_api.get("/items")
+MAX_SEARCH_TAGS = 20
+MAX_SEARCH_PAGE = 100
 
-    data = r.json()
 
-    items = data["payload"]["items"]
+def select_items(lang: Language) -> StatementLambdaElement:
+    """Item columns, with names in `lang` where they're known."""
+    if lang == DEFAULT_LANGUAGE:
+        return lambda_stmt(lambda: select(*ITEM_COLUMNS))
 
-    return items
+    return lambda_stmt(
+        lambda: select(*LOCALIZED_ITEM_COLUMNS).outerjoin(
+            WarframeItemNameModel,
+            and_(WarframeItemNameModel.item_id == WarframeItemModel.id, WarframeItemNameModel.language == lang),
+        ),
+    )
 
 
 @router.get(
@@ -37,87 +117,462 @@ async def get_all_warframe_items() -> list[Any]:
 async def sync_items(
     session: DBSession,
 ) -> ItemsSyncResponse:
-    items = await get_all_warframe_items()
+    catalog = await fetch_catalog(settings.catalog_languages)
 
-    result = await session.execute(
-        insert(WarframeItemModel).on_conflict_do_nothing(index_elements=["id"]).returning(WarframeItemModel),
-        items,
-    )
-    result.unique()
-
-    rows = result.all()
+    new = await sync_catalog(session, catalog)
 
-    return ItemsSyncResponse(new=len(rows))
+    return ItemsSyncResponse(new=new)
 
 
 @router.get(
     "/all",
     description="All the items that currently exist",
     response_model=list[WarframeItemResponse],
+    response_class=WarframeItemListJSONResponse,
     status_code=status.HTTP_200_OK,
 )
 async def get_all_items(
     session: DBSession,
     limit: int | None = None,
     offset: int | None = None,
-) -> list[WarframeItemModel]:
-    stmt = select(WarframeItemModel).limit(limit).offset(offset)
+    lang: Language = DEFAULT_LANGUAGE,
+) -> WarframeItemListJSONResponse:
+    stmt = select_items(lang)
+    if limit is not None:
+        stmt += lambda s: s.limit(limit)  # pyright: ignore[reportUnknownLambdaType]
+    if offset is not None:
+        stmt += lambda s: s.offset(offset)  # pyright: ignore[reportUnknownLambdaType]
 
     items = await session.execute(stmt)
-    items.unique()
 
-    return list(items.scalars().fetchall())
+    return WarframeItemListJSONResponse([dict(item) for item in items.mappings()])
 
 
 @router.get(
     "/find",
     description="Fuzzy find an item by name",
     response_model=WarframeItemResponse,
+    response_class=WarframeItemJSONResponse,
     status_code=status.HTTP_200_OK,
 )
 async def get_item_by_fuzzy(
     session: DBSession,
     search: str,
     threshold: float | None = 0.7,
-) -> WarframeItemModel:
-    stmt = select(WarframeItemModel).where(
-        or_(
-            func.similarity(WarframeItemModel.item_name, search) > threshold,
-            func.similarity(WarframeItemModel.url_name, search) > threshold,
-        ),
+    lang: Language = DEFAULT_LANGUAGE,
+) -> WarframeItemJSONResponse:
+    # The `%` operator matches at this similarity or above, pg_trgm's default when left out
+    if threshold is not None:
+        await session.execute(select(func.set_config("pg_trgm.similarity_threshold", str(threshold), True)))
+
+    # Names and URL names are matched apart, each through its own trigram index, and the most similar match wins
+    if lang == DEFAULT_LANGUAGE:
+        names = select(
+            WarframeItemModel.id,
+            func.similarity(WarframeItemModel.item_name, search).label("similarity"),
+        ).where(WarframeItemModel.item_name.op("%")(search))
+    else:
+        names = select(
+            WarframeItemNameModel.item_id.label("id"),
+            func.similarity(WarframeItemNameModel.item_name, search).label("similarity"),
+        ).where(
+            # Inlined rather than bound, so generic plans still go through the partial index of the language
+            WarframeItemNameModel.language == literal(lang, literal_execute=True),
+            WarframeItemNameModel.item_name.op("%")(search),
+        )
+    url_names = select(
+        WarframeItemModel.id,
+        func.similarity(WarframeItemModel.url_name, search),
+    ).where(WarframeItemModel.url_name.op("%")(search))
+    matches = union_all(names, url_names).subquery()
+
+    stmt = select(*(ITEM_COLUMNS if lang == DEFAULT_LANGUAGE else LOCALIZED_ITEM_COLUMNS)).join(
+        matches,
+        matches.c.id == WarframeItemModel.id,
     )
+    if lang != DEFAULT_LANGUAGE:
+        stmt = stmt.outerjoin(
+            WarframeItemNameModel,
+            and_(WarframeItemNameModel.item_id == WarframeItemModel.id, WarframeItemNameModel.language == lang),
+        )
 
-    items = await session.execute(stmt)
-    items.unique()
+    items = await session.execute(stmt.order_by(matches.c.similarity.desc()).limit(1))
 
-    if (item := items.scalar_one_or_none()) is None:
+    if (item := items.mappings().first()) is None:
         raise HTTPException(
             status.HTTP_404_NOT_FOUND,
             f"Item {search} could not be found",
         )
 
-    return item
+    return WarframeItemJSONResponse(dict(item))
+
+
+@router.get(
+    "/autocomplete",
+    description="The most tracked items with a word of their name or URL name starting with a prefix",
+    response_model=list[WarframeItemResponse],
+    response_class=WarframeItemListJSONResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def autocomplete_items(
+    session: DBSession,
+    prefix: str = "",
+    limit: Annotated[int, Query(ge=1, le=MAX_COMPLETIONS)] = MAX_COMPLETIONS,
+) -> WarframeItemListJSONResponse:
+    if len(item_names):
+        return WarframeItemListJSONResponse(item_names.complete(prefix, limit))
+
+    # Until the index is built, names are matched from their start, through the prefix indexes
+    normalized = normalize(prefix)
+    stmt = (
+        select(*ITEM_COLUMNS)
+        .where(
+            or_(
+                func.lower(WarframeItemModel.item_name).startswith(normalized, autoescape=True),
+                WarframeItemModel.url_name.startswith(normalized.replace(" ", "_"), autoescape=True),
+            ),
+        )
+        .order_by(WarframeItemModel.item_name)
+        .limit(limit)
+    )
+
+    items = await session.execute(stmt)
+
+    return WarframeItemListJSONResponse([dict(item) for item in items.mappings()])
+
+
+def encode_cursor(rank: float, item_id: str) -> str:
+    return urlsafe_b64encode(json.dumps([rank, item_id]).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[float, str]:
+    try:
+        rank, item_id = json.loads(urlsafe_b64decode(cursor))
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status.HTTP_400_BAD_REQUEST,
+            "The cursor is invalid",
+        ) from None
+
+    return float(rank), str(item_id)
+
+
+@router.get(
+    "/search",
+    description=(
+        "Items with every word of a search in their name and every one of the tags, best matches first. "
+        "Pages continue from the `next` cursor of the one before"
+    ),
+    response_model=ItemSearchResponse,
+    response_class=WarframeItemSearchJSONResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def search_items(
+    session: DBSession,
+    q: str | None = None,
+    tags: Annotated[list[str], Query(max_length=MAX_SEARCH_TAGS)] = [],  # noqa: B006
+    limit: Annotated[int, Query(ge=1, le=MAX_SEARCH_PAGE)] = 25,
+    after: str | None = None,
+) -> WarframeItemSearchJSONResponse:
+    if not q and not tags:
+        raise HTTPException(
+            status.HTTP_400_BAD_REQUEST,
+            "Searching takes words, tags or both",
+        )
+
+    stmt = select(*ITEM_COLUMNS)
+    rank: ColumnElement[float] = cast(0, REAL)
+
+    # Both are matched in the same index
+    if q:
+        query = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+        rank = func.ts_rank(WarframeItemModel.search, query)
+        stmt = stmt.where(WarframeItemModel.search.op("@@")(query))
+    if tags:
+        stmt = stmt.where(WarframeItemModel.tags.contains(tags))
+
+    stmt = stmt.add_columns(rank)
+    if after is not None:
+        after_rank, after_id = decode_cursor(after)
+        # Ranks are single precision, and compared as such
+        previous: ColumnElement[float] = cast(after_rank, REAL)
+        stmt = stmt.where(or_(rank < previous, and_(rank == previous, WarframeItemModel.id > after_id)))
+
+    # One more than the page, to tell whether there's another
+    items = await session.execute(stmt.order_by(rank.desc(), WarframeItemModel.id).limit(limit + 1))
+    rows = items.tuples().all()
+
+    page = [
+        WarframeItemRow(id=item_id, thumb=thumb, item_name=item_name, url_name=url_name)
+        for item_id, thumb, item_name, url_name, _ in rows[:limit]
+    ]
+    next_cursor = encode_cursor(rows[limit - 1][4], rows[limit - 1][0]) if len(rows) > limit else None
+
+    return WarframeItemSearchJSONResponse({"items": page, "next": next_cursor})
+
+
+@router.post(
+    "/batch",
+    description="Resolve many items at once by ID and URL name, null marking the ones that weren't found",
+    response_model=ItemBatchResponse,
+    response_class=WarframeItemBatchJSONResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def get_items_batch(
+    session: DBSession,
+    request: ItemBatchRequest,
+) -> WarframeItemBatchJSONResponse:
+    if len(request.ids) + len(request.url_names) > settings.items_batch_max:
+        raise HTTPException(
+            status.HTTP_400_BAD_REQUEST,
+            f"At most {settings.items_batch_max} items can be looked up at once",
+        )
+
+    items = await session.execute(
+        ITEM_BATCH_STMT,
+        # Duplicates are dropped, so each item is only sent over once
+        {"ids": list(dict.fromkeys(request.ids)), "url_names": list(dict.fromkeys(request.url_names))},
+    )
+
+    by_id: dict[str, WarframeItemRow] = {}
+    by_url_name: dict[str, WarframeItemRow] = {}
+    for item_id, thumb, item_name, url_name in items.tuples():
+        row = WarframeItemRow(id=item_id, thumb=thumb, item_name=item_name, url_name=url_name)
+        by_id[row["id"]] = by_url_name[row["url_name"]] = row
+
+    return WarframeItemBatchJSONResponse(
+        {
+            "ids": [by_id.get(item_id) for item_id in request.ids],
+            "url_names": [by_url_name.get(url_name) for url_name in request.url_names],
+        },
+    )
+
+
+@router.get(
+    "/{item_id}/orders/best",
+    description=(
+        "Cheapest sellers and highest buyers of an item from its latest order book. "
+        "Forcing a refresh, or asking for an item nobody follows yet, fetches the order book within a rate budget"
+    ),
+    response_model=BestOrdersResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def get_best_orders(
+    session: DBSession,
+    item_id: str,
+    limit: Annotated[int, Query(ge=1, le=settings.orders_summary_depth)] = 5,
+    threshold: int | None = None,
+    force: bool = False,
+) -> BestOrdersResponse:
+    summary = summary_cache.get(item_id)
+
+    if summary is None or force:
+        url_name = await session.scalar(select(WarframeItemModel.url_name).where(WarframeItemModel.id == item_id))
+
+        if url_name is None:
+            raise HTTPException(
+                status.HTTP_404_NOT_FOUND,
+                f"Item with ID {item_id} could not be found",
+            )
+
+        if not refresh_budget.try_acquire():
+            raise HTTPException(
+                status.HTTP_429_TOO_MANY_REQUESTS,
+                "Order books are being refreshed too often, try again later",
+                headers={"Retry-After": str(ceil(refresh_budget.retry_after()))},
+            )
+
+        try:
+            summary = await summary_cache.refresh(item_id, url_name)
+        except HTTPError:
+            raise HTTPException(
+                status.HTTP_502_BAD_GATEWAY,
+                f"Orders for item with ID {item_id} could not be fetched",
+            ) from None
+
+    return BestOrdersResponse(
+        item_id=item_id,
+        sellers=[
+            MarketOrderResponse(user=order.user, platinum=order.platinum, quantity=order.quantity)
+            for order in summary.sellers[:limit]
+        ],
+        buyers=[
+            MarketOrderResponse(user=order.user, platinum=order.platinum, quantity=order.quantity)
+            for order in summary.buyers[:limit]
+        ],
+        spread=summary.spread,
+        volume_at_threshold=None if threshold is None else summary.quantity_at_or_below(threshold),
+        updated_at=summary.updated_at,
+    )
+
+
+def price_stats(digest: TDigest, quantiles: list[float]) -> PriceStats | None:
+    if not len(digest):
+        return None
+
+    return PriceStats(
+        count=len(digest),
+        minimum=int(digest.minimum),
+        maximum=int(digest.maximum),
+        mean=digest.mean(),
+        quantiles=[
+            PriceQuantile(quantile=quantile, platinum=platinum)
+            for quantile, platinum in zip(quantiles, digest.quantiles(quantiles), strict=True)
+        ],
+    )
+
+
+@router.get(
+    "/{item_id}/details",
+    description="Tags, ducats, mastery rank and set of an item, fetched after it's synced",
+    response_model=WarframeItemDetailsResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def get_item_details(
+    session: DBSession,
+    item_id: str,
+) -> WarframeItemDetailsResponse:
+    stmt = select(
+        WarframeItemModel.id,
+        WarframeItemModel.tags,
+        WarframeItemModel.ducats,
+        WarframeItemModel.mastery_level,
+        WarframeItemModel.set_id,
+        WarframeItemModel.enriched_at,
+    ).where(WarframeItemModel.id == item_id)
+
+    if (details := (await session.execute(stmt)).mappings().one_or_none()) is None:
+        raise HTTPException(
+            status.HTTP_404_NOT_FOUND,
+            f"Item with ID {item_id} could not be found",
+        )
+
+    return WarframeItemDetailsResponse.model_validate(dict(details))
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Whether an `If-None-Match` header matches, compared weakly as it's meant to be."""
+    if if_none_match.strip() == "*":
+        return True
+
+    return etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+
+
+@router.get(
+    "/{item_id}/thumb",
+    description="An item's thumbnail, proxied from warframe.market and cached",
+    response_class=PathSendFileResponse,
+    responses={
+        status.HTTP_200_OK: {"content": {"image/png": {}}},
+        status.HTTP_304_NOT_MODIFIED: {"description": "The thumbnail hasn't changed"},
+    },
+    status_code=status.HTTP_200_OK,
+)
+async def get_item_thumb(
+    session: DBSession,
+    item_id: str,
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> Response:
+    stmt = lambda_stmt(lambda: select(WarframeItemModel.thumb).where(WarframeItemModel.id == item_id))
+
+    if (thumb := await session.scalar(stmt)) is None:
+        raise HTTPException(
+            status.HTTP_404_NOT_FOUND,
+            f"Item with ID {item_id} could not be found",
+        )
+
+    try:
+        thumbnail = await thumbnail_cache.get(thumb)
+    except HTTPError:
+        raise HTTPException(
+            status.HTTP_502_BAD_GATEWAY,
+            f"Thumbnail for item with ID {item_id} could not be fetched",
+        ) from None
+
+    # The same path may get a new image when the item changes, so clients revalidate now and then
+    headers = {"ETag": thumbnail.etag, "Cache-Control": f"public, max-age={settings.thumbnail_max_age}"}
+
+    if if_none_match is not None and etag_matches(if_none_match, thumbnail.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return PathSendFileResponse(
+        thumbnail.path,
+        headers=headers,
+        media_type=mimetypes.guess_type(thumb)[0] or "application/octet-stream",
+        stat_result=thumbnail.stat,
+    )
+
+
+@router.get(
+    "/{item_id}/stats",
+    description=(
+        "Estimated quantiles of an item's best sell and buy prices over a window, the last day by default. "
+        "The window is widened to whole buckets of price history"
+    ),
+    response_model=PriceStatsResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def get_item_stats(
+    session: DBSession,
+    item_id: str,
+    since: HistoryDatetime | None = None,
+    until: HistoryDatetime | None = None,
+    quantiles: Annotated[list[Annotated[float, Query(ge=0, le=1)]], Query(max_length=20)] = [0.1, 0.5, 0.9],  # noqa: B006
+) -> PriceStatsResponse:
+    until = until or datetime.now(tz=UTC).replace(tzinfo=None)
+    since = since or until - timedelta(seconds=settings.price_stats_window)
+
+    if since >= until:
+        raise HTTPException(
+            status.HTTP_400_BAD_REQUEST,
+            "The window has to start before it ends",
+        )
+
+    if until - since > timedelta(seconds=settings.price_stats_max_window):
+        raise HTTPException(
+            status.HTTP_400_BAD_REQUEST,
+            f"The window can span at most {settings.price_stats_max_window} seconds",
+        )
+
+    if await session.scalar(select(WarframeItemModel.id).where(WarframeItemModel.id == item_id)) is None:
+        raise HTTPException(
+            status.HTTP_404_NOT_FOUND,
+            f"Item with ID {item_id} could not be found",
+        )
+
+    sell, buy = await price_sketch_dao.merge_window(session, item_id=item_id, since=since, until=until)
+    since, until = widen_window(since, until, price_sketch_dao.widths[0])
+
+    return PriceStatsResponse(
+        item_id=item_id,
+        since=since,
+        until=until,
+        sell=price_stats(sell, quantiles),
+        buy=price_stats(buy, quantiles),
+    )
 
 
 @router.get(
     "/{item_id}",
     description="Get a specific warframe item",
     response_model=WarframeItemResponse,
+    response_class=WarframeItemJSONResponse,
     status_code=status.HTTP_200_OK,
 )
 async def get_item(
     session: DBSession,
     item_id: str,
-) -> WarframeItemModel:
-    stmt = select(WarframeItemModel).where(WarframeItemModel.id == item_id)
+    lang: Language = DEFAULT_LANGUAGE,
+) -> WarframeItemJSONResponse:
+    stmt = select_items(lang)
+    stmt += lambda s: s.where(WarframeItemModel.id == item_id)  # pyright: ignore[reportUnknownLambdaType]
 
     items = await session.execute(stmt)
-    items.unique()
 
-    if (item := items.scalar_one_or_none()) is None:
+    if (item := items.mappings().one_or_none()) is None:
         raise HTTPException(
             status.HTTP_404_NOT_FOUND,
             f"Item with ID {item_id} could not be found",
         )
 
-    return item
+    return WarframeItemJSONResponse(dict(item))
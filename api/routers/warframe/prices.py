@@ -0,0 +1,72 @@
+import asyncio
+from contextlib import suppress
+
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, status
+from pydantic import ValidationError
+
+from api.events.broker import Subscription
+from api.events.prices import item_topic, latest_prices, price_broker
+from api.routers.schemas.prices import PriceSubscriptionError, PriceSubscriptionRequest
+from api.settings import settings
+
+router = APIRouter()
+
+
+def _error(detail: str) -> str:
+    return PriceSubscriptionError(detail=detail).model_dump_json()
+
+
+async def _read_requests(websocket: WebSocket, subscription: Subscription) -> None:
+    with suppress(WebSocketDisconnect):
+        while True:
+            try:
+                request = PriceSubscriptionRequest.model_validate_json(await websocket.receive_text())
+            except ValidationError:
+                subscription.put(_error("Expected {'subscribe': [...], 'unsubscribe': [...]}"))
+                continue
+
+            price_broker.remove_topics(subscription, *map(item_topic, request.unsubscribe))
+
+            added = [
+                item_id
+                for item_id in dict.fromkeys(request.subscribe)
+                if item_topic(item_id) not in subscription.topics
+            ]
+            if len(subscription.topics) + len(added) > settings.prices_max_subscriptions:
+                subscription.put(_error(f"At most {settings.prices_max_subscriptions} items can be subscribed to"))
+                continue
+
+            price_broker.add_topics(subscription, *map(item_topic, added))
+
+            # Queued like any other message, so the writer stays the only one sending
+            for item_id in added:
+                if (message := latest_prices.get(item_id)) is not None:
+                    subscription.put(message)
+
+
+async def _write_messages(websocket: WebSocket, subscription: Subscription) -> None:
+    async for message in subscription:
+        await websocket.send_text(message)
+
+
+@router.websocket("/live")
+async def live_prices(websocket: WebSocket) -> None:
+    """
+    Live prices of the items a client subscribes to.
+
+    Clients send `{"subscribe": [item IDs], "unsubscribe": [item IDs]}` at any point, and receive
+    the latest prices of newly subscribed items followed by every change. Clients that fall behind
+    are disconnected with code 1013, and should reconnect.
+    """
+    await websocket.accept()
+
+    async with price_broker.subscribe() as subscription:
+        reader = asyncio.create_task(_read_requests(websocket, subscription))
+        writer = asyncio.create_task(_write_messages(websocket, subscription))
+
+        done, pending = await asyncio.wait((reader, writer), return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
+
+        if writer in done and writer.exception() is None:
+            await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
@@ -1,9 +1,18 @@
-from fastapi import APIRouter, HTTPException, status
+from datetime import timedelta
+from secrets import compare_digest
+from typing import Annotated
+
+from fastapi import APIRouter, Header, HTTPException, status
+from fastapi.responses import StreamingResponse
 
 from api.database.crud.tracking import order_tracking_dao
 from api.database.dependencies import DBSession
 from api.database.models.warframe.tracking import WarframeMarketOrderModel
+from api.events.alerts import ALL_ALERTS, alert_stream, user_topic
+from api.market.backtest import Tracker, backtest
+from api.routers.schemas.backtest import BacktestRequest, BacktestResult
 from api.routers.schemas.tracking import Order, OrderCreate
+from api.settings import settings
 
 router = APIRouter()
 
@@ -27,6 +36,93 @@ async def create_order_tracker(
     return await order_tracking_dao.create(session, obj=track_new_order)
 
 
+@router.get(
+    "/alerts/stream",
+    description="Stream a user's alerts as server-sent events, or every user's alerts with the bot token",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def stream_alerts(
+    user_id: int | None = None,
+    x_bot_token: Annotated[str | None, Header()] = None,
+) -> StreamingResponse:
+    if user_id is not None:
+        topic = user_topic(user_id)
+    elif (
+        settings.alerts_bot_token is not None
+        and x_bot_token is not None
+        and compare_digest(x_bot_token, settings.alerts_bot_token)
+    ):
+        topic = ALL_ALERTS
+    else:
+        raise HTTPException(
+            status.HTTP_401_UNAUTHORIZED,
+            "Streaming every user's alerts requires a valid bot token",
+        )
+
+    return StreamingResponse(
+        alert_stream(topic),
+        media_type="text/event-stream",
+        # Stop proxies from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post(
+    "/backtest",
+    description="Replay the recorded price history against existing or hypothetical trackers",
+    response_model=list[BacktestResult],
+    status_code=status.HTTP_200_OK,
+)
+async def backtest_trackers(session: DBSession, request: BacktestRequest) -> list[BacktestResult]:
+    if len(request.order_ids) + len(request.orders) > settings.backtest_max_trackers:
+        raise HTTPException(
+            status.HTTP_400_BAD_REQUEST,
+            f"At most {settings.backtest_max_trackers} trackers can be backtested at once",
+        )
+
+    existing = {
+        order.id: order
+        for order in await order_tracking_dao.select_(
+            session, filters=WarframeMarketOrderModel.id.in_(request.order_ids)
+        )
+    }
+    if missing := [str(order_id) for order_id in request.order_ids if order_id not in existing]:
+        raise HTTPException(
+            status.HTTP_404_NOT_FOUND,
+            f"Trackers not found: {", ".join(missing)}",
+        )
+
+    trackers = [
+        Tracker(order.item_id, order.platinum_threshold, order.minimum_quantity)
+        for order in (*(existing[order_id] for order_id in request.order_ids), *request.orders)
+    ]
+    alerts = await backtest(
+        session,
+        trackers,
+        cooldown=timedelta(seconds=settings.alert_cooldown if request.cooldown is None else request.cooldown),
+        since=request.since,
+        until=request.until,
+    )
+
+    return [
+        BacktestResult(
+            order_id=order_id,
+            item_id=tracker.item_id,
+            platinum_threshold=tracker.platinum_threshold,
+            minimum_quantity=tracker.minimum_quantity,
+            triggers=len(tracker_alerts),
+            triggered_at=tracker_alerts[: settings.backtest_max_timestamps].tolist(),
+        )
+        for order_id, tracker, tracker_alerts in zip(
+            [*request.order_ids, *([None] * len(request.orders))],
+            trackers,
+            alerts,
+            strict=True,
+        )
+    ]
+
+
 # @router.get(
 #     "/track/buyers",
 #     description="Track the warframe market for an item being bought between thresholds",
@@ -38,6 +38,130 @@ class Settings(BaseSettings):
     db_pass: str = "ordis"
     db_base: str = "ordis"
     db_echo: bool = False
+    # Compiled statements kept by SQLAlchemy, shared by all connections
+    db_query_cache_size: int = 1200
+    # Prepared statements kept per connection by the asyncpg dialect
+    db_prepared_statement_cache_size: int = 500
+    # Disables prepared statement caching and pooling, for transaction-mode pgbouncer
+    db_pgbouncer: bool = False
+    # Postgres itself, or a session-mode pool, for connections keeping state across transactions:
+    # LISTEN, and the price scheduler's lock. Set them when the host and port above are pgbouncer's
+    db_session_host: str | None = None
+    db_session_port: int | None = None
+
+    # Pool connections each worker opens before reporting ready
+    warmup_connections: int = 5
+
+    # Webhook that receives triggered alerts, the dispatcher only runs if this is set
+    notification_webhook_url: str | None = None
+    notification_batch_size: int = 100
+    # Notifications sent to a destination in one request, and requests sent at once
+    notification_chunk_size: int = 20
+    notification_concurrency: int = 10
+    notification_max_attempts: int = 5
+    notification_timeout: float = 10.0
+    # Seconds claimed notifications are left to their dispatcher, longer than sending them can take
+    notification_lease: float = 120.0
+    # Seconds before an order that alerted can alert again
+    alert_cooldown: float = 3600.0
+
+    # Server-sent alert streams
+    alerts_bot_token: str | None = None
+    alerts_stream_queue_size: int = 64
+    alerts_stream_heartbeat: float = 15.0
+    alerts_stream_retry_ms: int = 3000
+
+    # Live price subscriptions, items are polled while anyone subscribes to or tracks them
+    # Upstream polls per second, by every worker together, split between items by demand
+    prices_poll_rps: float = 3.0
+    prices_poll_min_interval: float = 5.0
+    prices_poll_max_interval: float = 300.0
+    # Seconds between refreshes of which items are followed and how much
+    prices_demand_interval: float = 30.0
+    prices_stream_queue_size: int = 16
+    prices_max_subscriptions: int = 50
+
+    # Seconds between rebuilds of the catalog snapshot autocomplete is served from, which also happen after
+    # each catalog sync, by whichever worker runs the job
+    autocomplete_refresh_interval: float = 300.0
+    # Every worker on the host maps the same snapshot, checking this often whether it was replaced
+    catalog_snapshot_path: Path = TEMP_DIR / "catalog.snapshot"
+    catalog_snapshot_poll_interval: float = 5.0
+
+    # Items resolved by a single batch lookup, IDs and URL names together
+    items_batch_max: int = 1000
+
+    # Upstream API responses cached on disk with their validators, for every worker on the host
+    http_cache_dir: Path = TEMP_DIR / "http-cache"
+    http_cache_max_bytes: int = 512 * 2**20
+    # Seconds after its last validation a cached response may still be served when upstream fails
+    http_cache_stale_if_error: float = 6 * 3600.0
+
+    # Thumbnails proxied from warframe.market, cached on disk for every worker on the host
+    thumbnail_cache_dir: Path = TEMP_DIR / "thumbnails"
+    thumbnail_cache_max_bytes: int = 256 * 2**20
+    # Seconds clients may reuse a thumbnail before revalidating it
+    thumbnail_max_age: int = 7 * 86400
+    # Fetch every thumbnail of the catalog that isn't cached on the host, checking this often
+    thumbnail_prewarm: bool = False
+    thumbnail_prewarm_interval: float = 600.0
+    thumbnail_prewarm_concurrency: int = 8
+
+    # Best orders summaries, requested items stay polled for `orders_summary_ttl` seconds
+    orders_summary_depth: int = 10
+    orders_summary_ttl: float = 600.0
+    # Upstream fetches per second the best orders endpoint may make, per worker
+    orders_refresh_rate: float = 1.0
+    orders_refresh_burst: int = 5
+
+    # Seconds before an item's trackers are reloaded into the threshold index, to pick up other workers' changes
+    threshold_index_ttl: float = 60.0
+
+    # Replaying price history against trackers
+    backtest_max_trackers: int = 10_000
+    # Alert times listed per tracker, the count covers all of them
+    backtest_max_timestamps: int = 100
+
+    # Price statistics, from t-digests of the best prices kept per bucket of each width in seconds
+    # Each width has to be a multiple of the one before it
+    price_sketch_widths: list[int] = [3600, 86400]
+    price_sketch_compression: int = 100
+    # Seconds of history the statistics cover when no window is given
+    price_stats_window: int = 86400
+    # Longest window in seconds the statistics can be asked for, merging costs grow with it
+    price_stats_max_window: int = 2592000
+
+    # Background jobs, every worker runs them
+    jobs_batch_size: int = 20
+    jobs_concurrency: int = 10
+    jobs_max_attempts: int = 5
+    # Seconds a claimed job is leased for, workers extend it every third of that
+    jobs_lease: float = 60.0
+    jobs_backoff: float = 5.0
+    jobs_poll_interval: float = 1.0
+    # Seconds jobs that ran out of attempts are kept for
+    jobs_retention: float = 24 * 3600.0
+    catalog_sync_interval: float = 6 * 3600.0
+
+    # Languages item names are synced in, each fetched at the same time as the others
+    catalog_languages: list[str] = ["en", "ru", "ko", "de", "fr", "pt", "zh-hans", "zh-hant", "es", "it", "pl", "uk"]
+    # Upstream catalog fetches per second, per worker, bursting to one per language
+    catalog_fetch_rate: float = 1.0
+
+    # Item details fetched at once, and per second per worker, after a catalog sync
+    enrichment_concurrency: int = 4
+    enrichment_fetch_rate: float = 3.0
+    # Items enriched per job, their details are written together when it completes
+    enrichment_batch_size: int = 100
+    # Attempts at an item's details, each failed one waiting twice as long as the last before the next
+    enrichment_max_attempts: int = 5
+    enrichment_backoff: float = 15 * 60.0
+
+    # Opt-in caching of CRUD reads, per DAO
+    crud_cache_size: int = 1024
+    crud_cache_ttl: float = 30.0
+    order_tracking_cache: bool = False
+    user_alerts_cache: bool = False
 
     # This variable is used to define multiproc_dir. It's required for [uvi|guni]corn projects.
     prometheus_dir: Path = TEMP_DIR / "prom"
@@ -61,6 +185,17 @@ class Settings(BaseSettings):
             path=f"/{self.db_base}",
         )
 
+    @property
+    def db_session_url(self) -> URL:
+        """Database URL for connections keeping state across transactions, which pgbouncer can't pool."""
+        return (
+            self.db_url.with_scheme("postgresql")
+            .with_host(self.db_session_host or self.db_host)
+            .with_port(
+                self.db_session_port or self.db_port,
+            )
+        )
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_prefix="ORDIS_API_",
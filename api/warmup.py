@@ -0,0 +1,89 @@
+import asyncio
+from contextlib import AsyncExitStack, suppress
+
+from fastapi import FastAPI, HTTPException
+from loguru import logger as log
+from prometheus_client import REGISTRY
+from prometheus_client.openmetrics.exposition import generate_latest  # pyright: ignore[reportUnknownVariableType]
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import configure_mappers
+from sqlalchemy.pool import NullPool
+
+from api.market.autocomplete import item_names, refresh_item_names
+from api.routers.warframe.items import get_all_items, get_item, get_item_by_fuzzy
+from api.settings import settings
+
+WARMUP_RETRY_DELAY = 5.0
+
+
+async def _open_connections(engine: AsyncEngine, count: int) -> None:
+    """Open `count` pooled connections at once, so they're all checked back into the pool."""
+    if count <= 0 or isinstance(engine.pool, NullPool):
+        return
+
+    async with AsyncExitStack() as stack:
+        connections = await asyncio.gather(*(stack.enter_async_context(engine.connect()) for _ in range(count)))
+        await asyncio.gather(*(connection.execute(text("SELECT 1")) for connection in connections))
+
+
+async def _run_queries(app: FastAPI) -> None:
+    """Run every hot query once, compiling and preparing their statements."""
+    # The DAOs import their schemas from `api.routers`, which has to finish initializing first
+    from api.database.crud.tracking import order_tracking_dao
+    from api.database.crud.user_alerts import user_alerts_dao
+
+    async with app.state.db_session_factory() as session, session.begin():
+        await get_all_items(session, limit=1)
+
+        for lookup in (get_item(session, item_id=""), get_item_by_fuzzy(session, search="")):
+            with suppress(HTTPException):
+                await lookup
+
+        await order_tracking_dao.select_(session, limit=1)
+        await order_tracking_dao.get_by_user_id(session, user_id=0)
+        await user_alerts_dao.get_all(session, limit=1, offset=0)
+
+        # Autocomplete is served from the host's snapshot, falling back to the database until there is one
+        if not item_names.reload():
+            await refresh_item_names(session)
+
+
+async def _try_warm_up(app: FastAPI) -> bool:
+    try:
+        await _open_connections(app.state.db_engine, settings.warmup_connections)
+        await _run_queries(app)
+    except Exception:
+        log.exception(f"Warm-up failed, retrying in {WARMUP_RETRY_DELAY} seconds")
+        return False
+
+    app.state.ready = True
+
+    return True
+
+
+async def _retry_warm_up(app: FastAPI) -> None:
+    while True:
+        await asyncio.sleep(WARMUP_RETRY_DELAY)
+
+        if await _try_warm_up(app):
+            log.info("Warm-up succeeded after retrying")
+            return
+
+
+async def warm_up(app: FastAPI) -> None:
+    """
+    Pay the first-request costs of a new worker before it reports ready.
+
+    If the database isn't reachable yet, the worker keeps starting up
+    and retries in the background, staying unready until it succeeds.
+    """
+    app.state.ready = False
+    app.state.warmup_task = None
+
+    configure_mappers()
+    # Renders every metric once, which pulls in the rest of the exposition stack
+    generate_latest(REGISTRY)
+
+    if not await _try_warm_up(app):
+        app.state.warmup_task = asyncio.create_task(_retry_warm_up(app))
@@ -0,0 +1,58 @@
+"""
+Benchmarks for item name autocomplete, served from the in-memory index.
+
+The catalog is generated like the synthetic dataset's, with tracker counts skewed the same way,
+and every prefix of a sample of names is completed, the way a slash command fires on each keystroke.
+
+    python -m benchmarks.autocomplete --items 10000
+"""
+
+import argparse
+import random
+import time
+import timeit
+
+from api.database.synthetic import DatasetConfig, generate_items, zipf_weights
+from api.market.autocomplete import ItemNameIndex
+from api.routers.schemas.items import WarframeItemRow
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=10_000)
+    parser.add_argument("--trackers", type=int, default=1_000_000)
+    parser.add_argument("--skew", type=float, default=1.1)
+    parser.add_argument("--limit", type=int, default=25)
+    parser.add_argument("--samples", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)  # noqa: S311
+    config = DatasetConfig(items=args.items, trackers=args.trackers, users=0, notify_ratio=0, skew=args.skew, seed=0)
+    items = [
+        WarframeItemRow(id=item_id, thumb=thumb, item_name=name, url_name=url_name)
+        for item_id, name, thumb, url_name in generate_items(config, rng)
+    ]
+
+    trackers = [0] * len(items)
+    for rank in rng.choices(range(len(items)), cum_weights=zipf_weights(len(items), args.skew), k=args.trackers):
+        trackers[rank] += 1
+
+    index = ItemNameIndex()
+    before = time.perf_counter()
+    index.rebuild(zip(items, trackers, strict=True))
+    print(f"{"build":<32} {(time.perf_counter() - before) * 1000:>10.2f} ms")  # noqa: T201
+
+    names = [item["item_name"].lower() for item in rng.sample(items, min(args.samples, len(items)))]
+    prefixes = [name[:length] for name in names for length in range(1, len(name) + 1)]
+
+    timings = timeit.repeat(lambda: [index.complete(prefix, args.limit) for prefix in prefixes], number=1, repeat=5)
+    print(f"{"complete, mean":<32} {min(timings) / len(prefixes) * 1e6:>10.2f} us")  # noqa: T201
+
+    worst = max(prefixes, key=lambda prefix: timeit.timeit(lambda: index.complete(prefix, args.limit), number=5))
+    worst_time = min(timeit.repeat(lambda: index.complete(worst, args.limit), number=1, repeat=20))
+    print(f"{f"complete, worst ({worst!r})":<32} {worst_time * 1e6:>10.2f} us")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
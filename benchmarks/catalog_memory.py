@@ -0,0 +1,104 @@
+"""
+Memory held by the item catalog in process, for each way of holding it.
+
+The catalog is read from the configured database three ways: the ORM instances `get_all_items`
+built before it served plain rows, the row dicts it builds today, and the compact catalog.
+Each is measured with `tracemalloc` while it's held, after everything it freed is collected.
+
+Synthetic items are added inside a transaction that's rolled back at the end, leaving the
+database as it was (run `alembic upgrade head` first):
+
+    python -m benchmarks.catalog_memory --items 100000
+"""
+
+import argparse
+import asyncio
+import gc
+import random
+import tracemalloc
+from collections.abc import Awaitable, Callable
+from itertools import batched
+from typing import Any
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from api.database.models.warframe.items import WarframeItemModel
+from api.database.synthetic import DatasetConfig, generate_items
+from api.market.compact import CATALOG_STMT, load_compact_catalog
+from api.settings import settings
+
+
+async def orm_list(session: AsyncSession) -> Any:
+    return (await session.scalars(select(WarframeItemModel))).unique().all()
+
+
+async def row_dicts(session: AsyncSession) -> Any:
+    return [dict(row) for row in (await session.execute(CATALOG_STMT)).mappings()]
+
+
+async def measure(session: AsyncSession, build: Callable[[AsyncSession], Awaitable[Any]]) -> tuple[int, int]:
+    """Bytes held by what `build` returns, and the most it had allocated at once while building it."""
+    # Releases the rows of the last statement, which would otherwise be freed while measuring
+    await session.execute(select(1))
+    session.expunge_all()
+    gc.collect()
+    tracemalloc.reset_peak()
+    before = tracemalloc.get_traced_memory()[0]
+
+    held = await build(session)
+
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    del held
+    session.expunge_all()
+
+    return current - before, peak - before
+
+
+async def run(items: int) -> None:
+    engine = create_async_engine(str(settings.db_url))
+
+    async with engine.connect() as connection, connection.begin() as transaction:
+        session = AsyncSession(bind=connection)
+
+        config = DatasetConfig(items=items, trackers=0, users=0, notify_ratio=0, skew=1.1, seed=0)
+        for batch in batched(generate_items(config, random.Random(0)), 1000):  # noqa: S311
+            await connection.execute(
+                insert(WarframeItemModel),
+                [
+                    {"id": item_id, "item_name": name, "thumb": thumb, "url_name": url_name}
+                    for item_id, name, thumb, url_name in batch
+                ],
+            )
+
+        count = len((await session.scalars(select(WarframeItemModel.id))).all())
+
+        tracemalloc.start()
+        for name, build in (
+            ("orm list", orm_list),
+            ("row dicts", row_dicts),
+            ("compact catalog", load_compact_catalog),
+        ):
+            held, peak = await measure(session, build)
+            print(  # noqa: T201
+                f"{name:<16} {held / 2**20:>8.2f} MiB held {held / count:>8.0f} B/item {peak / 2**20:>8.2f} MiB peak",
+            )
+        tracemalloc.stop()
+
+        await session.close()
+        await transaction.rollback()
+
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=10_000)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.items))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Microbenchmarks for the item endpoints' response serialization.
+
+Each endpoint is measured twice: the previous path (ORM rows, `response_model` validation,
+`UJSONResponse`), and the fast path (plain column rows serialized by a precompiled `TypeAdapter`).
+
+Needs the configured Postgres database with its schema migrated (`alembic upgrade head`),
+the items table uses Postgres-only column types so it can't run against SQLite anymore.
+Items are added inside a transaction that's rolled back at the end, leaving the database
+as it was:
+
+    python -m benchmarks.serialization --items 5000
+"""
+
+import argparse
+import asyncio
+import timeit
+from collections.abc import Callable
+from typing import Any
+
+from fastapi.responses import UJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field  # pyright: ignore[reportUnknownVariableType]
+from sqlalchemy import Select, create_engine, select
+from sqlalchemy.orm import Session
+
+from api.database.models import load_all_models
+from api.database.models.warframe.items import WarframeItemModel
+from api.routers.responses import WarframeItemJSONResponse, WarframeItemListJSONResponse
+from api.routers.schemas.items import WarframeItemResponse
+from api.routers.warframe.items import ITEM_COLUMNS
+from api.settings import settings
+
+
+def orm_path(session: Session, stmt: Select[Any], *, many: bool) -> Callable[[], bytes | memoryview]:
+    # FastAPI builds the response field once per route, and runs it on the request's event loop
+    field_type = list[WarframeItemResponse] if many else WarframeItemResponse
+    field = create_model_field(name="Response", type_=field_type, mode="serialization")
+    loop = asyncio.new_event_loop()
+
+    def run() -> bytes | memoryview:
+        # Every request gets a fresh session, so nothing is reused from the identity map
+        session.expunge_all()
+
+        result = session.execute(stmt)
+        result.unique()
+        content = list(result.scalars().fetchall()) if many else result.scalar_one()
+
+        serialized = loop.run_until_complete(serialize_response(field=field, response_content=content))
+
+        return UJSONResponse(serialized).body
+
+    return run
+
+
+def fast_path(session: Session, stmt: Select[Any], *, many: bool) -> Callable[[], bytes | memoryview]:
+    def run() -> bytes | memoryview:
+        result = session.execute(stmt)
+
+        if many:
+            return WarframeItemListJSONResponse([dict(row) for row in result.mappings()]).body
+
+        return WarframeItemJSONResponse(dict(result.mappings().one())).body
+
+    return run
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=5000)
+    parser.add_argument("--number", type=int, default=20)
+    args = parser.parse_args()
+
+    load_all_models()
+    # Timed synchronously, so through the sync driver rather than asyncpg
+    engine = create_engine(str(settings.db_url.with_scheme("postgresql+psycopg")))
+
+    with engine.connect() as connection, connection.begin() as transaction, Session(bind=connection) as session:
+        session.add_all(
+            WarframeItemModel(
+                id=f"{n:024x}",
+                item_name=f"Item {n}",
+                thumb=f"items/images/en/thumbs/item_{n}.128x128.png",
+                url_name=f"item_{n}",
+            )
+            for n in range(args.items)
+        )
+        session.flush()
+        session.expunge_all()
+
+        endpoints = {
+            "get_item": (WarframeItemModel.id == f"{0:024x}", False),
+            # Serialization is what's measured, so the fuzzy match is stood in for by an exact one
+            "get_item_by_fuzzy": (WarframeItemModel.item_name == "Item 1", False),
+            "get_all_items": (None, True),
+        }
+
+        for name, (where, many) in endpoints.items():
+            orm_stmt = select(WarframeItemModel)
+            columns_stmt = select(*ITEM_COLUMNS)
+            if where is not None:
+                orm_stmt = orm_stmt.where(where)
+                columns_stmt = columns_stmt.where(where)
+
+            before = timeit.timeit(orm_path(session, orm_stmt, many=many), number=args.number) / args.number
+            after = timeit.timeit(fast_path(session, columns_stmt, many=many), number=args.number) / args.number
+
+            speedup = before / after
+            print(f"{name:<20} orm+validate {before * 1000:8.3f}ms  fast path {after * 1000:8.3f}ms  x{speedup:.1f}")  # noqa: T201
+
+        transaction.rollback()
+
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
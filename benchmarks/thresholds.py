@@ -0,0 +1,136 @@
+"""
+Benchmarks for evaluating trackers against order books.
+
+Trackers are spread over items with the same skew as the synthetic dataset, then every item
+is evaluated against a random quantity frontier, both by the threshold index and by checking
+each tracker in a Python loop, the way the index replaced.
+
+    python -m benchmarks.thresholds --trackers 1000000 --items 10000
+"""
+
+import argparse
+import random
+import time
+import timeit
+import uuid
+from collections import defaultdict
+
+import numpy as np
+
+from api.database.synthetic import zipf_weights
+from api.market.thresholds import ThresholdIndex, TrackerThreshold
+
+type Frontier = tuple[list[int], list[int]]
+
+
+def generate(
+    rng: random.Random,
+    *,
+    trackers: int,
+    items: int,
+    skew: float,
+) -> tuple[dict[str, list[TrackerThreshold]], dict[str, Frontier]]:
+    # Platinum prices cluster at the low end, with a long tail of expensive items
+    item_prices = {f"{n:024x}": max(1, int(rng.lognormvariate(3.0, 1.0))) for n in range(items)}
+    by_item: defaultdict[str, list[TrackerThreshold]] = defaultdict(list)
+
+    for item_id in rng.choices(list(item_prices), cum_weights=zipf_weights(items, skew), k=trackers):
+        by_item[item_id].append(
+            (
+                uuid.UUID(int=rng.getrandbits(128), version=4),
+                rng.getrandbits(60),
+                # Most trackers wait for a drop, some are already met
+                max(1, round(item_prices[item_id] * rng.uniform(0.5, 1.05))),
+                1 if rng.random() < 0.8 else rng.randint(2, 10),
+            ),
+        )
+
+    frontiers: dict[str, Frontier] = {}
+    for item_id in by_item:
+        prices = [item_prices[item_id]]
+        quantities = [1]
+        for _ in range(rng.randint(0, 4)):
+            prices.append(prices[-1] + rng.randint(1, 10))
+            quantities.append(quantities[-1] + rng.randint(1, 5))
+
+        frontiers[item_id] = (prices, quantities)
+
+    return by_item, frontiers
+
+
+def loop_triggered(trackers: list[TrackerThreshold], frontier: Frontier) -> list[uuid.UUID]:
+    prices, quantities = frontier
+    triggered: list[uuid.UUID] = []
+
+    for tracker_id, _, threshold, minimum_quantity in trackers:
+        for price, quantity in zip(prices, quantities, strict=True):
+            if quantity >= minimum_quantity:
+                if price <= threshold:
+                    triggered.append(tracker_id)
+                break
+
+    return triggered
+
+
+def report(name: str, seconds: float, count: int) -> None:
+    print(f"{name:<40} {seconds * 1000:>10.2f} ms  {count / seconds:>14,.0f} trackers/s")  # noqa: T201
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--trackers", type=int, default=1_000_000)
+    parser.add_argument("--items", type=int, default=10_000)
+    parser.add_argument("--skew", type=float, default=1.1)
+    parser.add_argument("--changes", type=int, default=100_000, help="trackers created and deleted one at a time")
+    parser.add_argument("--number", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)  # noqa: S311
+    by_item, frontiers = generate(rng, trackers=args.trackers, items=args.items, skew=args.skew)
+    arrays = {item_id: (np.array(prices), np.array(quantities)) for item_id, (prices, quantities) in frontiers.items()}
+
+    index = ThresholdIndex(ttl=60)
+    before = time.perf_counter()
+    for item_id, trackers in by_item.items():
+        index.load(item_id, trackers)
+    report("load", time.perf_counter() - before, args.trackers)
+
+    mib = index.nbytes() / 2**20
+    print(f"{"memory":<40} {mib:>10.2f} MiB {index.nbytes() / args.trackers:>14.1f} bytes/tracker")  # noqa: T201
+
+    def evaluate_index() -> None:
+        for item_id, item in index.items.items():
+            item.triggered(*arrays[item_id])
+
+    def evaluate_loop() -> None:
+        for item_id, trackers in by_item.items():
+            loop_triggered(trackers, frontiers[item_id])
+
+    report("evaluate every item, index", min(timeit.repeat(evaluate_index, number=1, repeat=args.number)), len(index))
+    report("evaluate every item, loop", min(timeit.repeat(evaluate_loop, number=1, repeat=args.number)), len(index))
+
+    hottest = max(by_item, key=lambda item_id: len(by_item[item_id]))
+    hot_item = index.items[hottest]
+    report(
+        f"evaluate hottest item ({len(hot_item)}), index",
+        min(timeit.repeat(lambda: hot_item.triggered(*arrays[hottest]), number=1, repeat=args.number)),
+        len(hot_item),
+    )
+    report(
+        f"evaluate hottest item ({len(hot_item)}), loop",
+        min(timeit.repeat(lambda: loop_triggered(by_item[hottest], frontiers[hottest]), number=1, repeat=args.number)),
+        len(hot_item),
+    )
+
+    changes = by_item[hottest][: args.changes]
+    before = time.perf_counter()
+    for tracker in changes:
+        index.remove([(tracker[0], hottest)])
+    for tracker in changes:
+        index.add(hottest, tracker)
+    report(f"delete and recreate {len(changes)}, one at a time", time.perf_counter() - before, 2 * len(changes))
+
+
+if __name__ == "__main__":
+    main()
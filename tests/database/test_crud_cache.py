@@ -0,0 +1,121 @@
+import time
+from unittest.mock import patch
+
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.database.crud.cache import LRUCache
+from api.database.crud.user_alerts import UserAlertsCRUD
+from api.database.models.warframe.tracking import UserOrderAlertsModel
+from api.routers.schemas.user_alerts import UserAlertCreate
+
+
+class TestLRUCache:
+    def test_get_after_set_returns_value(self) -> None:
+        cache = LRUCache(maxsize=2, ttl=60)
+        cache.set(("model", "pk", 1), "value")
+
+        assert cache.get(("model", "pk", 1)) == "value"
+
+    def test_set_over_maxsize_evicts_least_recently_used(self) -> None:
+        cache = LRUCache(maxsize=2, ttl=60)
+        cache.set(("model", "pk", 1), 1)
+        cache.set(("model", "pk", 2), 2)
+
+        # Touching the first entry makes the second one the oldest
+        assert cache.get(("model", "pk", 1)) == 1
+        cache.set(("model", "pk", 3), 3)
+
+        assert len(cache) == 2
+        assert cache.get(("model", "pk", 2)) is None
+        assert cache.get(("model", "pk", 1)) == 1
+
+    def test_get_after_ttl_returns_none(self) -> None:
+        cache = LRUCache(maxsize=2, ttl=60)
+        cache.set(("model", "pk", 1), 1)
+
+        with patch("api.database.crud.cache.time.monotonic", return_value=time.monotonic() + 61):
+            assert cache.get(("model", "pk", 1)) is None
+
+        assert len(cache) == 0
+
+    def test_invalidate_only_removes_namespace(self) -> None:
+        cache = LRUCache(maxsize=4, ttl=60)
+        cache.set(("model", "pk", 1), 1)
+        cache.set(("other", "pk", 1), 1)
+
+        cache.invalidate("model")
+
+        assert cache.get(("model", "pk", 1)) is None
+        assert cache.get(("other", "pk", 1)) == 1
+
+
+class TestCachedCRUD:
+    async def test_select_by_id_is_served_from_cache(self, dbsession: AsyncSession) -> None:
+        dao = UserAlertsCRUD(UserOrderAlertsModel, cache=LRUCache(maxsize=16, ttl=60))
+        await dao.create(dbsession, obj=UserAlertCreate(id=1))
+
+        assert await dao.select_by_id(dbsession, pk=1) is not None
+        assert len(dao.cache) == 1  # pyright: ignore[reportArgumentType]
+
+        with patch.object(dao, "_select_first") as select_first:
+            cached = await dao.select_by_id(dbsession, pk=1)
+
+        select_first.assert_not_called()
+        assert cached is not None
+        assert cached.id == 1
+
+    async def test_select_first_is_keyed_by_filter_values(self, dbsession: AsyncSession) -> None:
+        dao = UserAlertsCRUD(UserOrderAlertsModel, cache=LRUCache(maxsize=16, ttl=60))
+        await dao.create(dbsession, obj=UserAlertCreate(id=1))
+        await dao.create(dbsession, obj=UserAlertCreate(id=2))
+
+        first = await dao.select_first_(dbsession, filters=dao.model.id == 1)
+        second = await dao.select_first_(dbsession, filters=dao.model.id == 2)
+
+        assert first is not None
+        assert second is not None
+        assert first.id == 1
+        assert second.id == 2
+
+    async def test_delete_invalidates_cached_rows(self, dbsession: AsyncSession) -> None:
+        dao = UserAlertsCRUD(UserOrderAlertsModel, cache=LRUCache(maxsize=16, ttl=60))
+        await dao.create(dbsession, obj=UserAlertCreate(id=1))
+        assert await dao.select_by_id(dbsession, pk=1) is not None
+
+        assert await dao.delete(dbsession, pk=[1]) == 1
+
+        assert await dao.select_by_id(dbsession, pk=1) is None
+
+    async def test_writes_are_invalidated_once_committed(self, dbsession: AsyncSession) -> None:
+        dao = UserAlertsCRUD(UserOrderAlertsModel, cache=LRUCache(maxsize=16, ttl=60))
+        await dao.create(dbsession, obj=UserAlertCreate(id=1))
+
+        # Another request, reading through the same connection to see the test's transaction
+        other = AsyncSession(bind=dbsession.bind)
+        assert await dao.select_by_id(other, pk=1) is not None
+
+        await dao.delete(dbsession, pk=[1])
+        assert len(dao.cache) == 1  # pyright: ignore[reportArgumentType]
+
+        await dbsession.commit()
+        assert len(dao.cache) == 0  # pyright: ignore[reportArgumentType]
+        assert await dao.select_by_id(other, pk=1) is None
+
+        await other.close()
+
+    async def test_cached_instances_are_detached(self, dbsession: AsyncSession) -> None:
+        dao = UserAlertsCRUD(UserOrderAlertsModel, cache=LRUCache(maxsize=16, ttl=60))
+        await dao.create(dbsession, obj=UserAlertCreate(id=1))
+        loaded = await dao.select_by_id(dbsession, pk=1)
+
+        other = AsyncSession(bind=dbsession.bind)
+        cached = await dao.select_by_id(other, pk=1)
+
+        assert cached is not None
+        assert cached in other
+        assert cached not in dbsession
+        assert cached is not loaded
+        assert inspect(dao.cache.get(("user_order_notifications", "pk", 1))).detached  # pyright: ignore[reportOptionalMemberAccess]
+
+        await other.close()
@@ -0,0 +1,75 @@
+from contextlib import aclosing
+
+import pytest
+from pydantic import BaseModel
+from sqlalchemy import func, inspect, select
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from api.database.crud.base import CRUDBase
+from api.database.models.warframe.items import WarframeItemModel
+from api.database.models.warframe.tracking import WarframeMarketOrderModel
+
+URL_NAMES = [f"item_{n}" for n in range(5)]
+
+item_dao = CRUDBase[WarframeItemModel, BaseModel, BaseModel](WarframeItemModel)
+order_dao = CRUDBase[WarframeMarketOrderModel, BaseModel, BaseModel](WarframeMarketOrderModel)
+
+
+class TestCRUDStream:
+    async def add_items(self, dbsession: AsyncSession) -> None:
+        dbsession.add_all(
+            WarframeItemModel(id=url_name, item_name=url_name, thumb=f"{url_name}.png", url_name=url_name)
+            for url_name in URL_NAMES
+        )
+        dbsession.add(WarframeMarketOrderModel(user_id=1, platinum_threshold=10, minimum_quantity=1, item_id="item_0"))
+        await dbsession.flush()
+        dbsession.expunge_all()
+
+    async def test_instances_are_streamed_without_their_relationships(self, dbsession: AsyncSession) -> None:
+        await self.add_items(dbsession)
+
+        items = [item async for item in item_dao.stream_(dbsession, yield_per=2)]
+        orders = [order async for order in order_dao.stream_(dbsession)]
+
+        assert sorted(item.url_name for item in items) == URL_NAMES
+        # Joined by default, an order's item and its users aren't loaded along with it
+        assert inspect(orders[0]).unloaded >= {"item", "notify_users"}
+        with pytest.raises(InvalidRequestError):
+            _ = orders[0].item
+
+    async def test_relationships_are_loaded_as_asked(self, dbsession: AsyncSession) -> None:
+        await self.add_items(dbsession)
+
+        items = item_dao.stream_(
+            dbsession,
+            options=[selectinload(WarframeItemModel.orders).raiseload("*")],
+            yield_per=2,
+        )
+        orders = {item.url_name: item.orders async for item in items}["item_0"]
+
+        assert len(orders) == 1
+        # Nor are the relationships of what's loaded, unless they're asked for too
+        assert "notify_users" in inspect(orders[0]).unloaded
+
+    async def test_rows_of_columns_are_streamed(self, dbsession: AsyncSession) -> None:
+        await self.add_items(dbsession)
+
+        rows = item_dao.stream_(
+            dbsession,
+            columns=[WarframeItemModel.id, WarframeItemModel.thumb],
+            filters=WarframeItemModel.url_name.in_(URL_NAMES[:3]),
+            yield_per=1,
+        )
+
+        assert sorted([tuple(row) async for row in rows]) == [(name, f"{name}.png") for name in URL_NAMES[:3]]
+
+    async def test_stopping_early_releases_the_cursor(self, dbsession: AsyncSession) -> None:
+        await self.add_items(dbsession)
+
+        async with aclosing(item_dao.stream_(dbsession, yield_per=1)) as items:
+            async for _ in items:
+                break
+
+        assert await dbsession.scalar(select(func.count()).select_from(WarframeItemModel)) == len(URL_NAMES)
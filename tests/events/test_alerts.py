@@ -0,0 +1,86 @@
+import json
+from unittest.mock import patch
+
+from fastapi import FastAPI, status
+from httpx import AsyncClient
+
+from api.events.alerts import ALL_ALERTS, alert_broker, alert_stream, handle_alert_notification, user_topic
+from api.events.broker import Broker
+from api.settings import settings
+
+
+class TestBroker:
+    async def test_publish_reaches_only_topic_subscribers(self) -> None:
+        broker = Broker("test", queue_size=4)
+        first = broker.subscribe("a")
+        second = broker.subscribe("b")
+
+        assert broker.publish("a", "message") == 1
+
+        assert await first.get() == "message"
+        assert second._queue.empty()  # pyright: ignore[reportPrivateUsage]
+
+    async def test_slow_subscriber_is_dropped(self) -> None:
+        broker = Broker("test", queue_size=2)
+        subscription = broker.subscribe("a")
+
+        for n in range(3):
+            broker.publish("a", str(n))
+
+        assert subscription.closed
+        assert broker.topics() == set()
+        assert [message async for message in subscription] == ["1"]
+
+    async def test_closed_subscription_is_removed(self) -> None:
+        broker = Broker("test", queue_size=2)
+
+        async with broker.subscribe("a"):
+            assert broker.topics() == {"a"}
+
+        assert broker.publish("a", "message") == 0
+
+
+class TestAlertStream:
+    async def test_notification_is_streamed_to_recipients_and_bots(self) -> None:
+        streams = [alert_stream(user_topic(1)), alert_stream(ALL_ALERTS)]
+        for stream in streams:
+            assert (await anext(stream)).startswith("retry:")
+        other = alert_broker.subscribe(user_topic(2))
+
+        handle_alert_notification(json.dumps({"recipients": [1], "payload": {"order_id": "x"}}))
+
+        for stream in streams:
+            assert await anext(stream) == 'event: alert\ndata: {"order_id": "x"}\n\n'
+            await stream.aclose()
+
+        assert other._queue.empty()  # pyright: ignore[reportPrivateUsage]
+        other.close()
+
+    async def test_stream_closed_before_starting_never_subscribes(self) -> None:
+        stream = alert_stream(user_topic(1))
+        assert user_topic(1) not in alert_broker.topics()
+
+        await stream.aclose()
+        assert user_topic(1) not in alert_broker.topics()
+
+    async def test_idle_stream_sends_keep_alive(self) -> None:
+        stream = alert_stream(user_topic(1))
+
+        with patch.object(settings, "alerts_stream_heartbeat", 0.01):
+            await anext(stream)
+            assert await anext(stream) == ": keep-alive\n\n"
+
+        await stream.aclose()
+        assert user_topic(1) not in alert_broker.topics()
+
+    async def test_stream_all_alerts_without_bot_token_returns_401(
+        self,
+        client: AsyncClient,
+        fastapi_app: FastAPI,
+    ) -> None:
+        url = fastapi_app.url_path_for("stream_alerts")
+
+        with patch.object(settings, "alerts_bot_token", "secret"):
+            response = await client.get(url, headers={"X-Bot-Token": "wrong"})
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
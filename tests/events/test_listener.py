@@ -0,0 +1,25 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import asyncpg
+
+from api.events.listener import PostgresListener
+
+
+class TestPostgresListener:
+    async def test_any_connection_failure_reconnects(self) -> None:
+        attempts = AsyncMock(
+            side_effect=[
+                asyncpg.ConnectionDoesNotExistError("connection was closed in the middle of operation"),
+                TimeoutError(),
+                asyncio.CancelledError(),
+            ],
+        )
+
+        with (
+            patch("api.events.listener.asyncpg.connect", attempts),
+            patch("api.events.listener.RECONNECT_DELAY", 0),
+        ):
+            await asyncio.gather(PostgresListener("postgresql://", {}).run(), return_exceptions=True)
+
+        assert attempts.await_count == 3
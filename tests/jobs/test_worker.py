@@ -0,0 +1,156 @@
+import asyncio
+from datetime import timedelta
+from typing import Any
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from api.database.crud.jobs import job_dao
+from api.database.models.jobs import JobModel
+from api.database.models.warframe.items import WarframeItemModel
+from api.jobs.worker import JobHandler, JobWorker
+from api.routers.schemas.jobs import JobCreate
+from tests.routers.warframe.utils import FAKE_ITEM_LIST
+
+
+class TestJobWorker:
+    @pytest.fixture(autouse=True)
+    async def savepoint(self, dbsession: AsyncSession) -> None:
+        # Lets the worker's sessions roll back failed jobs without undoing the test's setup
+        await dbsession.begin_nested()
+
+    def worker(self, dbsession: AsyncSession, handlers: dict[str, JobHandler], name: str = "worker") -> JobWorker:
+        return JobWorker(
+            async_sessionmaker(dbsession.bind, expire_on_commit=False),
+            handlers,
+            batch_size=10,
+            concurrency=2,
+            max_attempts=2,
+            lease=timedelta(minutes=1),
+            backoff=timedelta(seconds=5),
+            retention=timedelta(days=1),
+            name=name,
+        )
+
+    async def jobs(self, dbsession: AsyncSession) -> list[JobModel]:
+        result = await dbsession.execute(
+            select(JobModel).order_by(JobModel.id).execution_options(populate_existing=True),
+        )
+
+        return list(result.scalars().all())
+
+    async def test_enqueue_skips_unfinished_duplicates(self, dbsession: AsyncSession) -> None:
+        jobs = [JobCreate(kind="poll", key="a", max_attempts=1), JobCreate(kind="sync", key="a", max_attempts=1)]
+
+        assert await job_dao.enqueue(dbsession, jobs=jobs) == 2
+        assert await job_dao.enqueue(dbsession, jobs=[*jobs, JobCreate(kind="poll", key="b", max_attempts=1)]) == 1
+
+        # Jobs without a key are never duplicates
+        assert await job_dao.enqueue(dbsession, jobs=[JobCreate(kind="poll", max_attempts=1)] * 2) == 2
+
+    async def test_completed_jobs_are_deleted(self, dbsession: AsyncSession) -> None:
+        payloads: list[dict[str, Any]] = []
+
+        async def handler(_session: AsyncSession, payload: dict[str, Any]) -> None:  # noqa: RUF029
+            payloads.append(payload)
+
+        await job_dao.enqueue(dbsession, jobs=[JobCreate(kind="poll", payload={"item": 1}, max_attempts=1)])
+
+        worker = self.worker(dbsession, {"poll": handler})
+        assert await worker.run_once() == 1
+        await worker.join()
+
+        assert payloads == [{"item": 1}]
+        assert await self.jobs(dbsession) == []
+
+    async def test_only_handled_kinds_are_claimed(self, dbsession: AsyncSession) -> None:
+        async def handler(_session: AsyncSession, _payload: dict[str, Any]) -> None:  # noqa: RUF029
+            pytest.fail()
+
+        await job_dao.enqueue(dbsession, jobs=[JobCreate(kind="other", max_attempts=1)])
+
+        assert await self.worker(dbsession, {"poll": handler}).run_once() == 0
+
+    async def test_leased_jobs_are_not_claimed_again(self, dbsession: AsyncSession) -> None:
+        await job_dao.enqueue(dbsession, jobs=[JobCreate(kind="poll", max_attempts=2)])
+
+        claimed = await job_dao.claim_batch(dbsession, kinds=["poll"], worker="a", limit=10, lease=timedelta(minutes=1))
+        assert [job.attempts for job in claimed] == [1]
+        assert await job_dao.claim_batch(dbsession, kinds=["poll"], worker="b", limit=10, lease=timedelta()) == []
+
+        # Until the lease runs out
+        await job_dao.extend_leases(dbsession, pk=[claimed[0].id], worker="a", lease=-timedelta(seconds=1))
+        reclaimed = await job_dao.claim_batch(dbsession, kinds=["poll"], worker="b", limit=10, lease=timedelta())
+        assert [(job.leased_by, job.attempts) for job in reclaimed] == [("b", 2)]
+
+        # And the worker that lost it can't complete it anymore
+        assert await job_dao.complete(dbsession, pk=claimed[0].id, worker="a") == 0
+
+    async def test_failed_jobs_roll_back_and_retry_until_exhausted(self, dbsession: AsyncSession) -> None:
+        async def handler(session: AsyncSession, _payload: dict[str, Any]) -> None:
+            session.add(WarframeItemModel(**FAKE_ITEM_LIST[0]))
+            await session.flush()
+            raise RuntimeError("upstream down")
+
+        await job_dao.enqueue(dbsession, jobs=[JobCreate(kind="poll", max_attempts=2)])
+        worker = self.worker(dbsession, {"poll": handler})
+
+        assert await worker.run_once() == 1
+        await worker.join()
+
+        [job] = await self.jobs(dbsession)
+        assert await dbsession.get(WarframeItemModel, FAKE_ITEM_LIST[0]["id"]) is None
+        assert (job.attempts, job.leased_by, job.finished_at) == (1, None, None)
+        assert job.last_error == "RuntimeError('upstream down')"
+
+        # Backed off, so not due yet
+        assert await worker.run_once() == 0
+
+        job.run_at = job.created_at
+        await dbsession.flush()
+
+        assert await worker.run_once() == 1
+        await worker.join()
+
+        [job] = await self.jobs(dbsession)
+        assert job.attempts == 2
+        assert job.finished_at is not None
+        assert await worker.run_once() == 0
+
+    async def test_jobs_claimed_again_roll_back(self, dbsession: AsyncSession) -> None:
+        async def handler(session: AsyncSession, _payload: dict[str, Any]) -> None:
+            session.add(WarframeItemModel(**FAKE_ITEM_LIST[0]))
+            await session.flush()
+            # Another worker claims the job once its lease has run out
+            assert await job_dao.claim_batch(session, kinds=["poll"], worker="b", limit=10, lease=timedelta())
+
+        await job_dao.enqueue(dbsession, jobs=[JobCreate(kind="poll", max_attempts=2)])
+        worker = self.worker(dbsession, {"poll": handler}, name="a")
+        worker.lease = -timedelta(seconds=1)
+
+        assert await worker.run_once() == 1
+        await worker.join()
+
+        assert await dbsession.get(WarframeItemModel, FAKE_ITEM_LIST[0]["id"]) is None
+        assert [job.finished_at for job in await self.jobs(dbsession)] == [None]
+
+    async def test_stopping_waits_for_running_jobs(self, dbsession: AsyncSession) -> None:
+        started = asyncio.Event()
+        stopped: list[bool] = []
+
+        async def handler(_session: AsyncSession, _payload: dict[str, Any]) -> None:
+            started.set()
+            try:
+                await asyncio.Event().wait()
+            finally:
+                stopped.append(True)
+
+        await job_dao.enqueue(dbsession, jobs=[JobCreate(kind="poll", max_attempts=2)])
+        task = asyncio.create_task(self.worker(dbsession, {"poll": handler}).run())
+        await started.wait()
+
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+        assert stopped == [True]
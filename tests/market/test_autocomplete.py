@@ -0,0 +1,72 @@
+from pathlib import Path
+
+from api.market.autocomplete import WIDE_PREFIX_KEYS, ItemNameIndex, normalize
+from api.routers.schemas.items import WarframeItemRow
+
+
+def item(name: str) -> WarframeItemRow:
+    url_name = normalize(name).replace(" ", "_")
+
+    return WarframeItemRow(id=url_name, thumb="", item_name=name, url_name=url_name)
+
+
+def names(items: list[WarframeItemRow]) -> list[str]:
+    return [item["item_name"] for item in items]
+
+
+class TestItemNameIndex:
+    def test_any_word_of_a_name_completes_it_by_popularity(self) -> None:
+        index = ItemNameIndex()
+        index.rebuild([(item("Secura Dual Cestra"), 5), (item("Dual Kamas"), 10), (item("Dread"), 1)])
+
+        assert names(index.complete("DU")) == ["Dual Kamas", "Secura Dual Cestra"]
+        assert names(index.complete("dual_c")) == ["Secura Dual Cestra"]
+        assert names(index.complete("d", limit=1)) == ["Dual Kamas"]
+        assert index.complete("xyz") == []
+
+    def test_equally_popular_items_prefer_shorter_names(self) -> None:
+        index = ItemNameIndex()
+        index.rebuild([(item("Arcane Energize"), 0), (item("Arcane Grace"), 0), (item("Arcane"), 0)])
+
+        assert names(index.complete("arc")) == ["Arcane", "Arcane Grace", "Arcane Energize"]
+
+    def test_wide_prefixes_rank_the_same_as_narrow_ones(self) -> None:
+        items = [(item(f"Lith A{n} Relic"), n % 7) for n in range(2 * WIDE_PREFIX_KEYS)]
+        index = ItemNameIndex()
+        index.rebuild(items)
+
+        ranked = sorted(items, key=lambda pair: (-pair[1], len(pair[0]["item_name"]), pair[0]["item_name"]))
+        ranked_names = names([row for row, _ in ranked])
+
+        # Ranked when built, and on the spot
+        assert names(index.complete("lith", limit=5)) == ranked_names[:5]
+        assert names(index.complete("lith a1", limit=5)) == [n for n in ranked_names if n.startswith("Lith A1")][:5]
+
+    def test_workers_map_the_snapshot_another_one_built(self, tmp_path: Path) -> None:
+        path = tmp_path / "catalog.snapshot"
+        builder = ItemNameIndex(path)
+        worker = ItemNameIndex(path)
+
+        assert not worker.reload()
+
+        builder.rebuild([(item("Secura Dual Cestra"), 5), (item("Dual Kamas"), 10)])
+
+        assert worker.reload()
+        assert not worker.reload()
+        assert worker.version == builder.version
+        assert names(worker.complete("dual")) == ["Dual Kamas", "Secura Dual Cestra"]
+
+        builder.rebuild([(item("Secura Dual Cestra"), 5)])
+
+        # Until it checks again, the worker keeps serving the snapshot it has
+        assert names(worker.complete("dual")) == ["Dual Kamas", "Secura Dual Cestra"]
+        assert worker.reload()
+        assert names(worker.complete("dual")) == ["Secura Dual Cestra"]
+
+    def test_unreadable_snapshots_are_ignored(self, tmp_path: Path) -> None:
+        path = tmp_path / "catalog.snapshot"
+        path.write_bytes(b"written by another version")
+        index = ItemNameIndex(path)
+
+        assert not index.reload()
+        assert len(index) == 0
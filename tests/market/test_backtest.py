@@ -0,0 +1,135 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.database.models.warframe.history import PriceSnapshotModel
+from api.database.models.warframe.items import WarframeItemModel
+from api.market import backtest as backtest_module
+from api.market.backtest import NO_PRICE, SellHistory, Tracker, apply_cooldown, backtest, backtest_item
+from tests.market.test_prices import UNTRACKED_ITEM
+from tests.routers.warframe.utils import FAKE_ITEM_LIST
+
+START = datetime(2024, 1, 1)  # noqa: DTZ001
+
+# Each snapshot is (best prices, quantities), an hour apart
+SNAPSHOTS: list[tuple[list[int], list[int]]] = [
+    ([10, 12], [1, 5]),
+    ([8], [2]),
+    ([], []),
+    ([9, 11, 20], [1, 3, 10]),
+]
+
+
+def history_rows() -> list[tuple[datetime, list[int], list[int]]]:
+    return [(START + timedelta(hours=n), prices, quantities) for n, (prices, quantities) in enumerate(SNAPSHOTS)]
+
+
+def naive_alerts(threshold: int, minimum_quantity: int, cooldown: timedelta) -> list[datetime]:
+    alerts: list[datetime] = []
+
+    for recorded_at, prices, quantities in history_rows():
+        best = min(
+            (price for price, quantity in zip(prices, quantities, strict=True) if quantity >= minimum_quantity),
+            default=None,
+        )
+
+        if best is not None and best <= threshold and (not alerts or recorded_at >= alerts[-1] + cooldown):
+            alerts.append(recorded_at)
+
+    return alerts
+
+
+class TestBacktest:
+    def test_best_prices_need_a_single_seller_with_the_quantity(self) -> None:
+        history = SellHistory.from_rows(history_rows())
+
+        best = history.best_prices(np.array([1, 2, 4, 11]))
+
+        assert best.tolist() == [
+            [10, 8, NO_PRICE, 9],
+            [12, 8, NO_PRICE, 11],
+            [12, NO_PRICE, NO_PRICE, 20],
+            [NO_PRICE, NO_PRICE, NO_PRICE, NO_PRICE],
+        ]
+
+    def test_concatenated_chunks_match_the_whole(self) -> None:
+        rows = history_rows()
+        whole = SellHistory.from_rows(rows)
+
+        joined = SellHistory.concatenate([SellHistory.from_rows(rows[:1]), SellHistory.from_rows(rows[1:])])
+
+        for field in ("recorded_at", "offsets", "prices", "quantities"):
+            assert np.array_equal(getattr(joined, field), getattr(whole, field))
+
+    def test_cooldown_skips_triggers_until_it_runs_out(self) -> None:
+        triggered_at = np.array(
+            [START + timedelta(minutes=m) for m in (0, 10, 59, 60, 61, 200)], dtype="datetime64[us]"
+        )
+
+        alerts = apply_cooldown(triggered_at, np.timedelta64(timedelta(hours=1)))
+
+        assert alerts.tolist() == [START, START + timedelta(minutes=60), START + timedelta(minutes=200)]
+
+    def test_matches_evaluating_each_snapshot_in_turn(self) -> None:
+        history = SellHistory.from_rows(history_rows())
+        trackers = [(threshold, quantity) for threshold in (7, 8, 9, 10, 12, 20) for quantity in (1, 2, 3, 10)]
+        # Duplicates share their evaluation
+        trackers += trackers[:3]
+
+        for cooldown in (timedelta(), timedelta(hours=2)):
+            alerts = backtest_item(
+                history,
+                np.array([threshold for threshold, _ in trackers]),
+                np.array([quantity for _, quantity in trackers]),
+                cooldown=cooldown,
+            )
+
+            assert [tracker_alerts.tolist() for tracker_alerts in alerts] == [
+                naive_alerts(threshold, quantity, cooldown) for threshold, quantity in trackers
+            ]
+
+    def test_results_are_the_same_across_blocks(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        history = SellHistory.from_rows(history_rows())
+        thresholds = np.arange(5, 25)
+        quantities = np.ones(len(thresholds), dtype=np.int64)
+
+        expected = backtest_item(history, thresholds, quantities, cooldown=timedelta())
+
+        # Three trackers at a time
+        monkeypatch.setattr(backtest_module, "BLOCK_CELLS", len(history) * 3)
+        blocked = backtest_item(history, thresholds, quantities, cooldown=timedelta())
+
+        assert [alerts.tolist() for alerts in blocked] == [alerts.tolist() for alerts in expected]
+
+    async def test_backtest_replays_stored_history_per_item(self, dbsession: AsyncSession) -> None:
+        dbsession.add_all([WarframeItemModel(**FAKE_ITEM_LIST[0]), WarframeItemModel(**UNTRACKED_ITEM)])
+        await dbsession.flush()
+
+        dbsession.add_all(
+            PriceSnapshotModel(
+                item_id=FAKE_ITEM_LIST[0]["id"],
+                recorded_at=recorded_at,
+                best_sell=prices[0] if prices else None,
+                best_buy=None,
+                sell_prices=prices,
+                sell_quantities=quantities,
+            )
+            for recorded_at, prices, quantities in history_rows()
+        )
+        await dbsession.flush()
+
+        trackers = [
+            Tracker(FAKE_ITEM_LIST[0]["id"], 9, 1),
+            Tracker(UNTRACKED_ITEM["id"], 100, 1),
+            Tracker(FAKE_ITEM_LIST[0]["id"], 12, 3),
+        ]
+
+        alerts = await backtest(dbsession, trackers, cooldown=timedelta(), since=START + timedelta(hours=1))
+
+        assert [tracker_alerts.tolist() for tracker_alerts in alerts] == [
+            [START + timedelta(hours=1), START + timedelta(hours=3)],
+            [],
+            [START + timedelta(hours=3)],
+        ]
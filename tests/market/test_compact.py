@@ -0,0 +1,44 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.database.models.warframe.items import WarframeItemModel
+from api.market.compact import CompactCatalog, load_compact_catalog
+from tests.routers.warframe.utils import FAKE_ITEM_LIST
+
+ROWS = [
+    ("1", "kamas.png", "Dual Kamas", "dual_kamas"),
+    ("2", "cestra.png", "Secura Dual Cestra", "secura_dual_cestra"),
+]
+
+
+class TestCompactCatalog:
+    def test_items_are_found_by_id_and_url_name(self) -> None:
+        catalog = CompactCatalog.from_rows(ROWS)
+
+        assert len(catalog) == 2
+        assert [item.as_row() for item in catalog] == [
+            {"id": item_id, "thumb": thumb, "item_name": item_name, "url_name": url_name}
+            for item_id, thumb, item_name, url_name in ROWS
+        ]
+        assert catalog.get("2") == catalog.get_by_url_name("secura_dual_cestra")
+        assert catalog.get("3") is None
+        assert catalog.get_by_url_name("dual_kamas_prime") is None
+
+    def test_names_outside_of_ascii_are_read_back(self) -> None:
+        catalog = CompactCatalog.from_rows([
+            *ROWS,
+            ("3", "цестра.png", "Секура Двойные Цестры", "secura_dual_cestra_ru"),
+        ])
+
+        item = catalog.get_by_url_name("secura_dual_cestra_ru")
+
+        assert item is not None
+        assert (item.thumb, item.item_name) == ("цестра.png", "Секура Двойные Цестры")
+        assert catalog.get("1") == CompactCatalog.from_rows(ROWS[:1]).get("1")
+
+    async def test_catalogs_are_loaded_from_the_database(self, dbsession: AsyncSession) -> None:
+        dbsession.add_all(WarframeItemModel(**item) for item in FAKE_ITEM_LIST)
+        await dbsession.flush()
+
+        catalog = await load_compact_catalog(dbsession, partition_size=1)
+
+        assert [item.as_row() for item in catalog] == FAKE_ITEM_LIST
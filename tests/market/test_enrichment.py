@@ -0,0 +1,208 @@
+from collections.abc import AsyncGenerator, Iterator
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from httpx import HTTPError
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from api.database.models.jobs import JobModel
+from api.database.models.warframe.items import WarframeItemModel
+from api.market.autocomplete import item_names
+from api.market.catalog import sync_catalog
+from api.market.enrichment import ENRICH_JOB, ItemEnricher, group_sets
+from api.market.rate import TokenBucket
+from api.settings import settings
+from tests.routers.warframe.utils import FAKE_ITEM_LIST
+
+
+def catalog_item(url_name: str) -> dict[str, str]:
+    return {
+        "id": f"id_{url_name}",
+        "item_name": url_name.replace("_", " ").title(),
+        "thumb": f"items/images/en/thumbs/{url_name}.128x128.png",
+        "url_name": url_name,
+    }
+
+
+ASH_PRIME = [catalog_item(f"ash_prime_{part}") for part in ("set", "blueprint", "chassis")]
+CATALOG = [*FAKE_ITEM_LIST, *ASH_PRIME]
+
+
+def fake_details(url_name: str) -> list[dict[str, Any]]:
+    if url_name.startswith("ash_prime"):
+        return [
+            {
+                "id": item["id"],
+                "url_name": item["url_name"],
+                "set_root": item["url_name"].endswith("_set"),
+                "tags": ["prime", "warframe"],
+                "ducats": None if item["url_name"].endswith("_set") else 45,
+                "mastery_level": 0,
+            }
+            for item in ASH_PRIME
+        ]
+
+    return [{"id": FAKE_ITEM_LIST[0]["id"], "set_root": False, "tags": ["weapon", "secondary"], "mastery_level": 11}]
+
+
+class TestItemEnrichment:
+    @pytest.fixture(autouse=True)
+    async def get_item_details(self) -> AsyncGenerator[AsyncMock, Any]:
+        with (
+            patch("api.market.enrichment.get_item_details", new_callable=AsyncMock) as mocked_func,
+            patch("api.market.enrichment.enrichment_budget", TokenBucket(1.0, burst=100)),
+        ):
+            mocked_func.side_effect = fake_details
+            yield mocked_func
+
+    @pytest.fixture
+    def enricher(self, dbsession: AsyncSession) -> ItemEnricher:
+        return ItemEnricher(async_sessionmaker(dbsession.bind, expire_on_commit=False))
+
+    @pytest.fixture(autouse=True)
+    def empty_item_names(self) -> Iterator[None]:
+        yield
+        item_names.rebuild([])
+
+    async def items(self, dbsession: AsyncSession) -> dict[str, WarframeItemModel]:
+        query = await dbsession.scalars(select(WarframeItemModel).execution_options(populate_existing=True))
+
+        return {item.url_name: item for item in query.unique()}
+
+    async def enrichment_jobs(self, dbsession: AsyncSession) -> list[JobModel]:
+        query = await dbsession.scalars(select(JobModel).where(JobModel.kind == ENRICH_JOB).order_by(JobModel.id))
+
+        return list(query.all())
+
+    def test_parts_of_a_set_are_grouped_set_first(self) -> None:
+        pending = {item["id"]: item["url_name"] for item in reversed(CATALOG)}
+
+        assert group_sets(pending) == [
+            [(item["id"], item["url_name"]) for item in ASH_PRIME],
+            [(FAKE_ITEM_LIST[0]["id"], FAKE_ITEM_LIST[0]["url_name"])],
+        ]
+
+    async def test_sync_enqueues_enrichment_once(self, dbsession: AsyncSession) -> None:
+        await sync_catalog(dbsession, {"en": CATALOG})
+        await sync_catalog(dbsession, {"en": CATALOG})
+
+        assert [job.key for job in await self.enrichment_jobs(dbsession)] == [ENRICH_JOB]
+
+    async def test_sets_are_fetched_once_and_written_to_every_part(
+        self,
+        dbsession: AsyncSession,
+        enricher: ItemEnricher,
+        get_item_details: AsyncMock,
+    ) -> None:
+        await sync_catalog(dbsession, {"en": CATALOG})
+
+        await enricher.run(dbsession, {})
+
+        assert sorted(call.args[0] for call in get_item_details.await_args_list) == [
+            "ash_prime_set",
+            "secura_dual_cestra",
+        ]
+
+        items = await self.items(dbsession)
+        assert all(item.enriched_at is not None for item in items.values())
+
+        chassis = items["ash_prime_chassis"]
+        assert (chassis.tags, chassis.ducats, chassis.mastery_level) == (["prime", "warframe"], 45, 0)
+        assert {items[item["url_name"]].set_id for item in ASH_PRIME} == {ASH_PRIME[0]["id"]}
+
+        cestra = items["secura_dual_cestra"]
+        assert (cestra.ducats, cestra.mastery_level, cestra.set_id) == (None, 11, None)
+
+    async def test_changed_items_are_enriched_again(
+        self,
+        dbsession: AsyncSession,
+        enricher: ItemEnricher,
+        get_item_details: AsyncMock,
+    ) -> None:
+        await sync_catalog(dbsession, {"en": CATALOG})
+        await enricher.run(dbsession, {})
+        get_item_details.reset_mock()
+
+        renamed = {**FAKE_ITEM_LIST[0], "thumb": "items/images/en/thumbs/secura_dual_cestra.new.128x128.png"}
+        await sync_catalog(dbsession, {"en": [renamed, *ASH_PRIME]})
+        await enricher.run(dbsession, {})
+
+        assert [call.args[0] for call in get_item_details.await_args_list] == ["secura_dual_cestra"]
+        assert (await self.items(dbsession))["secura_dual_cestra"].thumb == renamed["thumb"]
+
+    async def test_failed_items_are_retried_later(
+        self,
+        dbsession: AsyncSession,
+        enricher: ItemEnricher,
+        get_item_details: AsyncMock,
+    ) -> None:
+        def fail_for_sets(url_name: str) -> list[dict[str, Any]]:
+            if url_name.startswith("ash_prime"):
+                raise HTTPError("Not found")
+
+            return fake_details(url_name)
+
+        get_item_details.side_effect = fail_for_sets
+        await sync_catalog(dbsession, {"en": CATALOG})
+
+        await enricher.run(dbsession, {})
+
+        items = await self.items(dbsession)
+        assert items["secura_dual_cestra"].enriched_at is not None
+        assert all(items[item["url_name"]].enriched_at is None for item in ASH_PRIME)
+        assert {items[item["url_name"]].enrich_attempts for item in ASH_PRIME} == {1}
+
+        # Backing off, they aren't at the head of the next batch
+        get_item_details.reset_mock()
+        await enricher.run(dbsession, {})
+
+        get_item_details.assert_not_awaited()
+
+    async def test_failed_batches_enqueue_a_follow_up(
+        self,
+        dbsession: AsyncSession,
+        enricher: ItemEnricher,
+        get_item_details: AsyncMock,
+    ) -> None:
+        get_item_details.side_effect = HTTPError("Not found")
+        await sync_catalog(dbsession, {"en": CATALOG})
+
+        with patch.object(settings, "enrichment_batch_size", 1):
+            await enricher.run(dbsession, {})
+
+        assert [job.key for job in await self.enrichment_jobs(dbsession)] == [ENRICH_JOB, None]
+
+    async def test_items_out_of_attempts_wait_for_a_change(
+        self,
+        dbsession: AsyncSession,
+        enricher: ItemEnricher,
+        get_item_details: AsyncMock,
+    ) -> None:
+        await sync_catalog(dbsession, {"en": FAKE_ITEM_LIST})
+        await dbsession.execute(
+            update(WarframeItemModel).values(enrich_attempts=settings.enrichment_max_attempts, enrich_after=None),
+        )
+
+        await enricher.run(dbsession, {})
+
+        get_item_details.assert_not_awaited()
+
+        renamed = {**FAKE_ITEM_LIST[0], "item_name": "Secura Dual Cestra Renamed"}
+        await sync_catalog(dbsession, {"en": [renamed]})
+        await enricher.run(dbsession, {})
+
+        assert (await self.items(dbsession))["secura_dual_cestra"].enriched_at is not None
+
+    async def test_full_batches_enqueue_a_follow_up(self, dbsession: AsyncSession, enricher: ItemEnricher) -> None:
+        await sync_catalog(dbsession, {"en": CATALOG})
+
+        with patch.object(settings, "enrichment_batch_size", 1):
+            await enricher.run(dbsession, {})
+
+        assert [job.key for job in await self.enrichment_jobs(dbsession)] == [ENRICH_JOB, None]
+        # The rest of the set is outside of the batch
+        assert [url_name for url_name, item in (await self.items(dbsession)).items() if item.enriched_at] == [
+            "ash_prime_blueprint",
+        ]
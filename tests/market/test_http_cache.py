@@ -0,0 +1,127 @@
+import gzip
+import os
+from pathlib import Path
+
+import httpx
+import pytest
+
+from api.market.http_cache import CachingTransport
+
+ITEMS = b'{"payload": {"items": []}}'
+
+
+class FakeUpstream:
+    def __init__(self) -> None:
+        self.requests: list[httpx.Request] = []
+        self.headers = {"ETag": '"items-1"'}
+        self.error: int | None = None
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+
+        if self.error is not None:
+            return httpx.Response(self.error)
+
+        if "ETag" in self.headers and request.headers.get("If-None-Match") == self.headers["ETag"]:
+            return httpx.Response(304, headers=self.headers)
+
+        language = request.headers.get("Language", "en").encode()
+        return httpx.Response(
+            200,
+            headers={**self.headers, "Content-Encoding": "gzip"},
+            content=gzip.compress(ITEMS + language),
+        )
+
+
+@pytest.fixture
+def upstream() -> FakeUpstream:
+    return FakeUpstream()
+
+
+def client(upstream: FakeUpstream, directory: Path, stale_if_error: float = 3600.0) -> httpx.AsyncClient:
+    transport = CachingTransport(
+        httpx.MockTransport(upstream.handle),
+        directory,
+        max_bytes=2**20,
+        stale_if_error=stale_if_error,
+    )
+
+    return httpx.AsyncClient(base_url="https://api.warframe.market/v1", transport=transport)
+
+
+class TestCachingTransport:
+    async def test_responses_are_revalidated_across_workers(self, tmp_path: Path, upstream: FakeUpstream) -> None:
+        first = await client(upstream, tmp_path).get("/items")
+        second = await client(upstream, tmp_path).get("/items")
+
+        assert first.content == second.content == ITEMS + b"en"
+        assert second.status_code == httpx.codes.OK
+        assert "If-None-Match" not in upstream.requests[0].headers
+        assert upstream.requests[1].headers["If-None-Match"] == '"items-1"'
+
+    async def test_last_modified_is_revalidated(self, tmp_path: Path, upstream: FakeUpstream) -> None:
+        upstream.headers = {"Last-Modified": "Sat, 19 Oct 2024 00:00:00 GMT"}
+        cached = client(upstream, tmp_path)
+
+        await cached.get("/items")
+        await cached.get("/items")
+
+        assert upstream.requests[1].headers["If-Modified-Since"] == "Sat, 19 Oct 2024 00:00:00 GMT"
+
+    async def test_fresh_responses_are_served_without_asking(self, tmp_path: Path, upstream: FakeUpstream) -> None:
+        upstream.headers = {"Cache-Control": "public, max-age=60"}
+        cached = client(upstream, tmp_path)
+
+        await cached.get("/items")
+        response = await cached.get("/items")
+
+        assert response.content == ITEMS + b"en"
+        assert len(upstream.requests) == 1
+
+    async def test_languages_are_cached_separately(self, tmp_path: Path, upstream: FakeUpstream) -> None:
+        cached = client(upstream, tmp_path)
+
+        await cached.get("/items")
+        response = await cached.get("/items", headers={"Language": "de"})
+
+        assert response.content == ITEMS + b"de"
+        assert "If-None-Match" not in upstream.requests[1].headers
+
+    async def test_stale_responses_are_served_on_errors(self, tmp_path: Path, upstream: FakeUpstream) -> None:
+        cached = client(upstream, tmp_path)
+        await cached.get("/items")
+
+        upstream.error = 503
+        response = await cached.get("/items")
+
+        assert response.status_code == httpx.codes.OK
+        assert response.content == ITEMS + b"en"
+
+        def refuse(request: httpx.Request) -> httpx.Response:
+            raise httpx.ConnectError("Connection refused", request=request)
+
+        upstream.handle = refuse
+        response = await client(upstream, tmp_path).get("/items")
+
+        assert response.content == ITEMS + b"en"
+
+    async def test_errors_pass_through_past_the_stale_window(self, tmp_path: Path, upstream: FakeUpstream) -> None:
+        cached = client(upstream, tmp_path, stale_if_error=60.0)
+        await cached.get("/items")
+        for path in (tmp_path / "responses").glob("*/*"):
+            os.utime(path, (0, 0))
+
+        upstream.error = 503
+        response = await cached.get("/items")
+
+        assert response.status_code == httpx.codes.SERVICE_UNAVAILABLE
+
+    async def test_uncacheable_responses_are_not_stored(self, tmp_path: Path, upstream: FakeUpstream) -> None:
+        upstream.headers = {"ETag": '"items-1"', "Cache-Control": "no-store"}
+        cached = client(upstream, tmp_path)
+
+        await cached.get("/items")
+        await cached.get("/items")
+
+        assert "If-None-Match" not in upstream.requests[1].headers
+        assert not list(tmp_path.glob("responses/*/*"))
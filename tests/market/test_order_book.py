@@ -0,0 +1,88 @@
+from api.market.order_book import OrderBook, OrderBookDiff
+from tests.market.test_prices import fake_order
+
+ITEM_ID = "54aae292e7798909064f1575"
+
+
+class TestOrderBook:
+    def book(self) -> OrderBook:
+        book = OrderBook(ITEM_ID)
+        book.apply(
+            [
+                fake_order("a", "sell", 15, quantity=2),
+                fake_order("b", "sell", 10),
+                fake_order("c", "sell", 10, quantity=4),
+                fake_order("d", "sell", 20, quantity=5),
+                fake_order("e", "buy", 8),
+                fake_order("f", "buy", 6, quantity=3),
+            ],
+        )
+
+        return book
+
+    def test_offline_and_hidden_orders_are_left_out(self) -> None:
+        book = OrderBook(ITEM_ID)
+        hidden = {**fake_order("b", "sell", 5), "visible": False}
+
+        diff = book.apply([fake_order("a", "sell", 5, status="offline"), hidden, fake_order("c", "sell", 9)])
+
+        assert diff == OrderBookDiff(added=1)
+        assert [order.id for order in book.sell.best(5)] == ["c"]
+
+    def test_best_is_ordered_by_price(self) -> None:
+        book = self.book()
+
+        assert [order.id for order in book.sell.best(3)] == ["b", "c", "a"]
+        assert [order.id for order in book.buy.best(5)] == ["e", "f"]
+
+    def test_quantity_frontier_keeps_sellers_offering_more_than_cheaper_ones(self) -> None:
+        book = self.book()
+
+        assert book.sell.quantity_frontier() == ([10, 10, 20], [1, 4, 5])
+        assert OrderBook(ITEM_ID).sell.quantity_frontier() == ([], [])
+
+    def test_quantity_by_price(self) -> None:
+        book = self.book()
+
+        assert book.sell.quantity_at_or_below(9) == 0
+        assert book.sell.quantity_at_or_below(10) == 5
+        assert book.sell.quantity_at_or_below(19) == 7
+        assert book.sell.quantity_at_or_below(100) == 12
+        assert book.buy.quantity_at_or_above(7) == 1
+        assert book.buy.quantity_at_or_above(1) == 4
+
+    def test_best_with_quantity(self) -> None:
+        book = self.book()
+        seller = book.sell.best_with_quantity(3)
+
+        assert seller is not None
+        assert (seller.id, seller.platinum) == ("c", 10)
+        assert book.sell.best_with_quantity(6) is None
+
+    def test_apply_only_changes_the_difference(self) -> None:
+        book = self.book()
+
+        diff = book.apply(
+            [
+                fake_order("a", "sell", 15, quantity=1),
+                fake_order("b", "sell", 12),
+                fake_order("c", "sell", 10, quantity=4),
+                fake_order("e", "buy", 8),
+                fake_order("f", "buy", 6, quantity=3),
+                fake_order("g", "buy", 9),
+            ],
+        )
+
+        assert diff == OrderBookDiff(added=1, changed=2, removed=1)
+        assert [order.id for order in book.sell.best(5)] == ["c", "b", "a"]
+        assert book.sell.quantity_at_or_below(12) == 5
+        assert book.buy.best_price() == 9
+
+    def test_emptied_book(self) -> None:
+        book = self.book()
+
+        book.apply([])
+
+        assert book.sell.best_price() is None
+        assert book.sell.quantity_at_or_below(100) == 0
+        assert book.buy.quantity_at_or_above(0) == 0
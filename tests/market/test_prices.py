@@ -0,0 +1,242 @@
+import asyncio
+import json
+import math
+from collections.abc import AsyncGenerator, Iterator
+from datetime import datetime, timedelta
+from typing import Any, cast
+from unittest.mock import AsyncMock, patch
+
+import asyncpg
+import pytest
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from api.database.crud.followers import item_followers_dao
+from api.database.crud.jobs import job_dao
+from api.database.crud.tracking import order_tracking_dao
+from api.database.models.warframe.followers import ItemFollowersModel
+from api.database.models.warframe.items import WarframeItemModel
+from api.events.prices import item_topic, latest_prices, price_broker
+from api.jobs.worker import JobWorker
+from api.market import prices
+from api.market.prices import POLL_JOB, PricePoller
+from api.market.scheduler import PollScheduler
+from api.market.summaries import SummaryCache
+from api.routers.schemas.tracking import OrderCreate
+from tests.routers.warframe.utils import FAKE_ITEM_LIST
+
+UNTRACKED_ITEM = {
+    "id": "5835a4564b0916d2e8a1e18f",
+    "item_name": "Ash Prime Set",
+    "thumb": "items/images/en/thumbs/ash_prime_set.128x128.png",
+    "url_name": "ash_prime_set",
+}
+
+
+def fake_order(
+    order_id: str,
+    order_type: str,
+    platinum: int,
+    quantity: int = 1,
+    status: str = "ingame",
+) -> dict[str, Any]:
+    return {
+        "id": order_id,
+        "order_type": order_type,
+        "platinum": platinum,
+        "quantity": quantity,
+        "visible": True,
+        "user": {"ingame_name": f"player-{order_id}", "status": status},
+    }
+
+
+FAKE_ORDERS = [
+    fake_order("a", "sell", 12, quantity=3),
+    fake_order("b", "sell", 9),
+    fake_order("c", "sell", 1, status="offline"),
+    fake_order("d", "buy", 7),
+]
+
+
+class TestPricePoller:
+    @pytest.fixture(autouse=True)
+    async def get_item_orders(self) -> AsyncGenerator[AsyncMock, Any]:
+        with (
+            patch("api.market.prices.get_item_orders", new_callable=AsyncMock) as mocked_func,
+            patch("api.market.prices.summary_cache", SummaryCache(depth=10, ttl=600)),
+        ):
+            mocked_func.return_value = FAKE_ORDERS
+            yield mocked_func
+
+        latest_prices.clear()
+
+    @pytest.fixture
+    async def poller(self, dbsession: AsyncSession) -> PricePoller:
+        dbsession.add_all([WarframeItemModel(**FAKE_ITEM_LIST[0]), WarframeItemModel(**UNTRACKED_ITEM)])
+        await dbsession.flush()
+
+        await order_tracking_dao.create(
+            dbsession,
+            obj=OrderCreate(user_id=1234, platinum_threshold=10, minimum_quantity=1, item_id=FAKE_ITEM_LIST[0]["id"]),
+        )
+
+        return PricePoller(
+            async_sessionmaker(dbsession.bind, expire_on_commit=False),
+            # Every item is due again almost straight away
+            scheduler=PollScheduler(budget=1000.0, min_interval=0.001, max_interval=0.005),
+            # Polls are never held back either
+            rate=math.inf,
+            demand_interval=1.0,
+            alert_cooldown=timedelta(hours=1),
+        )
+
+    @pytest.fixture(autouse=True)
+    def listener(self, poller: PricePoller) -> Iterator[AsyncMock]:
+        """Deliver summaries straight to the poller, in place of the Postgres listener."""
+
+        async def notify(_session: AsyncSession, message: str) -> None:  # noqa: RUF029
+            poller.handle_summary_notification(message)
+
+        with patch("api.market.prices.notify_book_summary", side_effect=notify) as mocked_func:
+            yield mocked_func
+
+    @pytest.fixture
+    def worker(self, poller: PricePoller) -> JobWorker:
+        return JobWorker(
+            poller.session_factory,
+            {POLL_JOB: poller.poll_item},
+            batch_size=10,
+            concurrency=10,
+            max_attempts=1,
+            lease=timedelta(minutes=1),
+            backoff=timedelta(seconds=5),
+            retention=timedelta(days=1),
+        )
+
+    async def poll(self, poller: PricePoller, worker: JobWorker) -> int:
+        await asyncio.sleep(0.01)
+        await poller.report_followers()
+        await poller.refresh_demand()
+        await poller.enqueue_due()
+
+        polled = await worker.run_once()
+        await worker.join()
+
+        return polled
+
+    async def test_only_followed_items_are_polled(
+        self,
+        poller: PricePoller,
+        worker: JobWorker,
+        get_item_orders: AsyncMock,
+    ) -> None:
+        assert await self.poll(poller, worker) == 1
+        get_item_orders.assert_awaited_once_with(FAKE_ITEM_LIST[0]["url_name"])
+
+        async with price_broker.subscribe(item_topic(UNTRACKED_ITEM["id"])):
+            assert await self.poll(poller, worker) == 2
+
+        assert get_item_orders.await_count == 3
+        assert poller.scheduler.items[UNTRACKED_ITEM["id"]].demand.subscribers == 1
+
+    async def test_items_are_only_polled_when_due(
+        self,
+        poller: PricePoller,
+        worker: JobWorker,
+        get_item_orders: AsyncMock,
+    ) -> None:
+        poller.scheduler = PollScheduler(budget=1.0, min_interval=60, max_interval=600)
+        await self.poll(poller, worker)
+
+        assert await poller.enqueue_due() == 0
+        get_item_orders.assert_awaited_once()
+
+    async def test_queued_polls_are_not_duplicated(self, dbsession: AsyncSession, poller: PricePoller) -> None:
+        await poller.refresh_demand()
+        assert await poller.enqueue_due() == 1
+
+        # Due again before the first poll ran
+        await asyncio.sleep(0.01)
+        assert await poller.enqueue_due() == 0
+
+        assert await job_dao.queue_depth(dbsession) == {POLL_JOB: 1}
+
+    async def test_unchanged_prices_are_not_republished(self, poller: PricePoller, worker: JobWorker) -> None:
+        async with price_broker.subscribe(item_topic(FAKE_ITEM_LIST[0]["id"])) as subscription:
+            assert await self.poll(poller, worker) == 1
+            assert await self.poll(poller, worker) == 1
+
+            message = json.loads(await subscription.get() or "")
+
+            with pytest.raises(TimeoutError):
+                await asyncio.wait_for(subscription.get(), 0.01)
+
+        assert message["item_id"] == FAKE_ITEM_LIST[0]["id"]
+        assert (message["best_sell"], message["best_buy"], message["sellers"], message["buyers"]) == (9, 7, 2, 1)
+
+    async def test_polls_are_shared_through_summaries(self, poller: PricePoller, worker: JobWorker) -> None:
+        await self.poll(poller, worker)
+
+        book = poller.books[FAKE_ITEM_LIST[0]["id"]]
+        assert book.sell.best_price() == 9
+        assert book.sell.quantity_at_or_below(12) == 4
+
+        summary = prices.summary_cache.get(FAKE_ITEM_LIST[0]["id"])
+        assert summary is not None
+        assert [order.platinum for order in summary.sellers] == [9, 12]
+        assert poller.scheduler.items[FAKE_ITEM_LIST[0]["id"]].best_sell == 9
+
+    async def test_followers_of_every_worker_are_added_up(self, dbsession: AsyncSession, poller: PricePoller) -> None:
+        await item_followers_dao.report(dbsession, worker="other", followers={UNTRACKED_ITEM["id"]: 2})
+        await item_followers_dao.report(dbsession, worker="gone", followers={UNTRACKED_ITEM["id"]: 5})
+        await dbsession.execute(
+            update(ItemFollowersModel)
+            .where(ItemFollowersModel.worker == "gone")
+            .values(reported_at=datetime(2000, 1, 1)),  # noqa: DTZ001
+        )
+
+        async with price_broker.subscribe(item_topic(UNTRACKED_ITEM["id"])):
+            await poller.report_followers()
+
+        await poller.refresh_demand()
+
+        assert poller.scheduler.items[UNTRACKED_ITEM["id"]].demand.subscribers == 3
+        # Stale reports are ignored, and removed
+        assert await item_followers_dao.select_(dbsession, filters=ItemFollowersModel.worker == "gone") == []
+
+    async def test_polls_are_spaced_by_the_rate(self, dbsession: AsyncSession, poller: PricePoller) -> None:
+        poller.rate = 0.5
+        async with price_broker.subscribe(item_topic(UNTRACKED_ITEM["id"])):
+            await poller.report_followers()
+
+        await poller.refresh_demand()
+        assert await poller.enqueue_due() == 2
+
+        # The first one runs straight away, by the database's clock
+        first, second = sorted(job.run_at for job in await job_dao.select_(dbsession))
+        assert second - first >= timedelta(seconds=2)
+
+    async def test_only_one_worker_schedules(self, _engine: AsyncEngine, poller: PricePoller) -> None:
+        dsn = _engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
+        first, second = [cast(asyncpg.Connection, await asyncpg.connect(dsn)) for _ in range(2)]  # pyright: ignore[reportUnknownMemberType]
+
+        try:
+            assert await poller.claim_scheduler(first)
+            assert not await poller.claim_scheduler(second)
+
+            await first.close()
+
+            assert await poller.claim_scheduler(second)
+        finally:
+            await first.close()
+            await second.close()
+
+    async def test_items_without_summaries_are_forgotten(self, poller: PricePoller, worker: JobWorker) -> None:
+        await self.poll(poller, worker)
+        assert FAKE_ITEM_LIST[0]["id"] in poller.books
+
+        await asyncio.sleep(0.02)
+        poller.forget_stale()
+
+        assert poller.books == {}
+        assert prices.summary_cache.get(FAKE_ITEM_LIST[0]["id"]) is None
@@ -0,0 +1,79 @@
+import pytest
+
+from api.market.scheduler import ItemDemand, PollScheduler, allocate_intervals
+
+
+class TestAllocateIntervals:
+    def test_budget_is_split_by_score(self) -> None:
+        intervals = allocate_intervals({"hot": 3.0, "cold": 1.0}, 1.0, min_interval=0.1, max_interval=100)
+
+        assert intervals["hot"] == pytest.approx(4 / 3)
+        assert intervals["cold"] == pytest.approx(4)
+
+    def test_capped_items_leave_budget_to_others(self) -> None:
+        intervals = allocate_intervals({"hot": 8.0, "warm": 1.0, "cold": 1.0}, 2.0, min_interval=1, max_interval=100)
+
+        assert intervals["hot"] == 1
+        assert intervals["warm"] == pytest.approx(2)
+        assert intervals["cold"] == pytest.approx(2)
+
+    def test_items_are_polled_at_least_every_max_interval(self) -> None:
+        intervals = allocate_intervals({"a": 1.0, "b": 1.0}, 0.001, min_interval=1, max_interval=60)
+
+        assert intervals == {"a": 60, "b": 60}
+
+
+class TestPollScheduler:
+    def scheduler(self) -> PollScheduler:
+        return PollScheduler(budget=1.0, min_interval=1, max_interval=600)
+
+    def test_new_items_are_due_immediately(self) -> None:
+        scheduler = self.scheduler()
+        scheduler.update_demand({"a": ItemDemand("a"), "b": ItemDemand("b")}, now=0)
+
+        assert {item.item_id for item in scheduler.pop_due(0)} == {"a", "b"}
+        assert scheduler.pop_due(0) == []
+
+    def test_in_demand_items_are_polled_more_often(self) -> None:
+        scheduler = self.scheduler()
+        scheduler.update_demand(
+            {
+                "idle": ItemDemand("idle"),
+                "tracked": ItemDemand("tracked", trackers=50, subscribers=3),
+            },
+            now=0,
+        )
+
+        assert scheduler.items["tracked"].interval < scheduler.items["idle"].interval
+
+    def test_prices_near_threshold_and_volatile_prices_raise_priority(self) -> None:
+        scheduler = self.scheduler()
+        scheduler.update_demand({"near": ItemDemand("near", threshold=95), "far": ItemDemand("far", threshold=10)}, 0)
+        scheduler.pop_due(0)
+
+        scheduler.record_poll("near", 100, now=1)
+        scheduler.record_poll("far", 100, now=1)
+        assert scheduler.items["near"].score() > scheduler.items["far"].score()
+
+        before = scheduler.items["far"].score()
+        scheduler.record_poll("far", 50, now=2)
+        assert scheduler.items["far"].score() > before
+
+    def test_recorded_poll_is_due_after_interval(self) -> None:
+        scheduler = self.scheduler()
+        scheduler.update_demand({"a": ItemDemand("a")}, now=0)
+        scheduler.pop_due(0)
+
+        scheduler.record_poll("a", 10, now=5)
+        interval = scheduler.items["a"].interval
+
+        assert scheduler.wait_time(5) == pytest.approx(interval)
+        assert scheduler.pop_due(5 + interval - 0.01) == []
+        assert [item.item_id for item in scheduler.pop_due(5 + interval)] == ["a"]
+
+    def test_removed_items_are_no_longer_due(self) -> None:
+        scheduler = self.scheduler()
+        scheduler.update_demand({"a": ItemDemand("a")}, now=0)
+
+        assert scheduler.update_demand({}, now=0) == {"a"}
+        assert scheduler.pop_due(0) == []
@@ -0,0 +1,67 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from api.market.sketches import TDigest, cover_window
+
+HOUR = timedelta(hours=1)
+DAY = timedelta(days=1)
+
+
+class TestTDigest:
+    def test_merged_digests_estimate_quantiles_closely(self) -> None:
+        rng = np.random.default_rng(0)
+        values = np.round(rng.lognormal(3.0, 1.0, 100_000))
+
+        digest = TDigest.merge([TDigest.of(part, 100) for part in np.array_split(values, 200)], 100)
+        quantiles = [0.01, 0.1, 0.5, 0.9, 0.99]
+
+        # Compared by rank, prices repeat too often for their values to compare meaningfully
+        ranks = np.searchsorted(np.sort(values), digest.quantiles(quantiles)) / len(values)
+        assert np.allclose(ranks, quantiles, atol=0.01)
+        assert len(digest) == len(values)
+        assert len(digest.means) <= 60
+        assert (digest.minimum, digest.maximum) == (values.min(), values.max())
+
+    def test_few_values_are_kept_exactly(self) -> None:
+        digest = TDigest.empty(100).add([30]).add([10]).add([20])
+
+        assert digest.quantiles([0, 0.5, 1]) == [10, 20, 30]
+        assert digest.mean() == 20
+
+    def test_encoding_round_trips(self) -> None:
+        digest = TDigest.of([5, 1, 3, 3, 1000], 100)
+
+        decoded = TDigest.from_bytes(digest.to_bytes())
+
+        assert np.array_equal(decoded.means, digest.means)
+        assert np.array_equal(decoded.weights, digest.weights)
+        assert (decoded.minimum, decoded.maximum, decoded.compression) == (1, 1000, 100)
+
+    def test_empty_digests_have_no_quantiles(self) -> None:
+        digest = TDigest.from_bytes(TDigest.merge([TDigest.empty(100)] * 3, 100).to_bytes())
+
+        assert len(digest) == 0
+        assert np.isnan(digest.quantiles([0.5])).all()
+
+
+class TestCoverWindow:
+    def test_windows_use_the_widest_buckets_that_fit(self) -> None:
+        since = datetime(2024, 1, 1, 22, 30)  # noqa: DTZ001
+        until = datetime(2024, 1, 4, 1, 10)  # noqa: DTZ001
+
+        buckets = cover_window(since, until, [HOUR, DAY])
+
+        assert buckets == [
+            (HOUR, datetime(2024, 1, 1, 22)),  # noqa: DTZ001
+            (HOUR, datetime(2024, 1, 1, 23)),  # noqa: DTZ001
+            (DAY, datetime(2024, 1, 2)),  # noqa: DTZ001
+            (DAY, datetime(2024, 1, 3)),  # noqa: DTZ001
+            (HOUR, datetime(2024, 1, 4, 0)),  # noqa: DTZ001
+            (HOUR, datetime(2024, 1, 4, 1)),  # noqa: DTZ001
+        ]
+
+    def test_windows_narrower_than_a_wide_bucket_use_narrow_ones(self) -> None:
+        since = datetime(2024, 1, 1, 5)  # noqa: DTZ001
+
+        assert cover_window(since, since + 2 * HOUR, [HOUR, DAY]) == [(HOUR, since), (HOUR, since + HOUR)]
@@ -0,0 +1,50 @@
+from pathlib import Path
+
+import pytest
+
+from api.market.snapshot import CatalogSnapshot, encode_snapshot, map_snapshot, write_snapshot
+from api.routers.schemas.items import WarframeItemRow
+
+ITEMS = [
+    WarframeItemRow(id="1", thumb="kamas.png", item_name="Dual Kamas", url_name="dual_kamas"),
+    WarframeItemRow(id="2", thumb="cestra.png", item_name="Секура Двойные Цестры", url_name="secura_dual_cestra"),
+]
+KEYS = sorted([("dual kamas", 0), ("kamas", 0), ("dual cestra", 1), ("секура", 1), ("dual", 1)])
+
+
+class TestCatalogSnapshot:
+    def test_items_and_keys_are_read_back(self) -> None:
+        snapshot = CatalogSnapshot(encode_snapshot(ITEMS, KEYS, {"": [1, 0]}, version=7))
+
+        assert (snapshot.version, len(snapshot)) == (7, 2)
+        assert [snapshot.item(rank) for rank in range(len(snapshot))] == ITEMS
+
+        assert list(snapshot.ranks(*snapshot.span("dual"))) == [1, 1, 0]
+        assert list(snapshot.ranks(*snapshot.span("сек"))) == [1]
+        assert list(snapshot.ranks(*snapshot.span("xyz"))) == []
+
+        assert list(snapshot.wide("") or []) == [1, 0]
+        assert snapshot.wide("dual") is None
+
+    def test_files_are_replaced_whole(self, tmp_path: Path) -> None:
+        path = tmp_path / "catalog.snapshot"
+
+        write_snapshot(path, encode_snapshot(ITEMS, KEYS, {}, version=1))
+        first, first_stat = map_snapshot(path)
+        write_snapshot(path, encode_snapshot(ITEMS[:1], KEYS, {}, version=2))
+        second, second_stat = map_snapshot(path)
+
+        # The old map stays readable after its file is replaced
+        assert (first.version, first.item(1)) == (1, ITEMS[1])
+        assert (second.version, len(second)) == (2, 1)
+        assert first_stat.st_ino != second_stat.st_ino
+        assert [file.name for file in tmp_path.iterdir()] == ["catalog.snapshot"]
+
+    def test_other_files_are_rejected(self) -> None:
+        for data in (
+            b"",
+            b"not a snapshot" * 10,
+            encode_snapshot([], [], {}, version=1).replace(b"ORDISCAT", b"ORDISCAX"),
+        ):
+            with pytest.raises(ValueError):
+                CatalogSnapshot(data)
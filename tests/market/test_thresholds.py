@@ -0,0 +1,70 @@
+import uuid
+
+import numpy as np
+
+from api.market.order_book import OrderBook
+from api.market.thresholds import ItemThresholds, ThresholdIndex, TrackerThreshold
+from tests.market.test_prices import fake_order
+
+ITEM_ID = "54aae292e7798909064f1575"
+
+
+def trackers(*pairs: tuple[int, int]) -> list[TrackerThreshold]:
+    return [(uuid.UUID(int=n + 1), n, threshold, quantity) for n, (threshold, quantity) in enumerate(pairs)]
+
+
+def book(*orders: tuple[int, int]) -> OrderBook:
+    order_book = OrderBook(ITEM_ID)
+    order_book.apply(fake_order(str(n), "sell", platinum, quantity) for n, (platinum, quantity) in enumerate(orders))
+
+    return order_book
+
+
+class TestThresholdIndex:
+    def test_trackers_need_a_single_seller_with_their_quantity(self) -> None:
+        index = ThresholdIndex(ttl=60)
+        loaded = trackers((10, 1), (10, 3), (8, 1), (12, 5), (11, 3))
+        index.load(ITEM_ID, loaded)
+
+        triggered = index.triggered(book((9, 1), (11, 3), (20, 10)))
+
+        assert sorted(triggered) == [loaded[0][0], loaded[4][0]]
+
+    def test_empty_books_trigger_nothing(self) -> None:
+        index = ThresholdIndex(ttl=60)
+        index.load(ITEM_ID, trackers((10, 1)))
+
+        assert index.triggered(book()) == []
+        assert index.triggered(OrderBook("unknown")) == []
+
+    def test_removing_keeps_the_remaining_trackers_contiguous(self) -> None:
+        item = ItemThresholds(0.0, capacity=2)
+        loaded = trackers(*((threshold, 1) for threshold in range(10)))
+        for tracker in loaded:
+            item.add(*tracker)
+
+        for tracker_id, *_ in loaded[::3]:
+            assert item.remove(tracker_id)
+        assert not item.remove(loaded[0][0])
+
+        remaining = [tracker for n, tracker in enumerate(loaded) if n % 3]
+        assert len(item) == len(remaining)
+        assert sorted(item.user_ids().tolist()) == [user_id for _, user_id, _, _ in remaining]
+        assert sorted(item.triggered(np.array([5]), np.array([1]))) == sorted(
+            tracker_id for tracker_id, _, threshold, _ in remaining if threshold >= 5
+        )
+
+    def test_changes_only_apply_to_loaded_items(self) -> None:
+        index = ThresholdIndex(ttl=60)
+        [tracker] = trackers((10, 1))
+
+        index.add(ITEM_ID, tracker)
+        assert index.is_stale(ITEM_ID)
+
+        index.load(ITEM_ID, [])
+        index.add(ITEM_ID, tracker)
+        assert not index.is_stale(ITEM_ID)
+        assert index.triggered(book((9, 1))) == [tracker[0]]
+
+        index.remove([(tracker[0], ITEM_ID)])
+        assert len(index) == 0
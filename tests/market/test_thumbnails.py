@@ -0,0 +1,98 @@
+import asyncio
+import os
+from collections.abc import Iterator
+from pathlib import Path
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from api.market.thumbnails import ThumbnailCache
+
+IMAGES = {
+    "items/images/en/thumbs/ash_prime_set.png": b"ash" * 100,
+    "items/images/en/thumbs/ash_prime_set.old.png": b"ash" * 100,
+    "items/images/en/thumbs/secura_dual_cestra.png": b"cestra" * 100,
+}
+
+
+class FakeStatic:
+    def __init__(self) -> None:
+        self.requests: list[str] = []
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path.removeprefix("/static/assets/")
+        self.requests.append(path)
+
+        if path not in IMAGES:
+            return httpx.Response(404)
+
+        return httpx.Response(200, content=IMAGES[path])
+
+
+@pytest.fixture
+def static() -> Iterator[FakeStatic]:
+    fake = FakeStatic()
+    client = httpx.AsyncClient(
+        base_url="https://warframe.market/static/assets",
+        transport=httpx.MockTransport(fake.handle),
+    )
+
+    with patch("api.market.thumbnails.warframe_market_static", client):
+        yield fake
+
+
+class TestThumbnailCache:
+    async def test_thumbnails_are_fetched_once(self, tmp_path: Path, static: FakeStatic) -> None:
+        cache = ThumbnailCache(tmp_path, max_bytes=2**20)
+        thumb = "items/images/en/thumbs/ash_prime_set.png"
+
+        first, second = await asyncio.gather(cache.get(thumb), cache.get(thumb))
+        third = await ThumbnailCache(tmp_path, max_bytes=2**20).get(thumb)
+
+        assert static.requests == [thumb]
+        assert first == second
+        assert third.path == first.path
+        assert first.path.read_bytes() == IMAGES[thumb]
+
+    async def test_identical_images_are_stored_once(self, tmp_path: Path, static: FakeStatic) -> None:
+        cache = ThumbnailCache(tmp_path, max_bytes=2**20)
+
+        old = await cache.get("items/images/en/thumbs/ash_prime_set.old.png")
+        new = await cache.get("items/images/en/thumbs/ash_prime_set.png")
+
+        assert old.path == new.path
+        assert old.etag == new.etag
+        assert len(list((tmp_path / "blobs").glob("*/*"))) == 1
+
+    async def test_least_recently_used_images_are_evicted(self, tmp_path: Path, static: FakeStatic) -> None:
+        cache = ThumbnailCache(tmp_path, max_bytes=700)
+
+        ash = await cache.get("items/images/en/thumbs/ash_prime_set.png")
+        os.utime(ash.path, (0, 0))
+        cestra = await cache.get("items/images/en/thumbs/secura_dual_cestra.png")
+
+        assert not ash.path.exists()
+        assert cestra.path.exists()
+        assert cache.lookup("items/images/en/thumbs/ash_prime_set.png") is None
+
+    async def test_prewarming_skips_cached_and_missing_thumbnails(self, tmp_path: Path, static: FakeStatic) -> None:
+        cache = ThumbnailCache(tmp_path, max_bytes=2**20)
+        await cache.get("items/images/en/thumbs/ash_prime_set.png")
+
+        fetched = await cache.prewarm([*IMAGES, "items/images/en/thumbs/missing.png"], concurrency=2)
+
+        assert fetched == 2
+        assert static.requests.count("items/images/en/thumbs/ash_prime_set.png") == 1
+        assert "items/images/en/thumbs/missing.png" in static.requests
+
+    def test_one_worker_per_host_holds_a_lock(self, tmp_path: Path) -> None:
+        first, second = ThumbnailCache(tmp_path, max_bytes=2**20), ThumbnailCache(tmp_path, max_bytes=2**20)
+
+        with first.exclusive("prewarm") as held:
+            assert held
+            with second.exclusive("prewarm") as also_held:
+                assert not also_held
+
+        with second.exclusive("prewarm") as held:
+            assert held
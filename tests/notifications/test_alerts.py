@@ -0,0 +1,84 @@
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.database.crud.tracking import order_tracking_dao
+from api.database.models.notifications import NotificationOutboxModel
+from api.database.models.warframe.items import WarframeItemModel
+from api.market.order_book import OrderBook
+from api.notifications.alerts import evaluate_order_book
+from api.routers.schemas.tracking import OrderCreate
+from api.settings import settings
+from tests.market.test_prices import fake_order
+from tests.routers.warframe.utils import FAKE_ITEM_LIST
+
+ITEM_ID = FAKE_ITEM_LIST[0]["id"]
+
+
+class TestEvaluateOrderBook:
+    @pytest.fixture(autouse=True)
+    async def trackers(self, dbsession: AsyncSession, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(settings, "notification_webhook_url", "http://webhook.test/alerts")
+        # Left behind by other tests, whose trackers were rolled back
+        order_tracking_dao.thresholds.clear()
+
+        dbsession.add(WarframeItemModel(**FAKE_ITEM_LIST[0]))
+        await dbsession.flush()
+
+        for user_id, (threshold, quantity) in enumerate([(10, 1), (10, 3), (8, 1), (12, 5)], start=1):
+            await order_tracking_dao.create(
+                dbsession,
+                obj=OrderCreate(
+                    user_id=user_id, platinum_threshold=threshold, minimum_quantity=quantity, item_id=ITEM_ID
+                ),
+            )
+
+    def book(self) -> OrderBook:
+        book = OrderBook(ITEM_ID)
+        book.apply([fake_order("a", "sell", 9), fake_order("b", "sell", 11, quantity=3), fake_order("c", "buy", 20)])
+
+        return book
+
+    async def test_orders_satisfied_by_a_single_seller_alert(self, dbsession: AsyncSession) -> None:
+        assert await evaluate_order_book(dbsession, self.book(), cooldown=timedelta(hours=1)) == 1
+
+        notifications = (await dbsession.scalars(select(NotificationOutboxModel))).all()
+        assert [(row.user_id, row.payload["platinum"]) for row in notifications] == [(1, 9)]
+
+    async def test_alerted_orders_wait_for_cooldown(self, dbsession: AsyncSession) -> None:
+        assert await evaluate_order_book(dbsession, self.book(), cooldown=timedelta(hours=1)) == 1
+        assert await evaluate_order_book(dbsession, self.book(), cooldown=timedelta(hours=1)) == 0
+        assert await evaluate_order_book(dbsession, self.book(), cooldown=timedelta(0)) == 1
+
+    async def test_trackers_created_and_deleted_after_loading_are_evaluated(self, dbsession: AsyncSession) -> None:
+        assert await evaluate_order_book(dbsession, self.book(), cooldown=timedelta(hours=1)) == 1
+
+        await order_tracking_dao.create(
+            dbsession,
+            obj=OrderCreate(user_id=5, platinum_threshold=11, minimum_quantity=2, item_id=ITEM_ID),
+        )
+        assert await order_tracking_dao.delete(dbsession, pk=[1]) == 1
+
+        notifications = (await dbsession.scalars(select(NotificationOutboxModel))).all()
+        assert await evaluate_order_book(dbsession, self.book(), cooldown=timedelta(0)) == 1
+
+        new = (await dbsession.scalars(select(NotificationOutboxModel))).all()[len(notifications) :]
+        assert [(row.user_id, row.payload["platinum"]) for row in new] == [(5, 11)]
+
+    async def test_deleted_trackers_are_removed_once_committed(self, dbsession: AsyncSession) -> None:
+        # Loads the item's trackers
+        await evaluate_order_book(dbsession, self.book(), cooldown=timedelta(hours=1))
+        tracker = await order_tracking_dao.get_by_user_id(dbsession, user_id=2)
+        assert tracker is not None
+
+        for commit in (False, True):
+            # Works in a savepoint of its own, which it rolls back or releases
+            async with AsyncSession(bind=dbsession.bind, join_transaction_mode="create_savepoint") as session:
+                assert await order_tracking_dao.delete(session, pk=[2]) == 1
+                assert tracker.id in order_tracking_dao.thresholds.items[ITEM_ID]
+
+                await (session.commit() if commit else session.rollback())
+
+            assert (tracker.id in order_tracking_dao.thresholds.items[ITEM_ID]) is not commit
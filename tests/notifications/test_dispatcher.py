@@ -0,0 +1,195 @@
+import json
+from collections.abc import AsyncGenerator
+from datetime import timedelta
+from typing import Any
+from unittest.mock import patch
+
+import httpx
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from api.database.crud.notifications import notification_outbox_dao
+from api.database.crud.tracking import order_tracking_dao
+from api.database.models.notifications import NotificationOutboxModel
+from api.database.models.warframe.items import WarframeItemModel
+from api.database.models.warframe.tracking import UserOrderAlertsModel, WarframeMarketOrderModel
+from api.notifications.alerts import trigger_order_alert
+from api.notifications.dispatcher import NotificationDispatcher
+from api.routers.schemas.notifications import NotificationCreate
+from api.routers.schemas.tracking import OrderCreate
+from api.settings import settings
+from tests.routers.warframe.utils import FAKE_ITEM_LIST
+
+WEBHOOK_URL = "http://webhook.test/alerts"
+
+
+class WebhookStub:
+    """Local stand-in for a webhook, recording every request it receives."""
+
+    def __init__(self, status_code: int = 200) -> None:
+        self.status_code = status_code
+        self.requests: list[tuple[str, dict[str, Any]]] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append((str(request.url), json.loads(request.content)))
+
+        return httpx.Response(self.status_code)
+
+
+class TestNotificationDispatcher:
+    @pytest.fixture(autouse=True)
+    async def webhook_url(self) -> AsyncGenerator[None, Any]:
+        with patch.object(settings, "notification_webhook_url", WEBHOOK_URL):
+            yield
+
+    @pytest.fixture
+    async def order(self, dbsession: AsyncSession) -> WarframeMarketOrderModel:
+        dbsession.add(WarframeItemModel(**FAKE_ITEM_LIST[0]))
+        await dbsession.flush()
+
+        return await order_tracking_dao.create(
+            dbsession,
+            obj=OrderCreate(user_id=1234, platinum_threshold=10, minimum_quantity=1, item_id=FAKE_ITEM_LIST[0]["id"]),
+        )
+
+    def dispatcher(
+        self,
+        dbsession: AsyncSession,
+        webhook: WebhookStub,
+        *,
+        chunk_size: int = 10,
+        max_attempts: int = 5,
+    ) -> NotificationDispatcher:
+        return NotificationDispatcher(
+            async_sessionmaker(dbsession.bind, expire_on_commit=False),
+            httpx.AsyncClient(transport=httpx.MockTransport(webhook)),
+            batch_size=10,
+            chunk_size=chunk_size,
+            concurrency=2,
+            max_attempts=max_attempts,
+            lease=timedelta(minutes=1),
+            send_retries=0,
+        )
+
+    async def outbox(self, dbsession: AsyncSession) -> list[NotificationOutboxModel]:
+        result = await dbsession.execute(
+            select(NotificationOutboxModel)
+            .order_by(NotificationOutboxModel.id)
+            .execution_options(populate_existing=True),
+        )
+
+        return list(result.scalars().all())
+
+    async def test_trigger_order_alert_queues_owner_and_notified_users(
+        self,
+        dbsession: AsyncSession,
+        order: WarframeMarketOrderModel,
+    ) -> None:
+        order.notify_users.append(UserOrderAlertsModel(id=5678))
+        await dbsession.flush()
+
+        await trigger_order_alert(dbsession, order=order, platinum=9, quantity=2)
+
+        rows = await self.outbox(dbsession)
+        assert [row.user_id for row in rows] == [1234, 5678]
+        assert all(row.destination == WEBHOOK_URL for row in rows)
+        assert rows[0].payload["platinum"] == 9
+
+    async def test_dispatch_once_groups_per_destination_and_marks_delivered(
+        self,
+        dbsession: AsyncSession,
+        order: WarframeMarketOrderModel,
+    ) -> None:
+        await trigger_order_alert(dbsession, order=order, platinum=9, quantity=1)
+        await notification_outbox_dao.create_(
+            dbsession,
+            obj=NotificationCreate(destination="http://other.test/alerts", user_id=1, payload={"n": 1}),
+            commit=False,
+        )
+        await notification_outbox_dao.create_(
+            dbsession,
+            obj=NotificationCreate(destination="http://other.test/alerts", user_id=2, payload={"n": 2}),
+            commit=False,
+        )
+        await dbsession.flush()
+
+        webhook = WebhookStub()
+        claimed = await self.dispatcher(dbsession, webhook).dispatch_once()
+
+        assert claimed == 3
+        assert sorted((url, len(body["notifications"])) for url, body in webhook.requests) == [
+            ("http://other.test/alerts", 2),
+            (WEBHOOK_URL, 1),
+        ]
+        assert all(row.delivered_at is not None for row in await self.outbox(dbsession))
+
+        # Delivered rows are never claimed again
+        assert await self.dispatcher(dbsession, webhook).dispatch_once() == 0
+
+    async def test_dispatch_once_with_failing_webhook_schedules_retry(
+        self,
+        dbsession: AsyncSession,
+        order: WarframeMarketOrderModel,
+    ) -> None:
+        await trigger_order_alert(dbsession, order=order, platinum=9, quantity=1)
+        await dbsession.flush()
+
+        webhook = WebhookStub(status_code=500)
+        assert await self.dispatcher(dbsession, webhook).dispatch_once() == 1
+
+        (row,) = await self.outbox(dbsession)
+        assert row.delivered_at is None
+        assert row.attempts == 1
+        assert row.available_at > row.created_at
+
+        # The retry isn't due yet
+        assert await self.dispatcher(dbsession, webhook).dispatch_once() == 0
+
+    async def test_dispatch_once_splits_destinations_into_chunks(
+        self,
+        dbsession: AsyncSession,
+        order: WarframeMarketOrderModel,
+    ) -> None:
+        for user_id in range(5):
+            await notification_outbox_dao.create_(
+                dbsession,
+                obj=NotificationCreate(destination=WEBHOOK_URL, user_id=user_id, payload={"n": user_id}),
+                commit=False,
+            )
+        await dbsession.flush()
+
+        webhook = WebhookStub()
+        assert await self.dispatcher(dbsession, webhook, chunk_size=2).dispatch_once() == 5
+
+        assert sorted(len(body["notifications"]) for _, body in webhook.requests) == [1, 2, 2]
+        assert all(row.delivered_at is not None for row in await self.outbox(dbsession))
+
+    async def test_claimed_rows_are_leased(self, dbsession: AsyncSession, order: WarframeMarketOrderModel) -> None:
+        await trigger_order_alert(dbsession, order=order, platinum=9, quantity=1)
+        await dbsession.flush()
+
+        (claimed,) = await notification_outbox_dao.claim_batch(dbsession, limit=10, lease=timedelta(minutes=1))
+
+        assert claimed.attempts == 1
+        # Still undelivered, but not due again until the lease runs out
+        assert await notification_outbox_dao.claim_batch(dbsession, limit=10, lease=timedelta(minutes=1)) == []
+
+    async def test_dispatch_once_marks_rows_out_of_attempts_failed(
+        self,
+        dbsession: AsyncSession,
+        order: WarframeMarketOrderModel,
+    ) -> None:
+        await trigger_order_alert(dbsession, order=order, platinum=9, quantity=1)
+        await dbsession.flush()
+
+        webhook = WebhookStub(status_code=500)
+        assert await self.dispatcher(dbsession, webhook, max_attempts=1).dispatch_once() == 1
+
+        (row,) = await self.outbox(dbsession)
+        assert row.failed_at is not None
+        assert row.delivered_at is None
+
+        # Rows given up on are never claimed again, even once they'd be due
+        await dbsession.execute(update(NotificationOutboxModel).values(available_at=row.created_at))
+        assert await self.dispatcher(dbsession, webhook, max_attempts=1).dispatch_once() == 0
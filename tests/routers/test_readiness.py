@@ -0,0 +1,19 @@
+from fastapi import FastAPI, status
+from httpx import AsyncClient
+
+
+async def test_ready_before_warm_up_returns_503(client: AsyncClient, fastapi_app: FastAPI) -> None:
+    url = fastapi_app.url_path_for("readiness_check")
+
+    response = await client.get(url)
+
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+
+
+async def test_ready_after_warm_up_returns_200(client: AsyncClient, fastapi_app: FastAPI) -> None:
+    fastapi_app.state.ready = True
+    url = fastapi_app.url_path_for("readiness_check")
+
+    response = await client.get(url)
+
+    assert response.status_code == status.HTTP_200_OK
@@ -0,0 +1,104 @@
+from datetime import datetime, timedelta
+from typing import Any
+from unittest.mock import patch
+
+from fastapi import FastAPI, status
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.database.crud.tracking import order_tracking_dao
+from api.database.models.warframe.history import PriceSnapshotModel
+from api.routers.schemas.tracking import OrderCreate
+from api.settings import settings
+from tests.routers.warframe.utils import FAKE_ITEM_LIST, MockWarframeItems
+
+ITEM_ID = FAKE_ITEM_LIST[0]["id"]
+START = datetime(2024, 1, 1)  # noqa: DTZ001
+
+
+class TestBacktestAPI(MockWarframeItems):
+    async def add_history(self, dbsession: AsyncSession, best_sells: list[int]) -> None:
+        dbsession.add_all(
+            PriceSnapshotModel(
+                item_id=ITEM_ID,
+                recorded_at=START + timedelta(minutes=10 * n),
+                best_sell=best_sell,
+                best_buy=None,
+                sell_prices=[best_sell],
+                sell_quantities=[1],
+            )
+            for n, best_sell in enumerate(best_sells)
+        )
+        await dbsession.flush()
+
+    async def test_existing_and_hypothetical_trackers_are_replayed_in_order(
+        self,
+        client: AsyncClient,
+        fastapi_app: FastAPI,
+        dbsession: AsyncSession,
+    ) -> None:
+        await self.sync_items_helper(client, fastapi_app)
+        await self.add_history(dbsession, [20, 9, 8, 15, 9])
+
+        order = await order_tracking_dao.create(
+            dbsession,
+            obj=OrderCreate(user_id=1234, platinum_threshold=10, minimum_quantity=1, item_id=ITEM_ID),
+        )
+        payload: dict[str, Any] = {
+            "order_ids": [str(order.id)],
+            "orders": [{"user_id": 1, "platinum_threshold": 8, "minimum_quantity": 1, "item_id": ITEM_ID}],
+            "cooldown": 900,
+        }
+
+        with patch.object(settings, "backtest_max_timestamps", 1):
+            response = await client.post(fastapi_app.url_path_for("backtest_trackers"), json=payload)
+
+        assert response.status_code == status.HTTP_200_OK
+
+        existing, hypothetical = response.json()
+        # The third snapshot is within the cooldown of the second one
+        assert (existing["order_id"], existing["triggers"]) == (str(order.id), 2)
+        assert existing["triggered_at"] == [(START + timedelta(minutes=10)).isoformat()]
+        assert (hypothetical["order_id"], hypothetical["triggers"]) == (None, 1)
+        assert hypothetical["triggered_at"] == [(START + timedelta(minutes=20)).isoformat()]
+
+    async def test_unknown_trackers_return_404_not_found(self, client: AsyncClient, fastapi_app: FastAPI) -> None:
+        payload = {"order_ids": ["00000000-0000-4000-8000-000000000000"]}
+
+        response = await client.post(fastapi_app.url_path_for("backtest_trackers"), json=payload)
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    async def test_too_many_trackers_return_400_bad_request(self, client: AsyncClient, fastapi_app: FastAPI) -> None:
+        order = {"user_id": 1, "platinum_threshold": 8, "minimum_quantity": 1, "item_id": ITEM_ID}
+
+        with patch.object(settings, "backtest_max_trackers", 1):
+            response = await client.post(
+                fastapi_app.url_path_for("backtest_trackers"),
+                json={"orders": [order, order]},
+            )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    async def test_windows_with_offsets_are_taken_as_utc(
+        self,
+        client: AsyncClient,
+        fastapi_app: FastAPI,
+        dbsession: AsyncSession,
+    ) -> None:
+        await self.sync_items_helper(client, fastapi_app)
+        await self.add_history(dbsession, [20, 9, 20, 9])
+
+        order = {"user_id": 1, "platinum_threshold": 10, "minimum_quantity": 1, "item_id": ITEM_ID}
+        response = await client.post(
+            fastapi_app.url_path_for("backtest_trackers"),
+            json={
+                "orders": [order],
+                "since": "2024-01-01T01:05:00+01:00",
+                "until": "2024-01-01T00:25:00Z",
+                "cooldown": 0,
+            },
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()[0]["triggered_at"] == [(START + timedelta(minutes=10)).isoformat()]
@@ -0,0 +1,91 @@
+from collections.abc import AsyncGenerator
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi import FastAPI, status
+from httpx import AsyncClient
+
+from api.market.rate import TokenBucket
+from api.market.summaries import SummaryCache
+from tests.market.test_prices import fake_order
+from tests.routers.warframe.utils import FAKE_ITEM_LIST, MockWarframeItems
+
+ITEM_ID = FAKE_ITEM_LIST[0]["id"]
+
+FAKE_ORDERS = [
+    fake_order("a", "sell", 15, quantity=2),
+    fake_order("b", "sell", 10),
+    fake_order("c", "sell", 12, quantity=4),
+    fake_order("d", "buy", 8),
+    fake_order("e", "buy", 6),
+]
+
+
+class TestBestOrders(MockWarframeItems):
+    @pytest.fixture(autouse=True)
+    async def get_item_orders(self) -> AsyncGenerator[AsyncMock, Any]:
+        with (
+            patch("api.market.summaries.get_item_orders", new_callable=AsyncMock) as mocked_func,
+            patch("api.routers.warframe.items.summary_cache", SummaryCache(depth=10, ttl=600)),
+            patch("api.routers.warframe.items.refresh_budget", TokenBucket(rate=0.01, burst=2)),
+        ):
+            mocked_func.return_value = FAKE_ORDERS
+            yield mocked_func
+
+    async def get_best_orders(self, client: AsyncClient, fastapi_app: FastAPI, **params: Any) -> Any:
+        url = fastapi_app.url_path_for("get_best_orders", item_id=ITEM_ID)
+
+        return await client.get(url, params=params)
+
+    async def test_best_orders_of_missing_item_returns_404(self, client: AsyncClient, fastapi_app: FastAPI) -> None:
+        response = await self.get_best_orders(client, fastapi_app)
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    async def test_best_orders_returns_summary(self, client: AsyncClient, fastapi_app: FastAPI) -> None:
+        await self.sync_items_helper(client, fastapi_app)
+
+        response = await self.get_best_orders(client, fastapi_app, limit=2, threshold=12)
+
+        assert response.status_code == status.HTTP_200_OK
+
+        data = response.json()
+
+        assert [(order["user"], order["platinum"]) for order in data["sellers"]] == [("player-b", 10), ("player-c", 12)]
+        assert [order["platinum"] for order in data["buyers"]] == [8, 6]
+        assert data["spread"] == 2
+        assert data["volume_at_threshold"] == 5
+        assert data["updated_at"] is not None
+
+    async def test_best_orders_is_served_from_cache(
+        self,
+        client: AsyncClient,
+        fastapi_app: FastAPI,
+        get_item_orders: AsyncMock,
+    ) -> None:
+        await self.sync_items_helper(client, fastapi_app)
+
+        first = await self.get_best_orders(client, fastapi_app)
+        second = await self.get_best_orders(client, fastapi_app)
+
+        assert first.json() == second.json()
+        get_item_orders.assert_awaited_once()
+
+    async def test_force_refresh_over_budget_returns_429(
+        self,
+        client: AsyncClient,
+        fastapi_app: FastAPI,
+        get_item_orders: AsyncMock,
+    ) -> None:
+        await self.sync_items_helper(client, fastapi_app)
+
+        for _ in range(2):
+            response = await self.get_best_orders(client, fastapi_app, force=True)
+            assert response.status_code == status.HTTP_200_OK
+
+        response = await self.get_best_orders(client, fastapi_app, force=True)
+
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert int(response.headers["Retry-After"]) > 0
+        assert get_item_orders.await_count == 2
@@ -1,10 +1,24 @@
+from collections.abc import Iterator
+from unittest.mock import AsyncMock, patch
+
+import pytest
 from fastapi import FastAPI, status
-from httpx import AsyncClient
+from httpx import AsyncClient, HTTPError
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from tests.routers.warframe.utils import FAKE_ITEM_LIST, MockWarframeItems
+from api.database.models.warframe.items import WarframeItemModel, WarframeItemNameModel
+from api.market.autocomplete import item_names
+from api.settings import settings
+from tests.routers.warframe.utils import FAKE_ITEM_LIST, FAKE_ITEM_NAMES, MockWarframeItems, fake_items
 
 
 class TestWarframeItemAPI(MockWarframeItems):
+    @pytest.fixture(autouse=True)
+    def empty_item_names(self) -> Iterator[None]:
+        # Syncing indexes the names of the items it adds
+        yield
+        item_names.rebuild([])
+
     async def test_sync_items_empty_database_returns_correct_length(
         self,
         client: AsyncClient,
@@ -26,6 +40,35 @@ class TestWarframeItemAPI(MockWarframeItems):
         data = await self.sync_items_helper(client, fastapi_app)
         assert data["new"] == 0
 
+    async def test_sync_items_skips_languages_that_fail_to_fetch(
+        self,
+        client: AsyncClient,
+        fastapi_app: FastAPI,
+        mock_get_all_warframe_items: AsyncMock,
+    ) -> None:
+        def fail_in_german(language: str = "en") -> list[dict[str, str]]:
+            if language == "de":
+                raise HTTPError("Service unavailable")
+
+            return fake_items(language)
+
+        mock_get_all_warframe_items.side_effect = fail_in_german
+
+        data = await self.sync_items_helper(client, fastapi_app)
+        assert data["new"] == len(FAKE_ITEM_LIST)
+
+        url = fastapi_app.url_path_for("get_item", item_id=FAKE_ITEM_LIST[0]["id"])
+
+        response = await client.get(url, params={"lang": "de"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == FAKE_ITEM_LIST[0]
+
+        response = await client.get(url, params={"lang": "ru"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["item_name"] == FAKE_ITEM_NAMES["ru"]
+
     async def test_get_all_items_in_empty_database_returns_empty_list(
         self,
         client: AsyncClient,
@@ -60,6 +103,26 @@ class TestWarframeItemAPI(MockWarframeItems):
         assert data["new"] == len(all_items)
         assert all_items == FAKE_ITEM_LIST
 
+    async def test_get_all_items_after_sync_with_limit_and_offset_returns_page(
+        self,
+        client: AsyncClient,
+        fastapi_app: FastAPI,
+    ) -> None:
+        data = await self.sync_items_helper(client, fastapi_app)
+        assert data["new"] == len(FAKE_ITEM_LIST)
+
+        url = fastapi_app.url_path_for("get_all_items")
+
+        response = await client.get(url, params={"limit": 1})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == FAKE_ITEM_LIST[:1]
+
+        response = await client.get(url, params={"offset": len(FAKE_ITEM_LIST)})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == []
+
     async def test_get_item_by_fuzzy_item_on_empty_database_returns_404(
         self,
         client: AsyncClient,
@@ -106,6 +169,55 @@ class TestWarframeItemAPI(MockWarframeItems):
 
         assert queried_item == FAKE_ITEM_LIST[0]
 
+    async def test_get_item_by_fuzzy_after_sync_in_another_language_returns_localized_item(
+        self,
+        client: AsyncClient,
+        fastapi_app: FastAPI,
+    ) -> None:
+        data = await self.sync_items_helper(client, fastapi_app)
+        assert data["new"] == len(FAKE_ITEM_LIST)
+
+        url = fastapi_app.url_path_for("get_item_by_fuzzy")
+
+        search = {"search": FAKE_ITEM_NAMES["ru"], "lang": "ru"}
+        response = await client.get(url, params=search)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == fake_items("ru")[0]
+
+        # Names in other languages aren't matched
+        search = {"search": FAKE_ITEM_NAMES["ru"], "lang": "de"}
+        response = await client.get(url, params=search)
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    async def test_get_item_by_fuzzy_with_many_matches_returns_the_most_similar(
+        self,
+        client: AsyncClient,
+        fastapi_app: FastAPI,
+        dbsession: AsyncSession,
+    ) -> None:
+        await self.sync_items_helper(client, fastapi_app)
+        dbsession.add_all(
+            WarframeItemModel(id=f"id_{url_name}", item_name=url_name.title(), thumb="", url_name=url_name)
+            for url_name in ("secura_dual_cestra_prime", "dual_cestra")
+        )
+        dbsession.add(WarframeItemNameModel(item_id="id_dual_cestra", language="de", item_name="Doppel-Cestra"))
+        await dbsession.flush()
+
+        url = fastapi_app.url_path_for("get_item_by_fuzzy")
+
+        # The other items are above the threshold too
+        response = await client.get(url, params={"search": "secura dual cestra", "threshold": 0.3})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == FAKE_ITEM_LIST[0]
+
+        response = await client.get(url, params={"search": "Secura Doppel-Cestra", "threshold": 0.1, "lang": "de"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == fake_items("de")[0]
+
     async def test_get_item_in_empty_database_returns_404(
         self,
         client: AsyncClient,
@@ -148,3 +260,138 @@ class TestWarframeItemAPI(MockWarframeItems):
         queried_item = response.json()
 
         assert queried_item == FAKE_ITEM_LIST[0]
+
+    async def test_get_all_items_after_sync_in_each_language_returns_localized_names(
+        self,
+        client: AsyncClient,
+        fastapi_app: FastAPI,
+    ) -> None:
+        data = await self.sync_items_helper(client, fastapi_app)
+        assert data["new"] == len(FAKE_ITEM_LIST)
+
+        url = fastapi_app.url_path_for("get_all_items")
+
+        # French isn't synced, so the names stay in English
+        for language in (*FAKE_ITEM_NAMES, "en", "fr"):
+            response = await client.get(url, params={"lang": language})
+
+            assert response.status_code == status.HTTP_200_OK
+            assert response.json() == fake_items(language)
+
+    async def test_get_item_details_before_enrichment_returns_empty_details(
+        self,
+        client: AsyncClient,
+        fastapi_app: FastAPI,
+    ) -> None:
+        data = await self.sync_items_helper(client, fastapi_app)
+        assert data["new"] == len(FAKE_ITEM_LIST)
+
+        url = fastapi_app.url_path_for("get_item_details", item_id=FAKE_ITEM_LIST[0]["id"])
+
+        response = await client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {
+            "id": FAKE_ITEM_LIST[0]["id"],
+            "tags": [],
+            "ducats": None,
+            "mastery_level": None,
+            "set_id": None,
+            "enriched_at": None,
+        }
+
+        url = fastapi_app.url_path_for("get_item_details", item_id="asdfasdfasdf")
+
+        response = await client.get(url)
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    async def test_get_items_batch_after_sync_keeps_order_and_marks_misses(
+        self,
+        client: AsyncClient,
+        fastapi_app: FastAPI,
+    ) -> None:
+        data = await self.sync_items_helper(client, fastapi_app)
+        assert data["new"] == len(FAKE_ITEM_LIST)
+
+        url = fastapi_app.url_path_for("get_items_batch")
+        item = FAKE_ITEM_LIST[0]
+
+        response = await client.post(
+            url,
+            json={"ids": ["asdfasdfasdf", item["id"], item["id"]], "url_names": [item["url_name"], "asdf"]},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"ids": [None, item, item], "url_names": [item, None]}
+
+    async def test_get_items_batch_over_limit_returns_400(
+        self,
+        client: AsyncClient,
+        fastapi_app: FastAPI,
+    ) -> None:
+        url = fastapi_app.url_path_for("get_items_batch")
+
+        with patch.object(settings, "items_batch_max", 1):
+            response = await client.post(url, json={"ids": ["a"], "url_names": ["b"]})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    async def test_autocomplete_items_after_sync_completes_any_word(
+        self,
+        client: AsyncClient,
+        fastapi_app: FastAPI,
+    ) -> None:
+        data = await self.sync_items_helper(client, fastapi_app)
+        assert data["new"] == len(FAKE_ITEM_LIST)
+
+        url = fastapi_app.url_path_for("autocomplete_items")
+
+        response = await client.get(url, params={"prefix": "Dual ces"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == FAKE_ITEM_LIST[:1]
+
+        response = await client.get(url, params={"prefix": "asdf"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == []
+
+    async def test_autocomplete_items_after_a_rename_completes_the_new_name(
+        self,
+        client: AsyncClient,
+        fastapi_app: FastAPI,
+        mock_get_all_warframe_items: AsyncMock,
+    ) -> None:
+        await self.sync_items_helper(client, fastapi_app)
+
+        renamed = {**FAKE_ITEM_LIST[0], "item_name": "Secura Twin Cestra"}
+
+        def renamed_items(language: str) -> list[dict[str, str]]:
+            return [renamed] if language == "en" else []
+
+        mock_get_all_warframe_items.side_effect = renamed_items
+        data = await self.sync_items_helper(client, fastapi_app)
+        assert data["new"] == 0
+
+        response = await client.get(fastapi_app.url_path_for("autocomplete_items"), params={"prefix": "twin"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == [renamed]
+
+    async def test_autocomplete_items_before_indexing_matches_from_the_database(
+        self,
+        client: AsyncClient,
+        fastapi_app: FastAPI,
+    ) -> None:
+        data = await self.sync_items_helper(client, fastapi_app)
+        assert data["new"] == len(FAKE_ITEM_LIST)
+        item_names.rebuild([])
+
+        url = fastapi_app.url_path_for("autocomplete_items")
+
+        for prefix in ("secura dual", "secura_dual_c"):
+            response = await client.get(url, params={"prefix": prefix})
+
+            assert response.status_code == status.HTTP_200_OK
+            assert response.json() == FAKE_ITEM_LIST[:1]
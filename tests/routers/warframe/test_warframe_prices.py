@@ -0,0 +1,40 @@
+import json
+from collections.abc import Generator
+from typing import Any
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.events.prices import latest_prices
+from api.settings import settings
+
+ITEM_ID = "54aae292e7798909064f1575"
+
+
+class TestLivePrices:
+    @pytest.fixture
+    def client(self, fastapi_app: FastAPI) -> Generator[TestClient, Any]:
+        latest_prices[ITEM_ID] = json.dumps({"type": "price", "item_id": ITEM_ID, "best_sell": 9})
+
+        yield TestClient(fastapi_app)
+
+        latest_prices.clear()
+
+    def test_subscribe_sends_latest_price(self, client: TestClient, fastapi_app: FastAPI) -> None:
+        with client.websocket_connect(fastapi_app.url_path_for("live_prices")) as websocket:
+            websocket.send_json({"subscribe": [ITEM_ID]})
+
+            assert websocket.receive_json()["best_sell"] == 9
+
+    def test_subscribe_over_limit_returns_error(self, client: TestClient, fastapi_app: FastAPI) -> None:
+        with client.websocket_connect(fastapi_app.url_path_for("live_prices")) as websocket:
+            websocket.send_json({"subscribe": [str(n) for n in range(settings.prices_max_subscriptions + 1)]})
+
+            assert websocket.receive_json()["type"] == "error"
+
+    def test_invalid_request_returns_error(self, client: TestClient, fastapi_app: FastAPI) -> None:
+        with client.websocket_connect(fastapi_app.url_path_for("live_prices")) as websocket:
+            websocket.send_text("not json")
+
+            assert websocket.receive_json()["type"] == "error"
@@ -0,0 +1,90 @@
+from fastapi import FastAPI, status
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.database.models.warframe.items import WarframeItemModel
+
+ITEM_TAGS = {
+    "Ash Prime Set": ["prime", "set", "warframe"],
+    "Ash Prime Blueprint": ["prime", "blueprint", "warframe"],
+    "Ash Prime Chassis": ["prime", "component", "warframe"],
+    "Braton Prime Blueprint": ["prime", "blueprint", "weapon"],
+    "Braton Blueprint": ["blueprint", "weapon"],
+    "Secura Dual Cestra": ["syndicate", "weapon"],
+}
+
+
+def names(data: dict[str, list[dict[str, str]]]) -> list[str]:
+    return [row["item_name"] for row in data["items"]]
+
+
+class TestItemSearchAPI:
+    async def add_items(self, dbsession: AsyncSession) -> None:
+        for name, tags in ITEM_TAGS.items():
+            url_name = name.lower().replace(" ", "_")
+            dbsession.add(
+                WarframeItemModel(id=url_name, item_name=name, thumb=f"{url_name}.png", url_name=url_name, tags=tags),
+            )
+        await dbsession.flush()
+
+    async def test_words_and_tags_narrow_the_search(
+        self,
+        client: AsyncClient,
+        fastapi_app: FastAPI,
+        dbsession: AsyncSession,
+    ) -> None:
+        await self.add_items(dbsession)
+        url = fastapi_app.url_path_for("search_items")
+
+        response = await client.get(url, params={"q": "prime blueprint"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert names(response.json()) == ["Ash Prime Blueprint", "Braton Prime Blueprint"]
+
+        response = await client.get(url, params={"q": "blueprint", "tags": ["prime", "weapon"]})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert names(response.json()) == ["Braton Prime Blueprint"]
+
+        # Tags only match tags, not words of the name
+        response = await client.get(url, params={"tags": ["set"]})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert names(response.json()) == ["Ash Prime Set"]
+
+    async def test_pages_follow_on_from_their_cursor(
+        self,
+        client: AsyncClient,
+        fastapi_app: FastAPI,
+        dbsession: AsyncSession,
+    ) -> None:
+        await self.add_items(dbsession)
+        url = fastapi_app.url_path_for("search_items")
+
+        everything = await client.get(url, params={"q": "prime"})
+        assert everything.json()["next"] is None
+
+        found: list[str] = []
+        after: str | None = None
+        while True:
+            params: dict[str, str | int] = {"q": "prime", "limit": 2}
+            if after is not None:
+                params["after"] = after
+
+            response = await client.get(url, params=params)
+
+            assert response.status_code == status.HTTP_200_OK
+            found.extend(names(response.json()))
+            if (after := response.json()["next"]) is None:
+                break
+
+        assert found == names(everything.json())
+        assert len(found) == 4
+
+    async def test_invalid_searches_return_400(self, client: AsyncClient, fastapi_app: FastAPI) -> None:
+        url = fastapi_app.url_path_for("search_items")
+
+        for params in ({}, {"q": "prime", "after": "not a cursor"}):
+            response = await client.get(url, params=params)
+
+            assert response.status_code == status.HTTP_400_BAD_REQUEST
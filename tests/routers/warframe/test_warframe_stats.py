@@ -0,0 +1,119 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import FastAPI, status
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.database.crud.history import price_sketch_dao
+from api.database.models.warframe.history import PriceSnapshotModel
+from api.settings import settings
+from tests.routers.warframe.utils import FAKE_ITEM_LIST, MockWarframeItems
+
+ITEM_ID = FAKE_ITEM_LIST[0]["id"]
+START = datetime(2024, 1, 1)  # noqa: DTZ001
+
+
+class TestItemStatsAPI(MockWarframeItems):
+    async def add_history(self, dbsession: AsyncSession, prices: list[tuple[int | None, int | None]]) -> None:
+        for n, (best_sell, best_buy) in enumerate(prices):
+            snapshot = PriceSnapshotModel(
+                item_id=ITEM_ID,
+                recorded_at=START + timedelta(hours=6 * n),
+                best_sell=best_sell,
+                best_buy=best_buy,
+                sell_prices=[],
+                sell_quantities=[],
+            )
+            dbsession.add(snapshot)
+            await price_sketch_dao.record(dbsession, snapshot=snapshot)
+
+    async def test_windows_merge_the_buckets_they_cover(
+        self,
+        client: AsyncClient,
+        fastapi_app: FastAPI,
+        dbsession: AsyncSession,
+    ) -> None:
+        await self.sync_items_helper(client, fastapi_app)
+        # A snapshot every 6 hours, the last one out of the window
+        await self.add_history(dbsession, [(10, 5), (20, None), (30, 7), (40, None), (50, 9), (60, None), (999, 1)])
+
+        response = await client.get(
+            fastapi_app.url_path_for("get_item_stats", item_id=ITEM_ID),
+            params={"since": "2024-01-01T00:00:00", "until": "2024-01-02T10:30:00", "quantiles": [0, 0.5, 1]},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+
+        data = response.json()
+        assert (data["since"], data["until"]) == ("2024-01-01T00:00:00", "2024-01-02T11:00:00")
+        assert data["sell"]["count"] == 6
+        assert (data["sell"]["minimum"], data["sell"]["maximum"], data["sell"]["mean"]) == (10, 60, 35)
+        assert [quantile["platinum"] for quantile in data["sell"]["quantiles"]] == [10, 35, 60]
+        assert data["buy"]["count"] == 3
+
+    async def test_windows_with_offsets_are_taken_as_utc(
+        self,
+        client: AsyncClient,
+        fastapi_app: FastAPI,
+        dbsession: AsyncSession,
+    ) -> None:
+        await self.sync_items_helper(client, fastapi_app)
+        await self.add_history(dbsession, [(10, 5), (20, None), (30, 7)])
+
+        response = await client.get(
+            fastapi_app.url_path_for("get_item_stats", item_id=ITEM_ID),
+            params={"since": "2024-01-01T02:00:00+02:00", "until": "2024-01-01T07:00:00Z"},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+
+        data = response.json()
+        assert (data["since"], data["until"]) == ("2024-01-01T00:00:00", "2024-01-01T07:00:00")
+        assert data["sell"]["count"] == 2
+
+        # Only an offset in one bound, the other one defaulting from it
+        response = await client.get(
+            fastapi_app.url_path_for("get_item_stats", item_id=ITEM_ID),
+            params={"until": "2024-01-01T07:00:00Z"},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["sell"]["count"] == 2
+
+    async def test_windows_without_history_have_no_stats(self, client: AsyncClient, fastapi_app: FastAPI) -> None:
+        await self.sync_items_helper(client, fastapi_app)
+
+        response = await client.get(fastapi_app.url_path_for("get_item_stats", item_id=ITEM_ID))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert (response.json()["sell"], response.json()["buy"]) == (None, None)
+
+    async def test_unknown_items_return_404_not_found(self, client: AsyncClient, fastapi_app: FastAPI) -> None:
+        response = await client.get(fastapi_app.url_path_for("get_item_stats", item_id="unknown"))
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    async def test_backwards_windows_return_400_bad_request(self, client: AsyncClient, fastapi_app: FastAPI) -> None:
+        response = await client.get(
+            fastapi_app.url_path_for("get_item_stats", item_id=ITEM_ID),
+            params={"since": "2024-01-02T00:00:00", "until": "2024-01-01T00:00:00"},
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    async def test_windows_over_the_limit_return_400_bad_request(
+        self,
+        client: AsyncClient,
+        fastapi_app: FastAPI,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        monkeypatch.setattr(settings, "price_stats_max_window", 86400)
+        await self.sync_items_helper(client, fastapi_app)
+
+        response = await client.get(
+            fastapi_app.url_path_for("get_item_stats", item_id=ITEM_ID),
+            params={"since": "2024-01-01T00:00:00", "until": "2024-01-02T00:00:01"},
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,82 @@
+from collections.abc import Iterator
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+from fastapi import FastAPI, status
+from httpx import AsyncClient
+
+from api.market.thumbnails import ThumbnailCache
+from tests.routers.warframe.utils import FAKE_ITEM_LIST, MockWarframeItems, fake_items
+
+IMAGE = b"\x89PNG" + b"cestra" * 100
+
+
+class TestItemThumbAPI(MockWarframeItems):
+    @pytest.fixture(autouse=True)
+    def static(self, tmp_path: Path) -> Iterator[list[str]]:
+        requests: list[str] = []
+
+        def handle(request: httpx.Request) -> httpx.Response:
+            path = request.url.path.removeprefix("/static/assets/")
+            requests.append(path)
+
+            if path != FAKE_ITEM_LIST[0]["thumb"]:
+                return httpx.Response(404)
+
+            return httpx.Response(200, content=IMAGE)
+
+        static = httpx.AsyncClient(
+            base_url="https://warframe.market/static/assets",
+            transport=httpx.MockTransport(handle),
+        )
+
+        with (
+            patch("api.market.thumbnails.warframe_market_static", static),
+            patch("api.routers.warframe.items.thumbnail_cache", ThumbnailCache(tmp_path, max_bytes=2**20)),
+        ):
+            yield requests
+
+    async def test_thumbnails_are_served_with_validators(
+        self,
+        client: AsyncClient,
+        fastapi_app: FastAPI,
+        static: list[str],
+    ) -> None:
+        await self.sync_items_helper(client, fastapi_app)
+        url = fastapi_app.url_path_for("get_item_thumb", item_id=FAKE_ITEM_LIST[0]["id"])
+
+        response = await client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.content == IMAGE
+        assert response.headers["content-type"] == "image/png"
+        assert response.headers["cache-control"].startswith("public, max-age=")
+
+        etag = response.headers["etag"]
+        response = await client.get(url, headers={"If-None-Match": f"W/{etag}"})
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.headers["etag"] == etag
+        assert static == [FAKE_ITEM_LIST[0]["thumb"]]
+
+    async def test_unknown_items_and_upstream_failures(
+        self,
+        client: AsyncClient,
+        fastapi_app: FastAPI,
+        mock_get_all_warframe_items: AsyncMock,
+    ) -> None:
+        response = await client.get(fastapi_app.url_path_for("get_item_thumb", item_id="asdfasdfasdf"))
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+        def missing_thumbs(language: str) -> list[dict[str, str]]:
+            return [{**item, "thumb": "missing.png"} for item in fake_items(language)]
+
+        mock_get_all_warframe_items.side_effect = missing_thumbs
+        await self.sync_items_helper(client, fastapi_app)
+
+        response = await client.get(fastapi_app.url_path_for("get_item_thumb", item_id=FAKE_ITEM_LIST[0]["id"]))
+
+        assert response.status_code == status.HTTP_502_BAD_GATEWAY
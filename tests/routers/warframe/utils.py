@@ -6,6 +6,9 @@ import pytest
 from fastapi import FastAPI, status
 from httpx import AsyncClient
 
+from api.market.rate import TokenBucket
+from api.settings import settings
+
 FAKE_ITEM_LIST: list[dict[str, str]] = [
     {
         "id": "54aae292e7798909064f1575",
@@ -16,12 +19,30 @@ FAKE_ITEM_LIST: list[dict[str, str]] = [
 ]
 
 
+# Translations of the first item's name, missing languages fall back to English
+FAKE_ITEM_NAMES: dict[str, str] = {
+    "de": "Secura Doppel-Cestra",
+    "ru": "Секура Двойные Цестры",
+}
+FAKE_LANGUAGES = ["en", *FAKE_ITEM_NAMES]
+
+
+def fake_items(language: str = "en") -> list[dict[str, str]]:
+    first, *rest = FAKE_ITEM_LIST
+
+    return [{**first, "item_name": FAKE_ITEM_NAMES.get(language, first["item_name"])}, *rest]
+
+
 class MockWarframeItems:
     @pytest.fixture(autouse=True)
-    async def mock_get_all_warframe_items(self) -> AsyncGenerator[None, Any]:
-        with patch("api.routers.warframe.items.get_all_warframe_items", new_callable=AsyncMock) as mocked_func:
-            mocked_func.return_value = FAKE_ITEM_LIST
-            yield
+    async def mock_get_all_warframe_items(self) -> AsyncGenerator[AsyncMock, Any]:
+        with (
+            patch("api.market.catalog.get_all_warframe_items", new_callable=AsyncMock) as mocked_func,
+            patch("api.market.catalog.catalog_budget", TokenBucket(1.0, burst=100)),
+            patch.object(settings, "catalog_languages", FAKE_LANGUAGES),
+        ):
+            mocked_func.side_effect = fake_items
+            yield mocked_func
 
     async def sync_items_helper(self, client: AsyncClient, fastapi_app: FastAPI) -> dict[str, int]:
         url = fastapi_app.url_path_for("sync_items")